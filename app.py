@@ -12,7 +12,15 @@ import faker
 from flask import Flask
 from flask_admin import Admin
 from flask_sqlalchemy_lite import SQLAlchemy
-from govuk_flask_admin import GovukFrontendTheme, GovukFlaskAdmin, GovukModelView
+from govuk_flask_admin import (
+    DateRangeFilter,
+    DateTimeRangeFilter,
+    FilterInValues,
+    FilterRelated,
+    GovukFrontendTheme,
+    GovukFlaskAdmin,
+    GovukModelView,
+)
 from govuk_frontend_wtf.main import WTFormsHelpers
 from jinja2 import PackageLoader, ChoiceLoader, PrefixLoader
 from sqlalchemy import ForeignKey
@@ -74,7 +82,19 @@ class UserModelView(GovukModelView):
     form_args = {"email": {"validators": [Email()]}}
 
     # Enable filtering on multiple columns
-    column_filters = ["age", "job", "email", "created_at", "favourite_colour", "last_logged_in_at"]
+    column_filters = [
+        "age",
+        "job",
+        "email",
+        "created_at",
+        "favourite_colour",
+        "last_logged_in_at",
+        # A list of values, e.g. email addresses pasted from a spreadsheet
+        FilterInValues(User.email, "Email"),
+        # Ranges with "From" and "To" inputs, added last so the generated filters keep their numbers
+        DateRangeFilter(User.created_at, "Created At"),
+        DateTimeRangeFilter(User.last_logged_in_at, "Last Logged In At"),
+    ]
 
     # Enable search
     column_searchable_list = ["email", "name"]
@@ -99,7 +119,13 @@ class PostModelView(GovukModelView):
     can_view_details = True
 
     # Enable filtering
-    column_filters = ["author", "published_at", "created_at"]
+    column_filters = [
+        "author",
+        "published_at",
+        "created_at",
+        # Pick one author, looked up as you type rather than listing every user in the page
+        FilterRelated(Post.author, "Author", ["name", "email"], label=lambda user: f"{user.name} ({user.email})"),
+    ]
 
     # Enable search
     column_searchable_list = ["title", "content"]
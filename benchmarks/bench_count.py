@@ -0,0 +1,114 @@
+"""Benchmark: a page of the list view and its total, with two queries or one.
+
+Compares `ExactCount` (a `SELECT count(*)` followed by the page query) with `WindowCount` (the page query with
+`COUNT(*) OVER ()` added) on the demo app's `User`/`Post` schema, filled with `--rows` rows of each. Filling a
+million rows takes a little while; the database is kept in a temporary directory and thrown away afterwards.
+
+    python benchmarks/bench_count.py --rows 1000000
+"""
+import argparse
+import datetime
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+from flask_admin.contrib.sqla.filters import FilterEqual
+from sqlalchemy import insert
+
+# The demo app lives at the top of the repository.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import FavouriteColour, Post, User, _create_app
+from govuk_flask_admin.counting import ExactCount, WindowCount
+
+N = 10
+BATCH = 50_000
+
+
+def populate(db, rows):
+    colours = list(FavouriteColour)
+    created = datetime.date(2020, 1, 1)
+
+    with db.engine.begin() as connection:
+        for start in range(0, rows, BATCH):
+            ids = range(start + 1, min(start + BATCH, rows) + 1)
+            connection.execute(
+                insert(User),
+                [
+                    {
+                        "id": 1_000_000_000 + i,
+                        "email": f"user{i}@example.com",
+                        "name": f"User {i}",
+                        "age": 18 + i % 80,
+                        "job": f"Job {i % 50}",
+                        "favourite_colour": colours[i % len(colours)],
+                        "created_at": created + datetime.timedelta(days=i % 1500),
+                    }
+                    for i in ids
+                ],
+            )
+            connection.execute(
+                insert(Post),
+                [
+                    {
+                        "title": f"Post {i}",
+                        "content": "Lorem ipsum",
+                        "author_id": 1_000_000_000 + i,
+                        "created_at": datetime.datetime(2020, 1, 1) + datetime.timedelta(minutes=i),
+                    }
+                    for i in ids
+                ],
+            )
+
+
+def filter_index(view, column):
+    """The position of the view's "equals" filter on `column`, as Flask-Admin expects it in `get_list`."""
+    return next(
+        i for i, f in enumerate(view._filters) if isinstance(f, FilterEqual) and f.column.compare(column.expression)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app, db, admin = _create_app({"SQLALCHEMY_ENGINES": {"default": f"sqlite:///{Path(tmp) / 'bench.sqlite'}"}})
+
+        with app.app_context():
+            populate(db, args.rows)
+
+        views = {view.model: view for view in admin._views if getattr(view, "model", None) in (User, Post)}
+        user_filter = filter_index(views[User], User.job)
+        post_filter = filter_index(views[Post], User.name)
+
+        cases = (
+            ("user, page 1", User, 0, None, []),
+            ("user, page 1000", User, 999, None, []),
+            ("user, filtered", User, 0, None, [(user_filter, "job", "Job 7")]),
+            ("user, searched", User, 0, "user12", []),
+            ("post, page 1", Post, 0, None, []),
+            ("post, by author", Post, 0, None, [(post_filter, "author", "User 1")]),
+        )
+
+        for label, model, page, search, filters in cases:
+            view = views[model]
+            for name, strategy in (("two queries", ExactCount()), ("COUNT(*) OVER ()", WindowCount())):
+                view.count_strategy = strategy
+
+                with app.test_request_context(f"/admin/{model.__tablename__}/"):
+                    seconds = timeit.timeit(
+                        lambda view=view, page=page, search=search, filters=filters: view.get_list(
+                            page, None, None, search, filters, page_size=view.page_size
+                        ),
+                        number=N,
+                    )
+                    view.session.rollback()
+
+                print(f"{label:<18} {name:<18} {seconds / N * 1e3:8.2f} ms/page")
+
+
+if __name__ == "__main__":
+    main()
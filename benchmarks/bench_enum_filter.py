@@ -0,0 +1,84 @@
+"""Benchmark: rendering the select for an enum filter with many members.
+
+Compares the previous template, which looped over every member of the enum for every option to pair its name with
+its value, with rendering the (name, value) options `GovukFilterConverter.conv_enum` now works out when the filter is
+built. The enum has `--members` members, e.g. the 400 or so local authorities.
+
+    python benchmarks/bench_enum_filter.py --members 400
+"""
+import argparse
+import enum
+import sys
+import timeit
+from pathlib import Path
+
+from sqlalchemy import Column, Enum
+
+# The demo app lives at the top of the repository.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import _create_app
+from govuk_flask_admin import GovukFilterConverter
+
+N = 200
+
+PREVIOUS = """
+{% from 'govuk_frontend_jinja/components/select/macro.html' import govukSelect %}
+{% set select_items = [{"value": "", "text": "Select..."}] %}
+{% set actual_filter = filters[filter.index] if filters and filter.index < filters|length else none %}
+{% for opt_value, opt_label in filter.options %}
+  {% if actual_filter and actual_filter.enum_class is defined and actual_filter.enum_class is not none %}
+    {% set ns = namespace(enum_name=opt_value, display_label=opt_value) %}
+    {% for member in actual_filter.enum_class %}
+      {% if member.value == opt_value or member.name == opt_value %}
+        {% set ns.enum_name = opt_value %}
+        {% set ns.display_label = member.value %}
+      {% endif %}
+    {% endfor %}
+    {% set is_selected = (current_value and current_value.strip() == ns.enum_name|string) %}
+    {% set _ = select_items.append({"value": ns.enum_name, "text": ns.display_label, "selected": is_selected}) %}
+  {% else %}
+    {% set is_selected = (current_value and current_value.strip() == opt_value|string) %}
+    {% set _ = select_items.append({"value": opt_value, "text": opt_label, "selected": is_selected}) %}
+  {% endif %}
+{% endfor %}
+{{ govukSelect({"id": filter_key, "name": filter_key, "label": {"text": filter.operation}, "items": select_items}) }}
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=400)
+    args = parser.parse_args()
+
+    Area = enum.Enum("Area", {f"AREA_{i}": f"Area {i}" for i in range(args.members)})
+    column = Column("area", Enum(Area), nullable=False)
+    flt = GovukFilterConverter().conv_enum(column, "Area")[0]
+    current_value = f"AREA_{args.members // 2}"
+
+    app, _db, _admin = _create_app({"SQLALCHEMY_ENGINES": {"default": "sqlite://"}})
+
+    with app.test_request_context("/admin/"):
+        macros = app.jinja_env.get_template("admin/model/layout.html").module
+        previous = app.jinja_env.from_string(PREVIOUS)
+
+        # The previous template was given Flask-Admin's (value, value) options and looked each one up in the enum.
+        previous_filter = {"index": 0, "operation": "equals", "options": [(v, v) for v in column.type.enums]}
+        current_filter = {"index": 0, "operation": "equals", "options": flt.options, "type": None}
+
+        renders = {
+            "members per option": lambda: previous.render(
+                filter=previous_filter, filter_key="flt0_0", current_value=current_value, filters=[flt]
+            ),
+            "precomputed options": lambda: str(
+                macros.render_filter_input(current_filter, "flt0_0", current_value, [flt])
+            ),
+        }
+
+        for name, render in renders.items():
+            seconds = timeit.timeit(render, number=N)
+            print(f"{name:<22} {seconds / N * 1e3:8.2f} ms/render")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark: per-render cost of the CSS/JS include tags.
+
+Compares re-reading and parsing `manifest.json` on every render (the previous behaviour) with
+the cached `ViteManifest` registry.
+
+    python benchmarks/bench_manifest.py
+"""
+import json
+import tempfile
+import timeit
+from pathlib import Path
+
+from flask import Flask, url_for
+
+from govuk_flask_admin import GovukFlaskAdmin
+from govuk_flask_admin.assets import ViteManifest
+
+N = 20_000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest_file = Path(tmp) / "manifest.json"
+        manifest_file.write_text(
+            json.dumps(
+                {
+                    "src/assets/main.scss": {"file": "assets/main-aaaa1111.css", "isEntry": True},
+                    "src/assets/main.js": {"file": "assets/main-bbbb2222.js", "isEntry": True},
+                }
+            )
+        )
+
+        app = Flask(__name__)
+        GovukFlaskAdmin(app)
+        manifest = ViteManifest(manifest_file)
+
+        def uncached():
+            for entry in ("src/assets/main.scss", "src/assets/main.js"):
+                with open(manifest_file) as f:
+                    data = json.load(f)
+                url_for("govuk_flask_admin.static", filename=Path(data[entry]["file"]).name)
+
+        def cached():
+            manifest.css_tag()
+            manifest.js_tag()
+
+        with app.test_request_context("/admin/"):
+            for name, func in (("json.load per render", uncached), ("ViteManifest", cached)):
+                seconds = timeit.timeit(func, number=N)
+                print(f"{name:<22} {seconds / N * 1e6:8.2f} µs/render")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark: the post list's filter form with an author filter listing every user, or looking them up.
+
+Compares a select filter whose options are every user (as Flask-Admin builds for relationship columns) with
+`FilterRelated`, which renders only the chosen author and serves the rest from the view's `filter_lookup`
+endpoint. Times rendering the list page with an author chosen, building the view (where the options are loaded),
+and one page of lookup results. The demo app's tables are filled with `--rows` users and posts, kept in a
+temporary directory and thrown away afterwards.
+
+    python benchmarks/bench_relationship_filters.py --rows 200000
+"""
+import argparse
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+from bench_count import populate
+from flask_admin.contrib.sqla.filters import FilterEqual
+from sqlalchemy import select
+
+# The demo app lives at the top of the repository.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import Post, User, _create_app
+from govuk_flask_admin import FilterRelated, GovukModelView
+
+N = 5
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app, db, admin = _create_app({"SQLALCHEMY_ENGINES": {"default": f"sqlite:///{Path(tmp) / 'bench.sqlite'}"}})
+
+        with app.app_context():
+            populate(db, args.rows)
+            author_id = db.session.scalar(select(User.id).order_by(User.id).offset(args.rows // 2).limit(1))
+
+            def every_user():
+                return [(user.id, f"{user.name} ({user.email})") for user in db.session.scalars(select(User))]
+
+            filters = {
+                "options": lambda: FilterEqual(Post.author_id, "Author", options=every_user()),
+                "lookup": lambda: FilterRelated(
+                    Post.author, "Author", ["name", "email"], label=lambda user: f"{user.name} ({user.email})"
+                ),
+            }
+
+            views = {}
+            for name, make_filter in filters.items():
+                started = time.perf_counter()
+
+                class PostAuthorView(GovukModelView):
+                    column_filters = (make_filter(),)
+
+                views[name] = PostAuthorView(Post, db.session, name=f"Post {name}", endpoint=f"post_{name}")
+                admin.add_view(views[name])
+                print(f"{name + ', build view':<22} {(time.perf_counter() - started) * 1e3:10.2f} ms")
+
+        client = app.test_client()
+        for name in views:
+            url = f"/admin/post_{name}/?flt0_0={author_id}"
+            response = client.get(url)
+            seconds = timeit.timeit(lambda url=url: client.get(url), number=N)
+            print(f"{name + ', list page':<22} {seconds / N * 1e3:10.2f} ms  ({len(response.data) // 1024} KiB)")
+
+        url = "/admin/post_lookup/filter-lookup/?filter=0&q=User+1"
+        seconds = timeit.timeit(lambda: client.get(url), number=N)
+        print(f"{'lookup, one page':<22} {seconds / N * 1e3:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
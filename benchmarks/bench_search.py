@@ -0,0 +1,93 @@
+"""Benchmark: searching the post list with LIKE and with an FTS5 index.
+
+Compares Flask-Admin's `ILIKE '%term%'` search (`LikeSearch`) with `SQLiteFTS5Search` on the demo app's `Post`
+table, filled with `--rows` posts of about 60 words each, for a page of results and its total. Rebuilding the
+index is timed too. The database is kept in a temporary directory and thrown away afterwards.
+
+    python benchmarks/bench_search.py --rows 200000
+"""
+import argparse
+import datetime
+import random
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+from sqlalchemy import insert
+
+# The demo app lives at the top of the repository.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import Post, User, _create_app
+from govuk_flask_admin import GovukModelView
+from govuk_flask_admin.search import LikeSearch, SQLiteFTS5Search
+
+N = 10
+BATCH = 50_000
+WORDS = 5_000
+WORDS_PER_POST = 60
+
+
+def populate(db, rows):
+    rng = random.Random(0)
+    vocabulary = [f"word{i}" for i in range(WORDS)]
+
+    with db.engine.begin() as connection:
+        connection.execute(
+            insert(User),
+            [{"id": 1_000_000, "email": "author@example.com", "name": "Author", "age": 40, "job": "Writer",
+              "favourite_colour": "RED", "created_at": datetime.date(2020, 1, 1)}],
+        )
+        for start in range(0, rows, BATCH):
+            connection.execute(
+                insert(Post),
+                [
+                    {
+                        "title": f"Post {i} about {rng.choice(vocabulary)}",
+                        "content": " ".join(rng.choices(vocabulary, k=WORDS_PER_POST)),
+                        "author_id": 1_000_000,
+                        "created_at": datetime.datetime(2020, 1, 1) + datetime.timedelta(minutes=i),
+                    }
+                    for i in range(start, min(start + BATCH, rows))
+                ],
+            )
+
+
+class PostSearchView(GovukModelView):
+    column_searchable_list = ("title", "content")
+    search_backend = SQLiteFTS5Search()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app, db, _admin = _create_app({"SQLALCHEMY_ENGINES": {"default": f"sqlite:///{Path(tmp) / 'bench.sqlite'}"}})
+
+        with app.app_context():
+            populate(db, args.rows)
+            view = PostSearchView(Post, db.session, name="Post search", endpoint="post_search")
+
+            started = time.perf_counter()
+            view.search_backend.reindex(db.session)
+            db.session.commit()
+            print(f"{'reindex':<28} {(time.perf_counter() - started) * 1e3:10.2f} ms")
+
+        fts = view.search_backend
+        for search in ("word42", "word42 word4242", "word9999"):
+            for name, backend in (("LIKE", LikeSearch()), ("FTS5", fts)):
+                view.search_backend = backend
+
+                with app.test_request_context("/admin/post_search/"):
+                    seconds = timeit.timeit(lambda search=search: view.get_list(0, None, None, search, None), number=N)
+                    view.session.rollback()
+
+                print(f"{search + ', ' + name:<28} {seconds / N * 1e3:10.2f} ms/page")
+
+
+if __name__ == "__main__":
+    main()
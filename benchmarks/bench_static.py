@@ -0,0 +1,61 @@
+"""Benchmark: serving a static asset from disk versus the in-memory asset store.
+
+Compares `send_from_directory` (the previous behaviour), the disk-backed `StaticAssets` table and
+the in-memory `StaticAssets` store, for full responses and for conditional (304) requests.
+
+    python benchmarks/bench_static.py
+"""
+import json
+import os
+import tempfile
+import timeit
+from pathlib import Path
+
+from flask import Flask, send_from_directory
+
+from govuk_flask_admin import GovukFlaskAdmin
+from govuk_flask_admin.assets import StaticAssets, ViteManifest
+
+N = 5_000
+FILENAME = "main-aaaa1111.css"
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        dist = Path(tmp)
+        assets = dist / "assets"
+        assets.mkdir()
+        (assets / FILENAME).write_bytes(os.urandom(150 * 1024))
+        (dist / "manifest.json").write_text(
+            json.dumps({"src/assets/main.scss": {"file": f"assets/{FILENAME}", "isEntry": True}})
+        )
+
+        app = Flask(__name__)
+        GovukFlaskAdmin(app)
+        manifest = ViteManifest(dist / "manifest.json")
+        on_disk = StaticAssets(manifest, assets)
+        in_memory = StaticAssets(manifest, assets, in_memory=True)
+        on_disk.load()
+        in_memory.load()
+
+        def consume(response):
+            response.direct_passthrough = False
+            response.get_data()
+            response.close()
+
+        candidates = {
+            "send_from_directory": lambda: consume(send_from_directory(assets, FILENAME, max_age=3600)),
+            "StaticAssets (disk)": lambda: consume(on_disk.send(FILENAME)),
+            "StaticAssets (memory)": lambda: consume(in_memory.send(FILENAME)),
+        }
+
+        etag = in_memory.get(FILENAME).files[None].etag
+        for label, headers in (("200", {}), ("304", {"If-None-Match": f'"{etag}"'})):
+            with app.test_request_context(f"/_govuk_flask_admin/{FILENAME}", headers=headers):
+                for name, func in candidates.items():
+                    seconds = timeit.timeit(func, number=N)
+                    print(f"{label} {name:<24} {seconds / N * 1e6:8.2f} µs/request")
+
+
+if __name__ == "__main__":
+    main()
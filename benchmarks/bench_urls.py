@@ -0,0 +1,75 @@
+"""Benchmark: building the links on a 100-row list page with 10 active filters.
+
+Times the links a list page builds (page numbers, sort headers, filter and search tags, and an edit and a
+details link per row) with `url_for` for every link (the previous behaviour) and with the per-request
+`UrlBuilder` behind `GovukModelView.get_url`.
+
+    python benchmarks/bench_urls.py
+"""
+import sys
+import timeit
+from pathlib import Path
+
+from flask_admin.contrib.sqla import ModelView
+
+# The demo app lives at the top of the repository.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import User, _create_app
+from govuk_flask_admin import govuk_pagination_params_builder
+
+N = 200
+ROWS = 100
+FILTERS = 10
+
+
+def main():
+    app, _db, admin = _create_app({"SQLALCHEMY_ENGINES": {"default": "sqlite://"}})
+    view = next(view for view in admin._views if getattr(view, "model", None) is User)
+
+    # Text filters on the email, name and job columns, some more than once.
+    text_filters = [idx for idx, flt in enumerate(view._filters) if flt.column.key in ("email", "name", "job")]
+    filter_args = {
+        f"flt{i}_{view.get_filter_arg(idx, view._filters[idx])}": f"value {i}"
+        for i, idx in enumerate((text_filters * FILTERS)[:FILTERS])
+    }
+
+    def page_links(view_args):
+        active_filters = view_args.filters
+        filters_dict = view._get_filters(active_filters)
+        return_url = view._get_list_url(view_args)
+
+        def pager_url(p):
+            return view._get_list_url(view_args.clone(page=p or None))
+
+        govuk_pagination_params_builder(5, 50, pager_url)
+
+        for column in view._list_columns:
+            view._get_list_url(view_args.clone(sort=column[0], sort_desc=1))
+
+        for position in range(len(active_filters)):
+            view._get_remove_filter_url(
+                position, active_filters, return_url, None, False, "x", None, view.page_size, view_args.extra_args
+            )
+        view._get_remove_search_url(filters_dict, None, False, None, view.page_size, view_args.extra_args)
+
+        for row_id in range(ROWS):
+            view.get_url(".edit_view", id=row_id, url=return_url)
+            view.get_url(".details_view", id=row_id, url=return_url)
+
+    with app.test_request_context("/admin/user/", query_string={"search": "x", **filter_args}):
+        app.preprocess_request()
+        view_args = view._get_list_extra_args()
+        assert len(view_args.filters) == FILTERS
+
+        for name, get_url in (("url_for", ModelView.get_url.__get__(view)), ("UrlBuilder", None)):
+            if get_url is not None:
+                view.get_url = get_url
+            seconds = timeit.timeit(lambda: page_links(view_args), number=N)
+            view.__dict__.pop("get_url", None)
+
+            print(f"{name:<22} {seconds / N * 1e3:8.2f} ms/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark: filtering the user list by a long pasted list of email addresses.
+
+Times `FilterInValues` on the demo app's `User.email` with `--values` emails (default 10,000), binding each
+value as its own parameter and binding them all as one JSON array (`json_each`). Statements with one parameter
+per value aren't cached and are rebuilt every time, and SQLite builds with the default limit refuse more than
+32,766 of them. The users are kept in a temporary database, filled with `--rows` users, and thrown away afterwards.
+
+    python benchmarks/bench_value_lists.py --rows 100000 --values 10000
+"""
+import argparse
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+from bench_count import populate
+from sqlalchemy.exc import OperationalError
+
+# The demo app lives at the top of the repository.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app import User, _create_app
+from govuk_flask_admin import FilterInValues, GovukModelView
+
+N = 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--values", type=int, default=10_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app, db, _admin = _create_app({"SQLALCHEMY_ENGINES": {"default": f"sqlite:///{Path(tmp) / 'bench.sqlite'}"}})
+
+        with app.app_context():
+            populate(db, args.rows)
+
+        # Every other user, so the list is spread across the table.
+        emails = "\n".join(f"user{i}@example.com" for i in range(1, 2 * args.values, 2))
+
+        for name, max_bound_values in (("bound IN", args.values), ("json_each", 0)):
+
+            class UserEmailView(GovukModelView):
+                column_filters = (FilterInValues(User.email, "Email", max_bound_values=max_bound_values),)
+
+            with app.test_request_context("/admin/user/", query_string={"flt0_0": emails}):
+                view = UserEmailView(User, db.session, name=f"User {name}", endpoint=f"user_{max_bound_values}")
+                filters = view._get_list_filter_args()
+
+                def page(view=view, filters=filters):
+                    return view.get_list(0, None, None, None, filters)
+
+                try:
+                    count, _users = page()
+                except OperationalError as e:
+                    print(f"{name:<10} failed: {e.orig}")
+                    view.session.rollback()
+                    continue
+
+                seconds = timeit.timeit(page, number=N)
+                view.session.rollback()
+
+            print(f"{name:<10} {seconds / N * 1e3:10.2f} ms/page  ({int(count)} found)")
+
+
+if __name__ == "__main__":
+    main()
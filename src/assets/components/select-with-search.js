@@ -11,6 +11,8 @@
  * - Changed from Sprockets (//= require) to ES6 import for Choices.js
  * - Changed `new window.Choices` to `new Choices` (using imported module)
  * - Removed incomplete comment in fuseOptions (original: "threshold: 0 // only matches")
+ * - Added remote options: selects with a data-lookup-url fetch matching options from it as you type, a page
+ *   at a time, instead of searching options rendered with the page
  */
 import Choices from 'choices.js'
 
@@ -40,6 +42,7 @@ window.GOVUK.Modules = window.GOVUK.Modules || {}
     }
 
     const ariaDescribedBy = this.module.getAttribute('aria-describedby') || ''
+    this.lookupUrl = this.module.getAttribute('data-lookup-url')
 
     this.choices = new Choices(this.module, {
       allowHTML: false,
@@ -47,6 +50,8 @@ window.GOVUK.Modules = window.GOVUK.Modules || {}
       shouldSort: false,
       itemSelectText: '',
       searchResultLimit: 100,
+      // Remote options are already filtered by the server
+      searchChoices: !this.lookupUrl,
       removeItemButton: this.module.multiple,
       labelId: this.module.id + '-label ' + ariaDescribedBy,
       callbackOnInit: function () {
@@ -63,6 +68,77 @@ window.GOVUK.Modules = window.GOVUK.Modules || {}
     })
 
     this.module.choices = this.choices
+
+    if (this.lookupUrl) {
+      this.initLookup()
+    }
+  }
+
+  SelectWithSearch.prototype.initLookup = function () {
+    let timeout = null
+    this.loaded = false
+    this.term = ''
+    this.page = 0
+    this.more = false
+    this.loading = false
+
+    this.module.addEventListener('search', function (event) {
+      clearTimeout(timeout)
+      timeout = setTimeout(function () {
+        this.lookup(event.detail.value, 0)
+      }.bind(this), 250)
+    }.bind(this))
+
+    this.module.addEventListener('showDropdown', function () {
+      if (!this.loaded) {
+        this.lookup('', 0)
+      }
+    }.bind(this))
+
+    // Fetch the next page when the list is scrolled to the bottom
+    const list = this.choices.choiceList.element
+    list.addEventListener('scroll', function () {
+      if (this.more && !this.loading && list.scrollTop + list.clientHeight >= list.scrollHeight - 20) {
+        this.lookup(this.term, this.page + 1)
+      }
+    }.bind(this))
+  }
+
+  SelectWithSearch.prototype.lookup = function (term, page) {
+    const url = new URL(this.lookupUrl, window.location.href)
+    url.searchParams.set('q', term)
+    url.searchParams.set('page', page)
+    const request = (this.request || 0) + 1
+    this.request = request
+    this.loading = true
+
+    return fetch(url, { headers: { Accept: 'application/json' } })
+      .then(function (response) {
+        if (!response.ok) {
+          throw new Error('Lookup failed: ' + response.status)
+        }
+        return response.json()
+      })
+      .then(function (data) {
+        // Ignore responses to earlier searches that arrive after later ones
+        if (request !== this.request) {
+          return
+        }
+        this.loaded = true
+        this.term = term
+        this.page = page
+        this.more = data.more
+        // The first page replaces the options; later pages add to them
+        this.choices.setChoices(data.results, 'value', 'label', page === 0)
+      }.bind(this))
+      .catch(function (error) {
+        console.error(error)
+      })
+      .finally(function () {
+        if (request === this.request) {
+          this.loading = false
+        }
+      }.bind(this))
   }
 
   Modules.SelectWithSearch = SelectWithSearch
@@ -1,18 +1,12 @@
 import { initAll } from 'govuk-frontend';
 import { initAll as initAllMOJ } from '@ministryofjustice/frontend';
 import { FilterToggleButton } from '@ministryofjustice/frontend/moj/components/filter-toggle-button/filter-toggle-button.mjs';
-import './components/select-with-search.js';
 
 initAll();
 initAllMOJ();
 
-// Initialize GOVUK modules on page load
-document.addEventListener('DOMContentLoaded', () => {
-  const modules = document.querySelectorAll('[data-module="select-with-search"]');
-  modules.forEach(module => {
-    new window.GOVUK.Modules.SelectWithSearch(module).init();
-  });
-});
+// Components that only some pages need (e.g. select-with-search) are separate entries, which
+// GovukFlaskAdmin includes only on pages that render them.
 
 // Export FilterToggleButton to global scope so templates can use it
 window.FilterToggleButton = FilterToggleButton;
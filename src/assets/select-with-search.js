@@ -0,0 +1,15 @@
+import './components/select-with-search.js';
+
+// Entry point for pages rendering GovSelectWithSearch, so Choices.js isn't loaded everywhere.
+function initSelectWithSearch() {
+  const modules = document.querySelectorAll('[data-module="select-with-search"]');
+  modules.forEach(module => {
+    new window.GOVUK.Modules.SelectWithSearch(module).init();
+  });
+}
+
+if (document.readyState === 'loading') {
+  document.addEventListener('DOMContentLoaded', initSelectWithSearch);
+} else {
+  initSelectWithSearch();
+}
@@ -1,22 +1,77 @@
 import glob
 import inspect
-import json
+import re
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from math import ceil
 from pathlib import Path
-from textwrap import dedent
+import threading
 import typing as t
-
-from flask import Flask, url_for, send_from_directory, request
+import warnings
+
+from flask import (
+    Flask,
+    abort,
+    current_app,
+    flash,
+    g,
+    has_request_context,
+    jsonify,
+    redirect,
+    render_template_string,
+    request,
+)
+from flask_admin import expose
 from flask_admin.contrib.sqla import ModelView
 from flask_admin.contrib.sqla.form import AdminModelConverter
+from flask_admin.contrib.sqla import tools as sqla_tools
 from flask_admin.contrib.sqla.tools import is_relationship
 from flask_admin.contrib.sqla import filters as sqla_filters
 from flask_admin.theme import Theme
 from flask_admin.model.form import converts
+from jinja2 import pass_context
 from govuk_frontend_wtf.wtforms_widgets import GovTextInput, GovDateInput, GovSelect
+from govuk_flask_admin.assets import (
+    ASSETS_DIR,
+    CRITICAL_CSS_ENTRIES,
+    MANIFEST_FILE,
+    PRELOAD_FONTS,
+    SELECT_WITH_SEARCH_ENTRY,
+    StaticAssets,
+    ViteManifest,
+    require_js_entry,
+    required_js_entries,
+)
+from govuk_flask_admin.cli import govuk_flask_admin_cli
+from govuk_flask_admin.counting import (
+    CappedCount,
+    CountCache,
+    CountStrategy,
+    ExactCount,
+    ResultCount,
+    WindowCount,
+    format_result_count,
+    query_tables,
+)
+from govuk_flask_admin.filter_state import (
+    FILTER_ARG_PREFIX,
+    RANGE_SEPARATOR,
+    ActiveFilter,
+    FilterCriteria,
+    FilterState,
+    FilterViewArgs,
+)
+from govuk_flask_admin.indexes import advise_app_indexes
+from govuk_flask_admin.pagination import CURSOR_ARG, NEXT, PREVIOUS, KeysetColumns, KeysetCursor, KeysetPage
+from govuk_flask_admin.search import CONTAINS, SEARCH_MODE_LABELS, LikeSearch, SearchBackend, search_criterion
+from govuk_flask_admin.urls import build_url
+from govuk_flask_admin.value_lists import MAX_BOUND_VALUES, ValueListStore, in_values
 from govuk_flask_admin.widgets import GovSelectWithSearch
-from sqlalchemy.orm import ColumnProperty
+from sqlalchemy import Column, Table, and_, false, or_, select
+from sqlalchemy.orm import MANYTOONE, ColumnProperty, aliased, joinedload
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+from sqlalchemy.exc import StatementError
+from sqlalchemy.orm.exc import UnmappedColumnError
 from wtforms import validators, SelectField
 from enum import Enum
 
@@ -57,22 +112,43 @@ class GovukFrontendTheme(Theme):
     base_template: str = "admin/base.html"
 
 
-def govuk_pagination_params_builder(page_zero_indexed, total_pages, url_generator):
+def govuk_pagination_params_builder(page_zero_indexed, total_pages, url_generator, has_next=False, open_ended=False):
     """Builds the `params` argument for govukPagination based on govuk-frontend-jinja.
 
     This is fed by values from Flask-Admin's pagination, which provides:
         arg 1 (`page`) as a 0-indexed reference to the current page; but
         arg 2 (`pages`) as the number of total pages rather than the max page as a 0-indexed thing
+
+    If `total_pages` is None the total isn't known (e.g. with keyset pagination), so only previous/next
+    links are built, with `has_next` saying whether there is a page after this one.
+
+    If `open_ended` is set, `total_pages` is only a lower bound (e.g. from a capped count), so there's no link
+    to the last page: the pages around the current one are followed by an ellipsis, and beyond `total_pages`
+    `has_next` says whether there is a next page.
     """
     component_params = {}
 
     if page_zero_indexed != 0:
         component_params["previous"] = {"href": url_generator(page_zero_indexed - 1)}
 
-    if page_zero_indexed + 1 != total_pages:
+    if total_pages is None:
+        if has_next:
+            component_params["next"] = {"href": url_generator(page_zero_indexed + 1)}
+
+        component_params['classes'] = 'govuk-!-text-align-center'
+        return component_params
+
+    if open_ended:
+        has_next = has_next or page_zero_indexed + 1 < total_pages
+        last_page = max(total_pages, page_zero_indexed + 1 + has_next) - 1
+    else:
+        has_next = page_zero_indexed + 1 != total_pages
+        last_page = total_pages - 1
+
+    if has_next:
         component_params["next"] = {"href": url_generator(page_zero_indexed + 1)}
 
-    if total_pages <= 3:
+    if total_pages <= 3 and not open_ended:
         items = [
             {
                 "number": x + 1,
@@ -86,10 +162,10 @@ def govuk_pagination_params_builder(page_zero_indexed, total_pages, url_generato
         items = []
         num_pages_around_current = 2
 
-        pages_to_show = {0, page_zero_indexed, total_pages - 1}
+        pages_to_show = {0, page_zero_indexed} if open_ended else {0, page_zero_indexed, last_page}
         for x in range(1, num_pages_around_current + 1):
             pages_to_show.add(max(0, page_zero_indexed - x))
-            pages_to_show.add(min(total_pages - 1, page_zero_indexed + x))
+            pages_to_show.add(min(last_page, page_zero_indexed + x))
 
         last = -1
         for curr in sorted(pages_to_show):
@@ -105,49 +181,82 @@ def govuk_pagination_params_builder(page_zero_indexed, total_pages, url_generato
             )
             last = curr
 
+        # An open-ended list has more pages than were counted, so it never ends on a last-page link.
+        if open_ended and has_next:
+            items.append({"ellipsis": True})
+
     component_params["items"] = items
     component_params['classes'] = 'govuk-!-text-align-center'
 
     return component_params
 
 
-def govuk_flask_admin_include_css():
-    manifest_file = ROOT_DIR / "static" / "dist" / "manifest.json"
+def _get_govuk_flask_admin() -> "GovukFlaskAdmin":
+    return current_app.extensions["govuk_flask_admin"]
 
-    with open(manifest_file) as f:
-        manifest = json.load(f)
 
-    css_file = Path(manifest["src/assets/main.scss"]["file"]).name
-    css_file_url = url_for("govuk_flask_admin.static", filename=css_file)
+@pass_context
+def govuk_flask_admin_include_css(context):
+    # Marks the response as a GOV.UK admin page so that preload `Link` headers get added to it.
+    g._govuk_flask_admin_assets_included = True
 
-    return dedent(
-        f"""
-            <!-- FLASK_VITE_HEADER -->
-            <link rel="stylesheet" href="{css_file_url}"></link>
-        """
-    ).strip()
+    # `context.name` is the page template being rendered (e.g. admin/model/list.html), even inside base.html.
+    critical_entry = CRITICAL_CSS_ENTRIES.get(context.name) if _get_govuk_flask_admin().critical_css else None
+    nonce_attribute = context.get("admin_csp_nonce_attribute") or ""
+
+    return _get_govuk_flask_admin().manifest.css_tag(critical_entry, str(nonce_attribute))
 
 
 def govuk_flask_admin_include_js():
-    manifest_file = ROOT_DIR / "static" / "dist" / "manifest.json"
+    return _get_govuk_flask_admin().manifest.js_tag(required_js_entries())
 
-    with open(manifest_file) as f:
-        manifest = json.load(f)
 
-    js_file = Path(manifest["src/assets/main.js"]["file"]).name
-    js_file_url = url_for("govuk_flask_admin.static", filename=js_file)
+def govuk_flask_admin_asset_path():
+    return _get_govuk_flask_admin().manifest.asset_path()
 
-    return dedent(
-        f"""
-            <!-- FLASK_VITE_HEADER -->
-            <script type="module" src="{js_file_url}"></script>
-        """
-    ).strip()
+
+def govuk_flask_admin_require_select_with_search():
+    """For templates that render select-with-search.html themselves, so the page loads its script."""
+    require_js_entry(SELECT_WITH_SEARCH_ENTRY)
+    return ""
 
 
 class GovukFlaskAdmin:
-    def __init__(self, app: Flask, service_name: str | None = None):
+    def __init__(
+        self,
+        app: Flask,
+        service_name: str | None = None,
+        preload_assets: bool = True,
+        early_hints: bool = False,
+        assets_url: str | None = None,
+        critical_css: bool = True,
+        in_memory_assets: bool = False,
+        index_advice: bool = False,
+    ):
+        """
+        :param assets_url: Base URL of an external host (e.g. a CDN or nginx location) serving a copy of the
+            compiled assets, as exported by `flask govuk-flask-admin export-assets`. When set, CSS, JS and
+            GOV.UK Frontend's `assetPath` point there, so app workers don't serve static files.
+        :param critical_css: Inline the critical CSS built for the list, details and edit templates and load
+            the full stylesheet asynchronously, rather than blocking first paint on it.
+        :param in_memory_assets: Load the compiled asset bundle (and its precompressed variants) into memory at
+            startup and serve it from there, without any filesystem access per request.
+        :param preload_assets: Add `Link: <...>; rel=preload` headers for the main CSS, JS and GOV.UK fonts
+            to every admin page, so browsers can start fetching them before parsing the HTML.
+        :param early_hints: Also send those headers as a `103 Early Hints` response before the view runs.
+            This needs a WSGI server that exposes a `wsgi.early_hints` callable in the environ; otherwise it
+            is a no-op (many CDNs and proxies will generate early hints from the `Link` header themselves).
+        :param index_advice: Log a warning for each filter, sort or search column of the admin's model views
+            that no index can serve, with a suggested `CREATE INDEX`, when the app handles its first request.
+            The same report is available from `flask govuk-flask-admin index-advice`.
+        """
         self.service_name = service_name
+        self.preload_assets = preload_assets
+        self.early_hints = early_hints
+        self.assets_url = assets_url
+        self.critical_css = critical_css
+        self.in_memory_assets = in_memory_assets
+        self.index_advice = index_advice
 
         if app is not None:
             self.init_app(app)
@@ -163,6 +272,15 @@ class GovukFlaskAdmin:
         app.template_global("govuk_flask_admin_include_js")(
             govuk_flask_admin_include_js
         )
+        app.template_global("govuk_flask_admin_asset_path")(
+            govuk_flask_admin_asset_path
+        )
+        app.template_global("govuk_flask_admin_require_select_with_search")(
+            govuk_flask_admin_require_select_with_search
+        )
+        app.template_global("govuk_flask_admin_result_count")(
+            format_result_count
+        )
         app.template_global("govuk_pagination_data_builder")(
             govuk_pagination_params_builder
         )
@@ -206,16 +324,78 @@ class GovukFlaskAdmin:
                 ):
                     values.pop("govuk_flask_admin_host", None)
 
+    def __setup_preload_headers(self, app):
+        @app.after_request
+        def add_govuk_flask_admin_preload_links(response):
+            if g.get("_govuk_flask_admin_assets_included"):
+                response.headers.add("Link", self.preload_links())
+            return response
+
+        if self.early_hints:
+
+            @app.before_request
+            def send_govuk_flask_admin_early_hints():
+                send_early_hints = request.environ.get("wsgi.early_hints")
+                if send_early_hints is not None and request.blueprint in self._admin_blueprints():
+                    send_early_hints([("Link", self.preload_links())])
+
+    def __setup_index_advice(self, app):
+        # Model views are usually added after this extension is set up, so wait for the first request.
+        lock = threading.Lock()
+        logged = False
+
+        @app.before_request
+        def log_govuk_flask_admin_index_advice():
+            nonlocal logged
+            if logged:
+                return
+            with lock:
+                if logged:
+                    return
+                logged = True
+                for advice in advise_app_indexes(current_app.extensions.get("admin", [])):
+                    app.logger.warning("Missing index: %s", advice)
+
+    def _admin_blueprints(self) -> set[str]:
+        return {
+            view.blueprint.name
+            for admin in current_app.extensions.get("admin", [])
+            for view in admin._views
+            if view.blueprint is not None
+        }
+
+    def preload_links(self) -> str:
+        return self.manifest.preload_links(self.static_assets.match(PRELOAD_FONTS))
+
     def init_app(self, app: Flask, service_name: str | None = None):
         service_name = service_name or self.service_name
 
+        # Parse the Vite manifest once up front; in debug mode it is re-read whenever the file changes.
+        self.manifest = ViteManifest(MANIFEST_FILE, auto_reload=app.debug, base_url=self.assets_url)
+        self.static_assets = StaticAssets(self.manifest, ASSETS_DIR, in_memory=self.in_memory_assets)
+        if MANIFEST_FILE.exists():
+            self.manifest.load()
+            self.static_assets.load()
+
+        app.extensions["govuk_flask_admin"] = self
+
         self.__inject_jinja2_global_variables(app)
         self.__setup_static_routes(app)
+        app.cli.add_command(govuk_flask_admin_cli)
+
+        if self.preload_assets:
+            self.__setup_preload_headers(app)
+
+        if self.index_advice:
+            self.__setup_index_advice(app)
 
     def static(self, filename):
-        """Serve main CSS/JS assets from static/dist/assets/."""
-        dist = str(ROOT_DIR / "static" / "dist" / "assets")
-        return send_from_directory(dist, filename, max_age=60 * 60 * 24 * 7 * 52)
+        """Serve main CSS/JS assets from static/dist/assets/, using precompressed variants where accepted.
+
+        Content-hashed files are cached as immutable; fonts, images and anything else Vite copies verbatim
+        are revalidated against a precomputed ETag.
+        """
+        return self.static_assets.send(filename)
 
 
 def widget_for_sqlalchemy_type(*args):
@@ -386,6 +566,96 @@ class DateTimeBeforeFilter(sqla_filters.DateTimeSmallerFilter):
         return query.filter(column < value)
 
 
+def _clean_range(value, parse):
+    """
+    The two ends of a range filter's "<start> to <end>" value, parsed with `parse`. Either end can be left out
+    (giving None) for a range open at that end, but not both.
+    """
+    start, end = (part.strip() for part in value.split(RANGE_SEPARATOR.strip()))
+    if not start and not end:
+        raise ValueError("A range needs a start or an end")
+    return [parse(start) if start else None, parse(end) if end else None]
+
+
+class DateRangeFilter(sqla_filters.DateBetweenFilter):
+    """
+    Matches a range of days, with "From" and "To" date inputs, either of which can be left empty.
+
+    `GovukFilterConverter` doesn't generate it, as that would renumber the filters after it in links people have
+    kept. Add it to a view's `column_filters` yourself, e.g. `DateRangeFilter(User.created_at, "Created At")`.
+    """
+
+    def operation(self):
+        return "between"
+
+    def clean(self, value):
+        return _clean_range(value, lambda end: datetime.strptime(end, "%Y-%m-%d").date())
+
+    def validate(self, value):
+        try:
+            start, end = self.clean(value)
+        except ValueError:
+            return False
+        return start is None or end is None or start <= end
+
+    def apply(self, query, value, alias=None):
+        """Apply filter as one half-open range, including every day from the start to the end.
+
+        `col >= start AND col < end + 1 day` rather than `BETWEEN`, so it's a single predicate an index on the
+        column can serve, and it still matches all of the end day if the column holds datetimes. A range with
+        only a start or an end is open at the other.
+        """
+        start, end = value
+        column = self.get_column(alias)
+
+        criteria = []
+        if start is not None:
+            criteria.append(column >= start)
+        if end is not None:
+            criteria.append(column < end + timedelta(days=1))
+        return query.filter(and_(*criteria))
+
+
+class DateTimeRangeFilter(sqla_filters.DateTimeBetweenFilter):
+    """
+    Matches a range of times, to the second, with "From" and "To" inputs, either of which can be left empty.
+
+    Like `DateRangeFilter`, it isn't generated by `GovukFilterConverter`; add it to a view's `column_filters`.
+    """
+
+    def operation(self):
+        return "between"
+
+    def clean(self, value):
+        return _clean_range(value, lambda end: datetime.strptime(end, "%Y-%m-%d %H:%M:%S"))
+
+    def validate(self, value):
+        try:
+            start, end = self.clean(value)
+        except ValueError:
+            return False
+        return start is None or end is None or start <= end
+
+    def apply(self, query, value, alias=None):
+        """Apply filter as one half-open range, with second-level precision support.
+
+        As with `DateTimeEqualFilter`, an end with no microseconds means all of that second, so the range is
+        `col >= start AND col < end + 1 second`. Otherwise it ends at exactly the end value. A range with only
+        a start or an end is open at the other.
+        """
+        start, end = value
+        column = self.get_column(alias)
+
+        criteria = []
+        if start is not None:
+            criteria.append(column >= start)
+        if end is not None and end.microsecond == 0:
+            criteria.append(column < end + timedelta(seconds=1))
+        elif end is not None:
+            criteria.append(column <= end)
+        return query.filter(and_(*criteria))
+
+
 class TimeAfterFilter(sqla_filters.TimeGreaterFilter):
     def operation(self):
         return "after"
@@ -396,14 +666,140 @@ class TimeBeforeFilter(sqla_filters.TimeSmallerFilter):
         return "before"
 
 
+class FilterInValues(sqla_filters.BaseSQLAFilter):
+    """
+    Matches rows whose column is one of a list of values, e.g. IDs or email addresses pasted from a spreadsheet.
+
+    `GovukFilterConverter` leaves out Flask-Admin's "in list" filters, so add this to a view's `column_filters`
+    yourself, e.g. `FilterInValues(User.email, "Email")`. Values are entered in a textarea, one per line or separated
+    by commas, or picked from a select-with-search when the filter has `options` (enum columns get their members).
+    Lists longer than `max_bound_values` are sent to the database as a single parameter, and lists too long for the
+    list page's links are kept in the view's `value_list_store` (see `govuk_flask_admin.value_lists`).
+    """
+
+    # Tells `FilterState` to join repeated values (e.g. from a multiple select) into one list.
+    multiple_values = True
+
+    def __init__(self, column, name, options=None, max_bound_values: int = MAX_BOUND_VALUES):
+        self.enum_class = getattr(column.type, "enum_class", None)
+        if options is None and self.enum_class is not None:
+            options = [(member.name, member.value) for member in self.enum_class]
+
+        super().__init__(column, name, options, data_type="value-list")
+        self.max_bound_values = max_bound_values
+
+    def clean(self, value):
+        values = dict.fromkeys(part.strip() for part in re.split(r"[\n,]", value) if part.strip())
+        if not values:
+            # `IN ()` would match nothing, which looks like a list with no matches rather than no list.
+            raise ValueError("No values given")
+        return [self._convert(value) for value in values]
+
+    def _convert(self, value):
+        if self.enum_class is not None:
+            try:
+                return self.enum_class[value]
+            except KeyError:
+                raise ValueError(f"{value!r} isn't one of the options") from None
+
+        try:
+            python_type = self.column.type.python_type
+        except NotImplementedError:
+            return value
+
+        try:
+            if python_type in (date, datetime):
+                return python_type.fromisoformat(value)
+            return python_type(value)
+        except (ArithmeticError, TypeError) as e:
+            raise ValueError(str(e)) from e
+
+    def apply(self, query, value, alias=None):
+        return query.filter(in_values(self.get_column(alias), value, self.max_bound_values))
+
+    def operation(self):
+        return "is one of"
+
+
+class FilterRelated(sqla_filters.BaseSQLAFilter):
+    """
+    Matches rows related to one chosen object through a many-to-one relationship, e.g. posts by one author.
+
+    Flask-Admin's filters for a relationship (`column_filters = ["author"]`) match the related model's columns. To
+    pick the related object itself, add this filter, e.g. `FilterRelated(Post.author, "Author", ["name", "email"])`.
+    Its options aren't loaded with the list: the filter form renders only the chosen object, and the
+    select-with-search looks others up as you type, `page_size` at a time, from the view's `filter_lookup` endpoint.
+    Each word typed must match one of `search_fields` in `search_mode` (see `govuk_flask_admin.search`).
+    """
+
+    def __init__(
+        self,
+        relationship,
+        name,
+        search_fields: t.Sequence,
+        page_size: int = 20,
+        order_by=None,
+        search_mode: str = CONTAINS,
+        label: t.Callable[[t.Any], str] = str,
+    ):
+        prop = relationship.property
+        if prop.direction is not MANYTOONE or len(prop.local_columns) != 1:
+            raise ValueError(f"{relationship} must be a many-to-one relationship on one column")
+
+        super().__init__(next(iter(prop.local_columns)), name, data_type="relationship-lookup")
+        self.model = prop.mapper.class_
+        [self.primary_key] = prop.mapper.primary_key
+        self._primary_key_attr = prop.mapper.get_property_by_column(self.primary_key).key
+        self.search_fields = [getattr(self.model, field) if isinstance(field, str) else field for field in search_fields]
+        self.page_size = page_size
+        self.order_by = order_by if order_by is not None else self.primary_key
+        self.search_mode = search_mode
+        self.label = label
+
+    def clean(self, value):
+        try:
+            return self.primary_key.type.python_type(value.strip())
+        except NotImplementedError:
+            return value.strip()
+
+    def apply(self, query, value, alias=None):
+        return query.filter(self.get_column(alias) == value)
+
+    def operation(self):
+        return "is"
+
+    def lookup(self, session, term: str, page: int = 0) -> tuple[list[tuple[t.Any, str]], bool]:
+        """One page of (value, label) options matching `term`, and whether there are more."""
+        stmt = select(self.model)
+        for word in term.split():
+            criteria = [search_criterion(field, self.search_mode, word) for field in self.search_fields]
+            stmt = stmt.where(or_(*[criterion for criterion in criteria if criterion is not None], false()))
+
+        # One extra row says whether there's another page, without counting the matches.
+        rows = session.scalars(stmt.order_by(self.order_by).offset(page * self.page_size).limit(self.page_size + 1)).all()
+        return [self.option(row) for row in rows[: self.page_size]], len(rows) > self.page_size
+
+    def get_option(self, session, value) -> tuple[t.Any, str] | None:
+        """The (value, label) option for an active filter value, or None if there's no such object."""
+        try:
+            obj = session.get(self.model, self.clean(value))
+        except (TypeError, ValueError):
+            return None
+        return self.option(obj) if obj is not None else None
+
+    def option(self, obj) -> tuple[t.Any, str]:
+        return getattr(obj, self._primary_key_attr), self.label(obj)
+
+
 class GovukFilterConverter(sqla_filters.FilterConverter):
     """
     Custom filter converter for GOV.UK Flask Admin.
 
     Customizations:
-    - Removes "in list" and "not in list" filters from all column types
+    - Removes "in list" and "not in list" filters from all column types (add `FilterInValues` where they're needed)
     - Automatically excludes FilterEmpty from non-nullable columns
     - Uses "before" and "after" labels for date/time comparison filters
+    - Removes date/time "between" filters (add `DateRangeFilter` or `DateTimeRangeFilter` for a half-open range)
     """
 
     # Override filter tuples to exclude InList/NotInList filters globally
@@ -461,7 +857,7 @@ class GovukFilterConverter(sqla_filters.FilterConverter):
         DateAfterFilter,  # Custom: "after" instead of "greater than"
         DateBeforeFilter,  # Custom: "before" instead of "smaller than"
         sqla_filters.FilterEmpty,
-        # Removed: DateBetweenFilter, DateNotBetweenFilter
+        # Removed: DateBetweenFilter, DateNotBetweenFilter (opt in to `DateRangeFilter` instead)
     )
 
     datetime_filters = (
@@ -470,7 +866,7 @@ class GovukFilterConverter(sqla_filters.FilterConverter):
         DateTimeAfterFilter,  # Custom: "after" instead of "greater than" + second-level precision
         DateTimeBeforeFilter,  # Custom: "before" instead of "smaller than" + second-level precision
         sqla_filters.FilterEmpty,
-        # Removed: DateTimeBetweenFilter, DateTimeNotBetweenFilter
+        # Removed: DateTimeBetweenFilter, DateTimeNotBetweenFilter (opt in to `DateTimeRangeFilter` instead)
     )
 
     time_filters = (
@@ -575,15 +971,40 @@ class GovukFilterConverter(sqla_filters.FilterConverter):
         if not options:
             options = [(v, v) for v in column.type.enums]
 
+        # Filters take enum members by name but people know them by value; pair the two once here, rather than
+        # in the template for every option on every render.
+        options = self._enum_options(getattr(column.type, "enum_class", None), options)
+
         filter_classes = self._get_filter_list(column, self.enum)
         return [f(column, name, options, **kwargs) for f in filter_classes]
 
+    @staticmethod
+    def _enum_options(enum_class, options) -> list[tuple[t.Any, t.Any]]:
+        """(submitted value, label) pairs for an enum column's options, labelling members with their values."""
+        if enum_class is None:
+            return list(options)
+
+        members = {}
+        for member in enum_class:
+            members[member.name] = member
+            if isinstance(member.value, t.Hashable):
+                members.setdefault(member.value, member)
+
+        return [
+            (value, members[value].value if isinstance(value, t.Hashable) and value in members else label)
+            for value, label in options
+        ]
+
     @sqla_filters.filters.convert("uuid")
     def conv_uuid(self, column, name, **kwargs):
         filter_classes = self._get_filter_list(column, self.uuid_filters)
         return [f(column, name, **kwargs) for f in filter_classes]
 
 
+# Set by the list page's script when `defer_count` is on, so later list pages know they can defer their count.
+DEFER_COUNT_COOKIE = "govuk_flask_admin_js"
+
+
 class GovukModelView(ModelView):
     model_form_converter = GovukAdminModelConverter
     filter_converter = GovukFilterConverter()
@@ -595,6 +1016,44 @@ class GovukModelView(ModelView):
         datetime: lambda view, value, name: value.strftime('%Y-%m-%d %H:%M:%S') if value else ''
     }
 
+    # Paginate the list view with keyset ("seek") cursors on (sort column, primary key) instead of
+    # COUNT(*) and OFFSET, so deep pages are as cheap as the first. The total isn't shown and pagination
+    # is previous/next only. Sorts through a relationship, or on more than one column, fall back to
+    # offset pagination, as do models with a composite primary key.
+    keyset_pagination = False
+
+    # How the list view's total is worked out: `ExactCount()` (the default), `CappedCount(cap)`,
+    # `EstimatedCount()`, which uses database statistics for unfiltered lists, or `WindowCount()`, which counts with
+    # `COUNT(*) OVER ()` in the same query as the page of rows. See `govuk_flask_admin.counting`.
+    count_strategy: CountStrategy = ExactCount()
+
+    # Count no further than this many rows (with `SELECT count(*) FROM (SELECT 1 ... LIMIT count_cap + 1)`), showing
+    # e.g. "10,000+ results" and open-ended pagination beyond it. Takes the place of `count_strategy` when set.
+    count_cap: int | None = None
+
+    # Send the list page without waiting for its total: rows are shown with a placeholder count and previous/next
+    # links, and a script fetches the total from `count_view` to fill in the count, page links and export buttons.
+    # The script sets a cookie saying JavaScript is available; until then (or without it) lists are counted as usual.
+    defer_count = False
+
+    # Keep list totals between requests, keyed by the list's search and filters, e.g. `CountCache(ttl=60)`.
+    # Only use this if `get_count_query` gives the same answer to everyone (see `get_count_cache_key`).
+    count_cache: CountCache | None = None
+
+    # Where long lists given to value-list filters (e.g. `FilterInValues`) are kept, so the list page's links carry a
+    # short token rather than every value. The filter form is posted to `filter_view` to store them. With None, the
+    # form is a GET and lists stay in the URL.
+    value_list_store: ValueListStore | None = ValueListStore()
+
+    # How the search box finds rows: Flask-Admin's `ILIKE '%term%'` on each searchable column by default, or a full-text
+    # index such as `SQLiteFTS5Search()` or `PostgresFullTextSearch()`. See `govuk_flask_admin.search`.
+    search_backend: SearchBackend = LikeSearch()
+
+    # How `LikeSearch` matches each word against a searchable column, e.g. `{"email": "prefix", "job": "exact"}`:
+    # "exact", "prefix", "casefold" (exact, ignoring case) or "contains" (the default). Exact and prefix matches can
+    # use an ordinary index on the column. See `govuk_flask_admin.search`.
+    column_search_modes: dict[str, str] | None = None
+
     def __init__(
         self,
         model,
@@ -623,103 +1082,93 @@ class GovukModelView(ModelView):
             menu_icon_value=menu_icon_value,
         )
 
-    def _get_list_filter_args(self):
+    def get_url(self, endpoint, **kwargs):
         """
-        Override to combine GOV.UK date input fields before processing filters
-        and include filter operation in the result.
+        Override to build the view's links with the current request's `UrlBuilder`, which resolves each endpoint's
+        path once and then only encodes the query string, rather than matching a URL rule for every link.
+        """
+        return build_url(endpoint, **kwargs)
 
-        GOV.UK date inputs create three separate fields with -day, -month, -year suffixes.
-        Flask-Admin expects a single field with YYYY-MM-DD format. This method intercepts
-        the request parameters and combines the GOV.UK date fields before passing them to
-        Flask-Admin's filter processing.
+    def get_filter_state(self) -> FilterState:
+        """
+        The list's active filters, parsed from the request once and kept on `flask.g` for the rest of it.
 
-        Also enhances the filter data to include the operation name (e.g., "equals", "after")
-        for better display in the UI.
+        GOV.UK date inputs (separate -day, -month and -year fields) are combined into the single YYYY-MM-DD
+        value Flask-Admin's filters expect, and empty filter fields are ignored. Invalid values are flashed
+        once, the first time the request's filters are parsed.
         """
-        from flask import request, flash
-        from werkzeug.datastructures import ImmutableMultiDict
-        from flask_admin.babel import gettext
+        current_request = request._get_current_object()
+        states = g.setdefault("_govuk_flask_admin_filter_states", {})
 
-        # Build modified args dict, filtering out empty filter values
-        modified = {}
-        for key in request.args.keys():
-            # Get all values for this key (handles multi-value params)
-            values = request.args.getlist(key)
+        cached = states.get(self.endpoint)
+        if cached is not None and cached[0] is current_request:
+            return cached[1]
 
-            # Skip empty filter parameters (but keep non-filter params like search, page, etc.)
-            # Filter params start with 'flt' followed by digits
-            if key.startswith('flt') and all(v == '' or (isinstance(v, str) and v.strip() == '') for v in values):
-                continue
-
-            if len(values) == 1:
-                modified[key] = values[0]
+        state = FilterState.parse(request.args, self._filter_args or {}, self.value_list_store)
+        for value, flt in state.invalid:
+            if self.value_list_store is not None and self.value_list_store.is_token(value):
+                flash(f"The list of values for {flt.name} has expired. Enter it again.", "error")
             else:
-                modified[key] = values
-
-        # Find and combine GOV.UK date fields
-        # Look for fields ending with -day that start with 'flt'
-        for arg in request.args:
-            if arg.startswith('flt') and arg.endswith('-day'):
-                base = arg[:-4]  # Remove '-day' suffix
-                month_key = base + '-month'
-                year_key = base + '-year'
-
-                if month_key in request.args and year_key in request.args:
-                    day = request.args[arg].strip()
-                    month = request.args[month_key].strip()
-                    year = request.args[year_key].strip()
-
-                    # Only combine if all three parts are present
-                    if day and month and year:
-                        # Create YYYY-MM-DD format, padding day and month to 2 digits
-                        modified[base] = f"{year}-{month.zfill(2)}-{day.zfill(2)}"
-
-                        # Remove the individual component fields so they don't interfere
-                        modified.pop(arg, None)
-                        modified.pop(month_key, None)
-                        modified.pop(year_key, None)
-
-        # Temporarily replace request.args with modified version for filter processing
-        original_args = request.args
-        request.args = ImmutableMultiDict(modified)
+                flash(self.get_invalid_value_msg(value, flt), "error")
 
-        try:
-            # Process filters manually to include operation name
-            if self._filters:
-                filters = []
+        states[self.endpoint] = (current_request, state)
+        return state
 
-                for arg in request.args:
-                    if not arg.startswith("flt"):
-                        continue
+    def _has_value_list_filters(self) -> bool:
+        return any(getattr(flt, "multiple_values", False) for flt in self._filters or ())
 
-                    if "_" not in arg:
-                        continue
-
-                    pos, key = arg[3:].split("_", 1)
+    @expose("/filter/", methods=("POST",))
+    def filter_view(self):
+        """
+        Takes the posted filter form and redirects to the list it describes, with lists given to value-list filters
+        that are longer than `value_list_store.min_length` kept in the store and replaced by their token.
+        """
+        if self.value_list_store is None:
+            abort(404)
 
-                    if key in self._filter_args:
-                        idx, flt = self._filter_args[key]
+        args = {}
+        for key, values in request.form.lists():
+            values = [value for value in values if value.strip()]
+            if not values:
+                continue
 
-                        value = request.args[arg]
+            flt = None
+            if key.startswith(FILTER_ARG_PREFIX):
+                _idx, flt = (self._filter_args or {}).get(key.partition("_")[2], (None, None))
+            if getattr(flt, "multiple_values", False):
+                joined = "\n".join(values)
+                if len(joined) > self.value_list_store.min_length:
+                    values = [self.value_list_store.put(joined)]
 
-                        if flt.validate(value):
-                            # Get the operation name from the filter
-                            operation = flt.operation()
-                            # Create tuple with operation: (idx, flt.name, operation, value)
-                            from flask_admin.babel import gettext
-                            from flask_admin.model.helpers import prettify_name
-                            data = (pos, (idx, prettify_name(flt.name), operation, value))
-                            filters.append(data)
-                        else:
-                            flash(self.get_invalid_value_msg(value, flt), "error")
+            args[key] = values
 
-                # Sort filters and return
-                return [v[1] for v in sorted(filters, key=lambda n: n[0])]
+        return redirect(self.get_url(".index_view", **args))
 
+    def _get_list_filter_args(self):
+        """
+        Override to return the request's `FilterState`, whose filters also carry their operation name
+        (e.g. "equals", "after") for display.
+        """
+        if not self._filters:
             return None
-        finally:
-            # Restore original request.args
-            request.args = original_args
+
+        return self.get_filter_state()
+
+    def _as_filter_state(self, filters) -> FilterState:
+        """
+        The given filters as a `FilterState`, e.g. for a list of Flask-Admin's `(index, name, value)` tuples
+        from elsewhere.
+        """
+        if isinstance(filters, FilterState):
+            return filters
+
+        active_filters, arg_names = [], []
+        for idx, name, *_operation, value in filters or ():
+            flt = self._filters[idx]
+            active_filters.append(ActiveFilter(idx, name, flt.operation(), value))
+            arg_names.append(self.get_filter_arg(idx, flt))
+
+        return FilterState(active_filters, arg_names)
 
     def _get_remove_filter_url(
         self,
@@ -737,7 +1186,7 @@ class GovukModelView(ModelView):
         Generate URL to remove a specific filter while preserving other state.
 
         :param filter_position: Position of filter to remove in active_filters list
-        :param active_filters: List of currently active filters (idx, flt_name, operation, value) tuples
+        :param active_filters: The list's `FilterState`
         :param return_url: Base return URL
         :param sort_column: Current sort column index
         :param sort_desc: Whether sort is descending
@@ -746,25 +1195,7 @@ class GovukModelView(ModelView):
         :param default_page_size: Default page size
         :param extra_args: Extra query arguments to preserve
         """
-        # Build filter args excluding the one to remove
-        # active_filters is a list of (idx, flt_name, operation, value) tuples
-        filter_args = {}
-        for pos, filter_data in enumerate(active_filters):
-            if pos != filter_position:
-                # Handle both 3-tuple (old format) and 4-tuple (new format with operation)
-                if len(filter_data) == 4:
-                    idx, flt_name, operation, value = filter_data
-                else:
-                    idx, flt_name, value = filter_data
-
-                # Reconstruct filter key using the format Flask-Admin expects
-                # The key format is: flt{position}_{arg_name}
-                # where arg_name comes from get_filter_arg(idx, filter_obj)
-                if idx < len(self._filters):
-                    filter_obj = self._filters[idx]
-                    arg_name = self.get_filter_arg(idx, filter_obj)
-                    filter_key = f"flt{pos}_{arg_name}"
-                    filter_args[filter_key] = value
+        filter_args = self._as_filter_state(active_filters).url_args_without(filter_position)
 
         # Build complete URL with all state preserved
         kwargs = {}
@@ -792,6 +1223,63 @@ class GovukModelView(ModelView):
 
         return self.get_url('.index_view', **kwargs)
 
+    def init_search(self):
+        """
+        Override to give the view's `search_backend` the searchable columns, once Flask-Admin has found them.
+        """
+        search_supported = super().init_search()
+        self._search_modes = None
+
+        if search_supported:
+            self._search_modes = self._get_search_modes()
+            self.search_backend.bind(self)
+
+        return search_supported
+
+    def _get_search_modes(self) -> list[str]:
+        """The search mode of each of `_search_fields`, from `column_search_modes`."""
+        modes = dict(self.column_search_modes or {})
+
+        unknown = set(modes) - {name for name in self.column_searchable_list if isinstance(name, str)}
+        if unknown:
+            raise ValueError(f"column_search_modes has columns that aren't in column_searchable_list: {sorted(unknown)}")
+        invalid = {mode for mode in modes.values() if mode not in SEARCH_MODE_LABELS}
+        if invalid:
+            raise ValueError(f"Unknown search modes {sorted(invalid)}; use one of {sorted(SEARCH_MODE_LABELS)}")
+
+        search_modes = []
+        for name in self.column_searchable_list:
+            mode = modes.get(name, CONTAINS) if isinstance(name, str) else CONTAINS
+            attr, _joins = sqla_tools.get_field_with_path(self.model, name)
+            fields = 1 if sqla_tools.is_hybrid_property(self.model, name) else len(sqla_tools.get_columns_for_field(attr))
+            search_modes.extend([mode] * fields)
+
+        return search_modes
+
+    def search_placeholder(self):
+        """
+        Override to say how columns that don't match anywhere in their value are matched, e.g.
+        "Email (starts with), Name".
+        """
+        if not self.column_searchable_list:
+            return None
+
+        placeholders = []
+        for name in self.column_searchable_list:
+            key = name.key if isinstance(name, InstrumentedAttribute) else name
+            placeholder = str(self.column_labels.get(key, key))
+
+            label = SEARCH_MODE_LABELS[(self.column_search_modes or {}).get(key, CONTAINS)]
+            placeholders.append(f"{placeholder} ({label})" if label else placeholder)
+
+        return ", ".join(placeholders)
+
+    def _apply_search(self, query, count_query, joins, count_joins, search):
+        """
+        Override to search with the view's `search_backend`.
+        """
+        return self.search_backend.apply(self, query, count_query, joins, count_joins, search)
+
     def _get_remove_search_url(
         self,
         filter_args,
@@ -837,51 +1325,494 @@ class GovukModelView(ModelView):
 
     def _get_filters(self, filters):
         """
-        Override to handle 4-tuple filter format (idx, flt_name, operation, value).
-        Get active filters as dictionary of URL arguments and values.
+        Override to read the URL arguments for the active filters from their `FilterState`.
         """
-        kwargs = {}
-
-        if filters:
-            for i, filter_data in enumerate(filters):
-                # Handle both 3-tuple (old format) and 4-tuple (new format with operation)
-                if len(filter_data) == 4:
-                    idx, flt_name, operation, value = filter_data
-                else:
-                    idx, flt_name, value = filter_data
-
-                key = "flt%d_%s" % (i, self.get_filter_arg(idx, self._filters[idx]))
-                kwargs[key] = value
-
-        return kwargs
+        return dict(self._as_filter_state(filters).url_args)
 
     def _apply_filters(self, query, count_query, joins, count_joins, filters):
         """
-        Override to handle 4-tuple filter format (idx, flt_name, operation, value).
+        Override to apply all the filters in a `FilterState` in one pass, rather than one at a time.
+
+        Each relationship a filter needs is joined once, with the same alias in the list and count queries,
+        so the criteria for every filter are built once and added to both queries as a single WHERE clause.
         """
         if not filters:
             return query, count_query, joins, count_joins
 
-        for filter_data in filters:
-            # Handle both 3-tuple (old format) and 4-tuple (new format with operation)
-            if len(filter_data) == 4:
-                idx, _flt_name, _operation, value = filter_data
+        criteria, count_criteria = [], []
+        for active_filter in self._as_filter_state(filters):
+            flt = self._filters[active_filter.index]
+
+            alias = count_alias = None
+            if isinstance(flt, sqla_filters.BaseSQLAFilter):
+                path = self._filter_joins.get(flt.key_name or flt.column, [])
+                query, count_query, alias, count_alias = self._apply_filter_path_joins(
+                    query, count_query, joins, count_joins, path
+                )
+
+            value = flt.clean(active_filter.value)
+
+            try:
+                filter_criteria = self._get_filter_criteria(flt, value, alias)
+            except AttributeError:
+                # The filter does more than add criteria, so it has to be given the queries themselves.
+                query = self._call_filter_apply(flt, query, value, alias)
+                if count_query is not None:
+                    count_query = self._call_filter_apply(flt, count_query, value, count_alias)
+                continue
+
+            criteria.extend(filter_criteria)
+            if count_query is not None:
+                same_alias = count_alias is alias
+                count_criteria.extend(
+                    filter_criteria if same_alias else self._get_filter_criteria(flt, value, count_alias)
+                )
+
+        if criteria:
+            query = query.filter(and_(*criteria))
+        if count_criteria:
+            count_query = count_query.filter(and_(*count_criteria))
+
+        return query, count_query, joins, count_joins
+
+    def _apply_filter_path_joins(self, query, count_query, joins, count_joins, path):
+        """
+        Outer-join a filter's relationship path onto the list and count queries, unless they already have it.
+
+        Paths joined here use the same alias in both queries, so criteria built against one apply to the other.
+        Returns both queries and the alias of the last join in each (None for plain tables).
+        """
+        alias = count_alias = None
+
+        for item in path:
+            key = (False, item)
+            if key in joins:
+                shared_alias = joins[key]
+            elif key in count_joins:
+                shared_alias = count_joins[key]
             else:
-                idx, _flt_name, value = filter_data
+                shared_alias = None if isinstance(item, Table) else aliased(item.property.mapper.class_)
 
-            flt = self._filters[idx]
+            query, alias = self._join_filter_path_item(query, joins, key, item, alias, shared_alias)
+            if count_query is not None:
+                count_query, count_alias = self._join_filter_path_item(
+                    count_query, count_joins, key, item, count_alias, shared_alias
+                )
+
+        return query, count_query, alias, count_alias
+
+    @staticmethod
+    def _join_filter_path_item(query, joins, key, item, last, alias):
+        # As Flask-Admin's `_apply_path_joins`, with the alias chosen by the caller.
+        if key in joins:
+            return query, joins[key]
+
+        target = item if last is None else getattr(last, item.key)
+        query = query.outerjoin(target) if alias is None else query.outerjoin(alias, target)
+        joins[key] = alias
+        return query, alias
 
-            # The rest is the same as parent implementation
-            # We need to call parent's logic but it expects 3-tuple, so convert back
-            original_filter = (idx, _flt_name, value)
+    def _get_filter_criteria(self, flt, value, alias) -> list:
+        """
+        The criteria a filter adds to a query, collected with a `FilterCriteria` rather than a real query.
+        Raises AttributeError if the filter does anything other than call `filter()`.
+        """
+        collected = self._call_filter_apply(flt, FilterCriteria(), value, alias)
+        if not isinstance(collected, FilterCriteria):
+            raise AttributeError(f"{flt!r} didn't return the query it was given")
+        return collected.criteria
 
-            # Apply the filter using the parent's logic by calling it with single filter
-            query, count_query, joins, count_joins = super()._apply_filters(
-                query, count_query, joins, count_joins, [original_filter]
+    @staticmethod
+    def _call_filter_apply(flt, query, value, alias):
+        try:
+            return flt.apply(query, value, alias)
+        except TypeError:
+            # Custom filters written before Flask-Admin added the `alias` argument.
+            if len(inspect.getfullargspec(flt.apply).args) != 3:
+                raise
+            warnings.warn(
+                f"Please update your custom filter {flt!r} to include additional `alias` parameter.", stacklevel=1
+            )
+            return flt.apply(query, value)
+
+    def _get_list_extra_args(self):
+        """
+        Override to keep the keyset cursor out of `extra_args`, so sort, search, filter and page size
+        links start again from the first page rather than carrying a cursor for a different list, and so
+        those links share the request's `FilterState` rather than copying it.
+        """
+        view_args = super()._get_list_extra_args()
+        view_args.extra_args.pop(CURSOR_ARG, None)
+        return FilterViewArgs(**vars(view_args))
+
+    def _get_keyset_columns(self, sort_column, sort_desc) -> KeysetColumns | None:
+        """
+        Work out the (sort column, primary key) pair to paginate the list on, or None if the current
+        sort can't be expressed as a keyset and offset pagination should be used instead.
+        """
+        if isinstance(self._primary_key, tuple):
+            return None
+
+        pk = getattr(self.model, self._primary_key)
+        explicit_nulls = self._get_dialect_name() not in ("mysql", "mariadb")
+
+        if sort_column is not None:
+            sort = self._sortable_columns.get(sort_column)
+            if isinstance(sort, list) or self._sortable_joins.get(sort_column):
+                return None
+            descending = bool(sort_desc)
+        else:
+            order = list(self._get_default_order())
+            if not order:
+                return KeysetColumns(sort=None, pk=pk, explicit_nulls=explicit_nulls)
+            if len(order) > 1 or order[0][1]:
+                return None
+            sort, _joins, descending = order[0]
+
+        if isinstance(sort, Column):
+            try:
+                sort = getattr(self.model, self.model.__mapper__.get_property_by_column(sort).key)
+            except UnmappedColumnError:
+                return None
+
+        if not isinstance(getattr(sort, "property", None), ColumnProperty):
+            return None
+
+        if sort.key == pk.key:
+            sort = None
+
+        return KeysetColumns(sort=sort, pk=pk, descending=bool(descending), explicit_nulls=explicit_nulls)
+
+    def _get_dialect_name(self) -> str:
+        return self.session.get_bind(mapper=self.model.__mapper__).dialect.name
+
+    def _coerce_cursor_pk(self, keyset: KeysetColumns, pk):
+        """
+        The cursor's primary key as the column's Python type (e.g. a `uuid.UUID` from the string it was
+        encoded as), or None if it isn't a valid value for the column.
+        """
+        try:
+            python_type = keyset.pk.type.python_type
+        except NotImplementedError:
+            return pk
+
+        if isinstance(pk, python_type):
+            return pk
+
+        try:
+            return python_type(pk)
+        except (TypeError, ValueError, AttributeError):
+            return None
+
+    def _apply_keyset_pagination(self, query, keyset: KeysetColumns, page_size):
+        """
+        Order the query on the keyset and read one page after (or before) the cursor in the request.
+
+        One extra row is fetched to tell whether there is another page in the direction of travel.
+        Returns the query and the decoded cursor, or None if the list is being read from the start.
+        """
+        cursor = KeysetCursor.decode(request.args.get(CURSOR_ARG))
+        boundary = None
+        cursor_pk = self._coerce_cursor_pk(keyset, cursor.pk) if cursor is not None else None
+        if cursor_pk is not None:
+            try:
+                boundary = self.session.execute(
+                    select(keyset.sort if keyset.sort is not None else keyset.pk, keyset.pk).where(
+                        keyset.pk == cursor_pk
+                    )
+                ).first()
+            except StatementError:
+                # The value couldn't be bound for the column, e.g. a crafted cursor of the wrong type.
+                self.session.rollback()
+
+        # A missing, invalid or stale cursor (e.g. the boundary row has been deleted) starts from the beginning.
+        if boundary is None:
+            return query.order_by(*keyset.order_by()).limit(page_size + 1), None
+
+        sort_value, pk_value = boundary
+        after = cursor.direction == NEXT
+        query = query.filter(keyset.seek(sort_value, pk_value, after=after))
+        query = query.order_by(*keyset.order_by(reverse=not after))
+
+        return query.limit(page_size + 1), cursor
+
+    def _finish_keyset_page(self, rows, cursor, page, page_size):
+        """
+        Trim the look-ahead row, restore list order after reading backwards, and record the cursors
+        for the neighbouring pages on `flask.g` for `render`.
+        """
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if cursor is not None and cursor.direction == PREVIOUS:
+            rows.reverse()
+            has_previous, has_next = has_more, True
+        else:
+            has_previous, has_next = cursor is not None, has_more
+
+        def cursor_for(direction, row):
+            pk = self.get_pk_value(row)
+            return KeysetCursor(direction, pk if isinstance(pk, (str, int)) else str(pk)).encode()
+
+        g._govuk_flask_admin_keyset_page = KeysetPage(
+            page=max(page, 1) if has_previous else 0,
+            previous_cursor=cursor_for(PREVIOUS, rows[0]) if has_previous and rows else None,
+            next_cursor=cursor_for(NEXT, rows[-1]) if has_next and rows else None,
+        )
+
+        return rows
+
+    def get_count_cache_key(self, search, filters) -> t.Hashable:
+        """
+        Key for a list total in `count_cache`: the view, its search and its parsed filters, in a canonical
+        order. Override to add anything else `get_count_query` depends on, such as the current user.
+        """
+        # The filter index and value are all that affect the count.
+        canonical_filters = [(flt.index, flt.value) for flt in self._as_filter_state(filters)]
+
+        return self.endpoint, search or None, tuple(sorted(canonical_filters, key=repr))
+
+    def _get_count_strategy(self) -> CountStrategy:
+        return CappedCount(self.count_cap) if self.count_cap is not None else self.count_strategy
+
+    def _is_filtered(self, search, filters) -> bool:
+        return bool((self._search_supported and search) or (filters and self._filters))
+
+    def _get_cached_list_count(self, search, filters):
+        if self.count_cache is None:
+            return None
+        return self.count_cache.get(self.get_count_cache_key(search, filters))
+
+    def _cache_list_count(self, count, count_query, search, filters):
+        if self.count_cache is not None:
+            self.count_cache.set(self.get_count_cache_key(search, filters), count, query_tables(count_query.statement))
+
+    def _get_list_count(self, count_query, search, filters):
+        """
+        Work out the list total with `count_strategy`, going through `count_cache` if there is one.
+        """
+        count = self._get_cached_list_count(search, filters)
+        if count is None:
+            count = self._get_count_strategy().count(self, count_query, filtered=self._is_filtered(search, filters))
+            self._cache_list_count(count, count_query, search, filters)
+
+        return count
+
+    def _get_windowed_list(self, query, count_query, page, search, filters):
+        """
+        Fetch a page of the list with its total in the same query, for `WindowCount`.
+        """
+        count_strategy = self._get_count_strategy()
+        data, count = count_strategy.split_rows(count_strategy.add_to_query(query).all())
+
+        if count is None:
+            # An empty first page means an empty list; past that the rows may just have run out.
+            count = ResultCount(0) if not page else count_strategy.count(
+                self, count_query, filtered=self._is_filtered(search, filters)
+            )
+
+        self._cache_list_count(count, count_query, search, filters)
+        return count, data
+
+    def _build_list_queries(self, search, filters, with_count=True):
+        """
+        The list query and (optionally) count query with the search and filters applied, as in Flask-Admin's
+        `get_list`. Returns `(query, count_query, joins, count_joins)`.
+        """
+        # Will contain join paths with optional aliased object
+        joins = {}
+        count_joins = {}
+
+        query = self.get_query()
+        count_query = self.get_count_query() if with_count else None
+
+        # Ignore eager-loaded relations (prevent unnecessary joins)
+        if hasattr(query, "_join_entities"):
+            for entity in query._join_entities:
+                for table in entity.tables:
+                    joins[table] = None
+
+        if self._search_supported and search:
+            query, count_query, joins, count_joins = self._apply_search(
+                query, count_query, joins, count_joins, search
+            )
+
+        if filters and self._filters:
+            query, count_query, joins, count_joins = self._apply_filters(
+                query, count_query, joins, count_joins, filters
             )
 
         return query, count_query, joins, count_joins
 
+    def get_list_count(self, search, filters):
+        """
+        The total for the list with this search and filters, worked out as it would be for the list view.
+        """
+        _query, count_query, _joins, _count_joins = self._build_list_queries(search, filters)
+        return self._get_list_count(count_query, search, filters)
+
+    @expose("/count/")
+    def count_view(self):
+        """
+        The total for the list described by the query string, as JSON, for lists rendered with `defer_count`.
+
+        Includes the text to show in the list's footer and the HTML for its pagination.
+        """
+        view_args = self._get_list_extra_args()
+        page_size = self.get_safe_page_size(view_args.page_size)
+        count = self.get_list_count(view_args.search, view_args.filters)
+        num_pages = int(ceil(count / float(page_size))) if page_size else 0
+
+        def pager_url(p):
+            return self._get_list_url(view_args.clone(page=p or None))
+
+        pagination = render_template_string(
+            "{% import 'admin/model/layout.html' as model_layout %}"
+            "{{ model_layout.pagination(page, num_pages, pager_url, count, has_next) }}",
+            page=view_args.page,
+            num_pages=num_pages,
+            pager_url=pager_url,
+            count=count,
+            has_next=getattr(count, "capped", False) or view_args.page + 1 < num_pages,
+        )
+
+        return jsonify(
+            count=int(count),
+            text=format_result_count(count),
+            estimated=getattr(count, "estimated", False),
+            capped=getattr(count, "capped", False),
+            num_pages=num_pages,
+            pagination=pagination.strip(),
+        )
+
+    def _get_lookup_filter(self, index) -> FilterRelated | None:
+        try:
+            flt = self._filters[int(index)]
+        except (IndexError, TypeError, ValueError):
+            return None
+        return flt if isinstance(flt, FilterRelated) else None
+
+    def get_filter_lookup_option(self, index, value) -> tuple[t.Any, str] | None:
+        """The (value, label) option a `FilterRelated` filter's form shows for its active value, if it has one."""
+        flt = self._get_lookup_filter(index)
+        if flt is None or not value:
+            return None
+        return flt.get_option(self.session, value)
+
+    @expose("/filter-lookup/")
+    def filter_lookup_view(self):
+        """
+        Options for a `FilterRelated` filter matching what's been typed, as JSON, a page at a time.
+
+        Takes the filter's index (`filter`), the search (`q`) and the page from 0 (`page`).
+        """
+        flt = self._get_lookup_filter(request.args.get("filter"))
+        if flt is None:
+            abort(404)
+
+        page = max(request.args.get("page", 0, type=int), 0)
+        options, more = flt.lookup(self.session, request.args.get("q", ""), page)
+
+        return jsonify(results=[{"value": value, "label": label} for value, label in options], more=more)
+
+    def get_list(self, page, sort_column, sort_desc, search, filters, execute=True, page_size=None):
+        """
+        Override of Flask-Admin's `get_list` that can paginate the list view with keyset cursors.
+
+        With `keyset_pagination` on, the count query is skipped and the page is located by the cursor
+        in the request rather than by OFFSET. Other callers, such as export or code running outside a request,
+        always read from the start with an exact count.
+        """
+        is_list_view = execute and has_request_context() and request.endpoint == f"{self.endpoint}.index_view"
+
+        keyset = None
+        if self.keyset_pagination and is_list_view and page_size:
+            keyset = self._get_keyset_columns(sort_column, sort_desc)
+
+        deferred = self.defer_count and is_list_view and keyset is None and request.cookies.get(DEFER_COUNT_COOKIE)
+        if deferred:
+            g._govuk_flask_admin_deferred_count = True
+
+        with_count = not (self.simple_list_pager or keyset or deferred)
+        query, count_query, joins, count_joins = self._build_list_queries(search, filters, with_count=with_count)
+
+        # `WindowCount` counts in the list query itself, unless the total is already cached.
+        windowed = False
+        count = None
+        if count_query is not None:
+            count = self._get_cached_list_count(search, filters)
+            count_strategy = self._get_count_strategy()
+            windowed = (
+                count is None
+                and execute
+                and isinstance(count_strategy, WindowCount)
+                and count_strategy.windows(self._is_filtered(search, filters))
+            )
+            if count is None and not windowed:
+                count = self._get_list_count(count_query, search, filters)
+
+        for j in self._auto_joins:
+            query = query.options(joinedload(j))
+
+        if keyset is None:
+            query, joins = self._apply_sorting(query, joins, sort_column, sort_desc)
+            query = self._apply_pagination(query, page, page_size)
+
+            if windowed:
+                return self._get_windowed_list(query, count_query, page, search, filters)
+
+            page_size = self.page_size if page_size is None else page_size
+            if is_list_view and page_size:
+                # One row past the page says whether there's another, which a capped or deferred count can't.
+                rows = query.limit(page_size + 1).all()
+                g._govuk_flask_admin_has_next_page = len(rows) > page_size
+                return count, rows[:page_size]
+
+            return count, query.all() if execute else query
+
+        query, cursor = self._apply_keyset_pagination(query, keyset, page_size)
+        return count, self._finish_keyset_page(query.all(), cursor, page, page_size)
+
+    def render(self, template, **kwargs):
+        """
+        Override to tell the list template how `get_list` paginated and counted: whether there's a next page,
+        keyset pagination, and where to fetch a deferred count from. The filter form also gets each filter's
+        active values by index, rather than searching the active filters for every input.
+        """
+        keyset_page = g.pop("_govuk_flask_admin_keyset_page", None)
+        deferred_count = g.pop("_govuk_flask_admin_deferred_count", False)
+        has_next_page = g.pop("_govuk_flask_admin_has_next_page", None)
+
+        if template != self.list_template:
+            return super().render(template, **kwargs)
+
+        if has_next_page is None:
+            # The page wasn't read with a look-ahead row (e.g. with `WindowCount`, whose total is exact), or the
+            # list isn't paginated at all.
+            page_size, count = kwargs["page_size"], kwargs["count"]
+            has_next_page = bool(page_size) and count is not None and (kwargs["page"] + 1) * page_size < count
+
+        kwargs["has_next_page"] = has_next_page
+        kwargs["active_filter_values"] = self._as_filter_state(kwargs.get("active_filters")).values_by_index
+        if self.value_list_store is not None and self._has_value_list_filters():
+            kwargs["filter_form_url"] = self.get_url(".filter_view")
+
+        if keyset_page is not None:
+            kwargs.update(
+                keyset_pagination=True,
+                page=keyset_page.page,
+                pager_url=keyset_page.pager_url(kwargs["pager_url"]),
+                has_next_page=keyset_page.next_cursor is not None,
+            )
+
+        if self.defer_count:
+            kwargs["defer_count_cookie"] = DEFER_COUNT_COOKIE
+
+        if deferred_count:
+            kwargs["deferred_count_url"] = self.get_url(".count_view", **request.args.to_dict(flat=False))
+
+        return super().render(template, **kwargs)
+
     def _resolve_widget_class_for_sqlalchemy_column(self, prop: ColumnProperty):
         return GovTextInput
 
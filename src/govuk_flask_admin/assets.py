@@ -0,0 +1,434 @@
+"""Vite manifest handling and static asset serving for govuk-flask-admin."""
+import fnmatch
+import hashlib
+import json
+import mimetypes
+import os
+import threading
+import typing as t
+from dataclasses import dataclass, field
+from pathlib import Path
+from textwrap import dedent
+
+from flask import Response, g, has_request_context, request, send_file, send_from_directory, url_for
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+
+DIST_DIR = Path(__file__).parent / "static" / "dist"
+ASSETS_DIR = DIST_DIR / "assets"
+MANIFEST_FILE = DIST_DIR / "manifest.json"
+
+# Precompressed siblings written by the Vite build, in order of preference.
+PRECOMPRESSED_ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+# Cache lifetime for files whose names include a content hash.
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 7 * 52
+
+CSS_ENTRY = "src/assets/main.scss"
+JS_ENTRY = "src/assets/main.js"
+SELECT_WITH_SEARCH_ENTRY = "src/assets/select-with-search.js"
+
+# Critical CSS entries to inline for each page template; the full stylesheet then loads asynchronously.
+CRITICAL_CSS_ENTRIES = {
+    "admin/model/list.html": "src/assets/critical/list.scss",
+    "admin/model/details.html": "src/assets/critical/details.scss",
+    "admin/model/edit.html": "src/assets/critical/edit.scss",
+    "admin/model/create.html": "src/assets/critical/edit.scss",
+}
+
+# GOV.UK Transport, which the main stylesheet needs before first paint.
+PRELOAD_FONTS = "*fonts/*.woff2"
+
+# Most cached tags a ViteManifest keeps; apps are normally served under one or two script roots.
+MAX_CACHED_TAGS = 256
+
+
+class ViteManifest:
+    """Registry for the compiled Vite manifest.
+
+    The manifest is parsed once and the `<link>`/`<script>` tags built from it are cached per
+    script root, so rendering an admin page doesn't touch the filesystem.
+
+    When `auto_reload` is enabled (debug mode), the manifest file's mtime is checked on access
+    and the registry is rebuilt only if it has changed.
+
+    If `base_url` is set, asset URLs point at that external host (e.g. a CDN holding a copy of
+    `dist/assets`) instead of the `govuk_flask_admin.static` route.
+    """
+
+    def __init__(self, manifest_file: Path = MANIFEST_FILE, auto_reload: bool = False, base_url: str | None = None):
+        self.manifest_file = Path(manifest_file)
+        self.auto_reload = auto_reload
+        self.base_url = base_url.rstrip("/") if base_url else None
+
+        self._lock = threading.Lock()
+        self._data: dict[str, t.Any] | None = None
+        self._mtime: float | None = None
+        self._tags: dict[tuple[str, ...], str] = {}
+
+        # Bumped on every (re)load so dependent caches know when to rebuild.
+        self.version = 0
+
+    def load(self) -> None:
+        """(Re)parse the manifest file and drop any cached tags."""
+        with self._lock:
+            mtime = os.stat(self.manifest_file).st_mtime
+
+            with open(self.manifest_file) as f:
+                self._data = json.load(f)
+
+            self._mtime = mtime
+            self._tags = {}
+            self.version += 1
+
+    @property
+    def data(self) -> dict[str, t.Any]:
+        if self._data is None:
+            self.load()
+
+        elif self.auto_reload and os.stat(self.manifest_file).st_mtime != self._mtime:
+            self.load()
+
+        return self._data
+
+    def entry_file(self, entry: str) -> str:
+        """Path of the compiled file for a manifest entry, relative to `dist/`."""
+        return self.data[entry]["file"]
+
+    def hashed_files(self) -> set[str]:
+        """Paths (relative to `dist/`) of every file Vite emitted with a content hash in its name.
+
+        Files copied verbatim into the build (fonts, images) aren't listed in the manifest.
+        """
+        files = set()
+        for chunk in self.data.values():
+            files.add(chunk["file"])
+            files.update(chunk.get("css", ()))
+            files.update(chunk.get("assets", ()))
+
+        return files
+
+    def static_url(self, filename: str) -> str:
+        """URL for a file under `dist/assets`."""
+        if self.base_url:
+            return f"{self.base_url}/{filename}"
+
+        return url_for("govuk_flask_admin.static", filename=filename)
+
+    def asset_path(self) -> str:
+        """Base URL for GOV.UK Frontend's `assetPath` (fonts, images, favicons)."""
+        return self._cached_tag("asset_path", lambda: self.static_url("assets").rstrip("/"))
+
+    def asset_url(self, entry: str) -> str:
+        return self.static_url(Path(self.entry_file(entry)).name)
+
+    def _cache_key(self, name: str) -> tuple[str, ...]:
+        # Asset URLs are paths under the script root (the static route's host, if it has one, is always the
+        # request's own), so the scheme and Host header, which clients choose, aren't part of the key.
+        if self.base_url or not has_request_context():
+            return (name,)
+
+        return name, request.script_root
+
+    def _cached_tag(self, name: str, build: t.Callable[[], str]) -> str:
+        # Touch `data` first so that a debug-mode reload clears stale tags before lookup.
+        self.data
+
+        key = self._cache_key(name)
+        tag = self._tags.get(key)
+        if tag is None:
+            tag = build()
+            with self._lock:
+                # The script root can come from a proxy header, so don't let the cache grow without limit.
+                while len(self._tags) >= MAX_CACHED_TAGS:
+                    del self._tags[next(iter(self._tags))]
+                self._tags[key] = tag
+
+        return tag
+
+    def read_entry(self, entry: str) -> str:
+        """Contents of the compiled file for a manifest entry."""
+        return (self.manifest_file.parent / self.entry_file(entry)).read_text()
+
+    def css_tag(self, critical_entry: str | None = None, nonce_attribute: str = "") -> str:
+        """Stylesheet tags for the main CSS bundle.
+
+        If `critical_entry` is given (and was built), its CSS is inlined and the main bundle is loaded
+        without blocking rendering, falling back to a normal stylesheet link when JavaScript is off.
+        """
+        if critical_entry is None or critical_entry not in self.data:
+            return self._cached_tag(
+                "css",
+                lambda: dedent(
+                    f"""
+                        <!-- FLASK_VITE_HEADER -->
+                        <link rel="stylesheet" href="{self.asset_url(CSS_ENTRY)}"></link>
+                    """
+                ).strip(),
+            )
+
+        # The nonce changes on every request, so only the URL and the critical CSS itself are cached.
+        css_url = self._cached_tag("css_url", lambda: self.asset_url(CSS_ENTRY))
+        critical_css = self._cached_tag(
+            f"critical:{critical_entry}",
+            lambda: self.read_entry(critical_entry).replace("</style", "<\\/style"),
+        )
+        nonce = f" {nonce_attribute}" if nonce_attribute else ""
+
+        return "\n".join(
+            [
+                "<!-- FLASK_VITE_HEADER -->",
+                f"<style{nonce}>{critical_css}</style>",
+                # A print stylesheet doesn't block rendering; it's applied to the screen once it has loaded. The
+                # listener is attached from a script (rather than an onload attribute) so it runs under the CSP nonce.
+                f'<link rel="stylesheet" href="{css_url}" media="print" data-gfa-async-stylesheet>',
+                f"<script{nonce}>"
+                "document.querySelectorAll('link[data-gfa-async-stylesheet]').forEach(function (link) {"
+                " function apply() { link.media = 'all'; }"
+                " if (link.sheet) { apply(); } else { link.addEventListener('load', apply); }"
+                " });"
+                "</script>",
+                f'<noscript><link rel="stylesheet" href="{css_url}"></noscript>',
+            ]
+        )
+
+    def _imported_chunks(self, entry: str, seen: set[str]) -> list[str]:
+        """Manifest keys of the chunks statically imported by `entry`, depth first."""
+        chunks = []
+        for chunk in self.data[entry].get("imports", ()):
+            if chunk not in seen:
+                seen.add(chunk)
+                chunks.extend(self._imported_chunks(chunk, seen))
+                chunks.append(chunk)
+
+        return chunks
+
+    def js_tag(self, entries: t.Iterable[str] = ()) -> str:
+        """Script tags for the core bundle plus any per-page `entries` (e.g. SELECT_WITH_SEARCH_ENTRY).
+
+        Chunks shared between the entries are `modulepreload`ed once rather than discovered by the browser.
+        """
+        entries = [JS_ENTRY, *sorted(set(entries) - {JS_ENTRY})]
+
+        def build():
+            seen = set(entries)
+            preloads = [chunk for entry in entries for chunk in self._imported_chunks(entry, seen)]
+
+            lines = ["<!-- FLASK_VITE_HEADER -->"]
+            lines.extend(f'<link rel="modulepreload" href="{self.asset_url(chunk)}">' for chunk in preloads)
+            lines.extend(f'<script type="module" src="{self.asset_url(entry)}"></script>' for entry in entries)
+            return "\n".join(lines)
+
+        return self._cached_tag("js:" + ",".join(entries), build)
+
+    def preload_links(self, font_files: t.Iterable[str] = ()) -> str:
+        """`Link` header value asking browsers to start fetching the main CSS, JS and fonts early."""
+
+        def build():
+            links = [
+                f"<{self.asset_url(CSS_ENTRY)}>; rel=preload; as=style",
+                f"<{self.asset_url(JS_ENTRY)}>; rel=modulepreload",
+            ]
+            links.extend(
+                f'<{self.static_url(font)}>; rel=preload; as=font; type="font/woff2"; crossorigin'
+                for font in font_files
+            )
+            return ", ".join(links)
+
+        return self._cached_tag("preload", build)
+
+
+def require_js_entry(entry: str) -> None:
+    """Record that the page being rendered needs a per-page JS entry, for `govuk_flask_admin_include_js`."""
+    if has_request_context():
+        g.setdefault("_govuk_flask_admin_js_entries", set()).add(entry)
+
+
+def required_js_entries() -> set[str]:
+    return g.get("_govuk_flask_admin_js_entries", set())
+
+
+@dataclass(frozen=True)
+class StaticAssetFile:
+    """One encoding of a static asset, with its precomputed strong ETag.
+
+    `data` holds the file's bytes when the asset table is kept in memory.
+    """
+
+    path: Path
+    etag: str
+    data: bytes | None = None
+
+
+@dataclass(frozen=True)
+class StaticAsset:
+    filename: str
+    mimetype: str
+    immutable: bool
+    # Keyed by content encoding; `None` is the uncompressed file.
+    files: dict[str | None, StaticAssetFile] = field(default_factory=dict)
+
+    def select(self) -> tuple[str | None, StaticAssetFile]:
+        """Pick the best encoding of this asset that the current request accepts."""
+        for encoding, _suffix in PRECOMPRESSED_ENCODINGS:
+            if encoding in self.files and request.accept_encodings.quality(encoding):
+                return encoding, self.files[encoding]
+
+        return None, self.files[None]
+
+    def apply_cache_policy(self, response: Response) -> Response:
+        """Hashed files are cached forever; everything else must be revalidated against its ETag."""
+        if self.immutable:
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = IMMUTABLE_MAX_AGE
+            response.cache_control.immutable = True
+
+        else:
+            response.cache_control.public = True
+            response.cache_control.max_age = None
+            response.cache_control.no_cache = True
+
+        response.vary.add("Accept-Encoding")
+        return response
+
+
+class StaticAssets:
+    """In-memory table of the files under `dist/assets`, built once at startup.
+
+    Each file is classified as hashed (immutable) or unhashed (revalidate) using the Vite manifest,
+    and a strong ETag is computed for it and each of its precompressed variants. Conditional GETs
+    that match are answered with a 304 without touching the filesystem.
+
+    With `in_memory` enabled, every file's bytes are also held in the table and responses are served
+    straight from memory, with no filesystem access at all after startup.
+    """
+
+    def __init__(self, manifest: ViteManifest, directory: Path = ASSETS_DIR, in_memory: bool = False):
+        self.manifest = manifest
+        self.directory = Path(directory)
+        self.in_memory = in_memory
+
+        self._lock = threading.Lock()
+        self._assets: dict[str, StaticAsset] | None = None
+        self._manifest_version: int | None = None
+
+    def _load_file(self, path: Path) -> StaticAssetFile:
+        if self.in_memory:
+            data = path.read_bytes()
+            return StaticAssetFile(path, hashlib.sha256(data).hexdigest()[:32], data)
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(64 * 1024), b""):
+                digest.update(block)
+
+        return StaticAssetFile(path, digest.hexdigest()[:32])
+
+    def load(self) -> None:
+        """Scan the assets directory and rebuild the table."""
+        with self._lock:
+            hashed_files = self.manifest.hashed_files()
+            version = self.manifest.version
+            compressed_suffixes = tuple(suffix for _encoding, suffix in PRECOMPRESSED_ENCODINGS)
+
+            assets = {}
+            for path in sorted(self.directory.rglob("*")):
+                if not path.is_file() or path.name.endswith(compressed_suffixes):
+                    continue
+
+                filename = path.relative_to(self.directory).as_posix()
+                files = {None: self._load_file(path)}
+                for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+                    compressed_path = path.with_name(path.name + suffix)
+                    if compressed_path.is_file():
+                        files[encoding] = self._load_file(compressed_path)
+
+                assets[filename] = StaticAsset(
+                    filename=filename,
+                    mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+                    immutable=f"{self.directory.name}/{filename}" in hashed_files,
+                    files=files,
+                )
+
+            self._assets = assets
+            self._manifest_version = version
+
+    @property
+    def assets(self) -> dict[str, StaticAsset]:
+        # Accessing the manifest triggers its debug-mode reload; rebuild the table along with it.
+        self.manifest.data
+        if self._assets is None or self._manifest_version != self.manifest.version:
+            self.load()
+
+        return self._assets
+
+    def get(self, filename: str) -> StaticAsset | None:
+        return self.assets.get(filename)
+
+    def match(self, pattern: str) -> list[str]:
+        """Filenames in the table matching a glob pattern."""
+        return fnmatch.filter(self.assets, pattern)
+
+    def send(self, filename: str) -> Response:
+        asset = self.get(filename)
+
+        if asset is None:
+            if self.in_memory:
+                raise NotFound()
+
+            # Not in the table (e.g. added since startup): serve it from disk and make clients revalidate.
+            return send_static_asset(self.directory, filename, max_age=0)
+
+        encoding, asset_file = asset.select()
+
+        if request.if_none_match.contains_weak(asset_file.etag):
+            response = Response(status=304)
+            response.set_etag(asset_file.etag)
+
+        elif asset_file.data is not None:
+            response = Response(asset_file.data, mimetype=asset.mimetype)
+            response.set_etag(asset_file.etag)
+            response.make_conditional(request, accept_ranges=True, complete_length=len(asset_file.data))
+
+        else:
+            response = send_file(asset_file.path, mimetype=asset.mimetype, etag=asset_file.etag)
+
+        if encoding is not None and response.status_code != 304:
+            response.headers["Content-Encoding"] = encoding
+
+        return asset.apply_cache_policy(response)
+
+
+def select_precompressed_encoding(directory: str | Path, filename: str) -> tuple[str, str] | None:
+    """Pick the best precompressed variant of `filename` that the client accepts.
+
+    Returns an `(encoding, filename)` pair, or None if the plain file should be served.
+    """
+    for encoding, suffix in PRECOMPRESSED_ENCODINGS:
+        if not request.accept_encodings.quality(encoding):
+            continue
+
+        compressed_filename = filename + suffix
+        compressed_path = safe_join(str(directory), compressed_filename)
+        if compressed_path is not None and os.path.isfile(compressed_path):
+            return encoding, compressed_filename
+
+    return None
+
+
+def send_static_asset(directory: str | Path, filename: str, max_age: int | None = None) -> Response:
+    """Serve a file from `directory`, preferring a precompressed `.br`/`.gz` sibling if accepted."""
+    variant = select_precompressed_encoding(directory, filename)
+
+    if variant is None:
+        response = send_from_directory(directory, filename, max_age=max_age)
+
+    else:
+        encoding, compressed_filename = variant
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        response = send_from_directory(directory, compressed_filename, max_age=max_age, mimetype=mimetype)
+        response.headers["Content-Encoding"] = encoding
+
+    response.vary.add("Accept-Encoding")
+    return response
@@ -0,0 +1,82 @@
+"""Flask CLI commands for govuk-flask-admin."""
+import shutil
+from pathlib import Path
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+
+from govuk_flask_admin.indexes import advise_app_indexes
+from govuk_flask_admin.search import SearchIndex
+
+govuk_flask_admin_cli = AppGroup("govuk-flask-admin", help="Commands for the GOV.UK Flask Admin theme.")
+
+
+@govuk_flask_admin_cli.command("export-assets")
+@click.argument("destination", type=click.Path(file_okay=False, path_type=Path))
+@click.option("--clean", is_flag=True, help="Delete the destination directory before exporting.")
+def export_assets(destination: Path, clean: bool):
+    """Copy the compiled asset tree to DESTINATION for upload to a CDN or static file server.
+
+    The layout matches the `govuk_flask_admin.static` route, so DESTINATION can be served at the
+    `assets_url` passed to GovukFlaskAdmin. Precompressed `.br`/`.gz` siblings are included; files
+    listed as immutable can be cached forever, everything else should be revalidated.
+    """
+    static_assets = current_app.extensions["govuk_flask_admin"].static_assets
+
+    if clean and destination.exists():
+        shutil.rmtree(destination)
+
+    shutil.copytree(static_assets.directory, destination, dirs_exist_ok=True)
+
+    immutable = sorted(name for name, asset in static_assets.assets.items() if asset.immutable)
+    click.echo(f"Exported {len(static_assets.assets)} assets to {destination}")
+    click.echo("Immutable (content-hashed) files:")
+    for name in immutable:
+        click.echo(f"  {name}")
+
+
+@govuk_flask_admin_cli.command("index-advice")
+@click.option("--check", is_flag=True, help="Exit with status 1 if any column is missing an index, e.g. in CI.")
+def index_advice(check: bool):
+    """List filter, sort and search columns of each admin model view that no index can serve.
+
+    Suggested `CREATE INDEX` statements are printed for each, for the dialect of the view's database.
+    Review them before running them: an index on a small table or a column with few distinct values may
+    not be worth its cost on writes.
+    """
+    advice = advise_app_indexes(current_app.extensions.get("admin", []))
+
+    for item in advice:
+        click.echo(str(item))
+
+    if not advice:
+        click.echo("Every filter, sort and search column has an index.")
+    elif check:
+        raise SystemExit(1)
+
+
+@govuk_flask_admin_cli.command("reindex-search")
+@click.argument("endpoints", nargs=-1)
+def reindex_search(endpoints: tuple[str, ...]):
+    """Create and rebuild the full-text search index of each admin model view with a `SearchIndex` backend.
+
+    Pass view endpoints (e.g. `post`) to rebuild just those. Run this when first switching a view to a
+    full-text backend, and after changing its table with raw SQL or ORM bulk inserts and updates.
+    """
+    rebuilt = set()
+    for admin in current_app.extensions.get("admin", []):
+        for view in admin._views:
+            backend = getattr(view, "search_backend", None)
+            if not isinstance(backend, SearchIndex) or id(backend) in rebuilt:
+                continue
+            if endpoints and view.endpoint not in endpoints:
+                continue
+
+            rows = backend.reindex(view.session)
+            view.session.commit()
+            rebuilt.add(id(backend))
+            click.echo(f"Indexed {rows} rows of {view.name} in {backend.table_name}")
+
+    if not rebuilt:
+        click.echo("No views with a search index to rebuild.")
@@ -0,0 +1,330 @@
+"""Strategies for counting the rows in a GovukModelView list.
+
+An exact `COUNT(*)` has to visit every matching row, which is the slowest part of the list view on large
+tables. A view's `count_strategy` decides how the total is worked out instead: exactly, up to a cap, or
+estimated from the database's own statistics. A view's `count_cache` can then keep totals between requests.
+"""
+import threading
+import time
+import typing as t
+import weakref
+from collections import OrderedDict
+
+from sqlalchemy import Table, event, func, inspect, literal_column, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.util import find_tables
+
+if t.TYPE_CHECKING:
+    from govuk_flask_admin import GovukModelView
+
+
+class ResultCount(int):
+    """A row count that can also be a lower bound (`capped`) or an estimate (`estimated`).
+
+    It's still an int, so Flask-Admin's page maths and existing templates keep working.
+    """
+
+    estimated: bool
+    capped: bool
+
+    def __new__(cls, value: int, estimated: bool = False, capped: bool = False):
+        count = super().__new__(cls, value)
+        count.estimated = estimated
+        count.capped = capped
+        return count
+
+    def __repr__(self):
+        return f"ResultCount({int(self)}, estimated={self.estimated}, capped={self.capped})"
+
+
+def format_result_count(count: int) -> str:
+    """Describes a count for people, e.g. "1 result", "10,000+ results" or "about 1.2 million results"."""
+    plural = "result" if count == 1 and not getattr(count, "capped", False) else "results"
+
+    if getattr(count, "capped", False):
+        return f"{count:,}+ {plural}"
+
+    if getattr(count, "estimated", False):
+        return f"about {_round_for_people(count)} {plural}"
+
+    return f"{count:,} {plural}"
+
+
+def _round_for_people(count: int) -> str:
+    for size, name in ((1_000_000_000, "billion"), (1_000_000, "million")):
+        if count >= size:
+            return f"{count / size:.1f}".removesuffix(".0") + f" {name}"
+
+    # Two significant figures, e.g. 12,345 -> 12,000.
+    digits = max(len(str(int(count))) - 2, 0)
+    return f"{round(int(count), -digits):,}"
+
+
+class CountStrategy:
+    """Works out the total for a list view from its count query.
+
+    `count_query` is Flask-Admin's `SELECT count(*)` query with the list's search and filters already
+    applied; `filtered` says whether there were any.
+    """
+
+    def count(self, view: "GovukModelView", count_query, filtered: bool) -> ResultCount | None:
+        raise NotImplementedError
+
+
+class ExactCount(CountStrategy):
+    """Runs the count query as it is: `SELECT count(*) FROM ...`."""
+
+    def count(self, view, count_query, filtered):
+        return ResultCount(count_query.scalar())
+
+
+class CappedCount(CountStrategy):
+    """Counts no further than `cap` rows, with `SELECT count(*) FROM (SELECT 1 FROM ... LIMIT cap + 1)`.
+
+    The cost is bounded however many rows match; past the cap the count is shown as e.g. "10,000+".
+    """
+
+    def __init__(self, cap: int = 10_000):
+        self.cap = cap
+
+    def count(self, view, count_query, filtered):
+        rows = count_query.with_entities(literal_column("1")).limit(self.cap + 1).subquery()
+        total = view.session.scalar(select(func.count()).select_from(rows))
+
+        if total > self.cap:
+            return ResultCount(self.cap, capped=True)
+
+        return ResultCount(total)
+
+
+class WindowCount(CountStrategy):
+    """Counts in the list query itself, by adding `COUNT(*) OVER ()` to it, so the page of rows and the total
+    come back in one round trip rather than two.
+
+    Needs a database with window functions (SQLite 3.25+, PostgreSQL, MySQL 8+). An empty page has no rows to
+    carry the total, so past the first page that case (and anything counted without a list query, such as the
+    deferred count endpoint) falls back to `fallback`.
+
+    The window has to read every matching row before the page's LIMIT applies, so this is slower than a plain
+    count for large unfiltered lists, and pays off where filters are selective and expensive to run twice (e.g.
+    relationship filters). With `filtered_only`, unfiltered lists are counted by `fallback` instead.
+    """
+
+    label = "_govuk_flask_admin_total"
+
+    def __init__(self, fallback: CountStrategy | None = None, filtered_only: bool = False):
+        self.fallback = fallback or ExactCount()
+        self.filtered_only = filtered_only
+
+    def windows(self, filtered: bool) -> bool:
+        """Whether to count in the list query, rather than with `fallback`."""
+        return filtered or not self.filtered_only
+
+    def count(self, view, count_query, filtered):
+        return self.fallback.count(view, count_query, filtered)
+
+    def add_to_query(self, query):
+        return query.add_columns(func.count().over().label(self.label))
+
+    def split_rows(self, rows) -> tuple[list, ResultCount | None]:
+        """Separates the rows of a query from `add_to_query` into models and the total (None if no rows)."""
+        if not rows:
+            return [], None
+
+        return [row[0] for row in rows], ResultCount(rows[0][-1])
+
+
+# Functions that estimate a table's row count from a database's statistics, keyed by dialect name.
+ROW_ESTIMATORS: dict[str, t.Callable[[t.Any, str], int | None]] = {}
+
+
+def row_estimator(dialect_name: str):
+    """Registers a function `(connection, table_name) -> int | None` estimating rows for a dialect."""
+
+    def _register(func):
+        ROW_ESTIMATORS[dialect_name] = func
+        return func
+
+    return _register
+
+
+@row_estimator("sqlite")
+def _estimate_sqlite_rows(connection, table_name):
+    # `ANALYZE` writes one row per index (and one with a NULL index for tables without any); the first
+    # number in `stat` is the number of rows in the table.
+    stats = connection.execute(text("SELECT stat FROM sqlite_stat1 WHERE tbl = :table"), {"table": table_name})
+    counts = [int(stat.split()[0]) for (stat,) in stats if stat]
+    return max(counts) if counts else None
+
+
+@row_estimator("postgresql")
+def _estimate_postgresql_rows(connection, table_name):
+    # `reltuples` is -1 for tables that have never been vacuumed or analyzed.
+    estimate = connection.scalar(
+        text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:table)"), {"table": table_name}
+    )
+    return int(estimate) if estimate is not None and estimate >= 0 else None
+
+
+@row_estimator("mysql")
+@row_estimator("mariadb")
+def _estimate_mysql_rows(connection, table_name):
+    estimate = connection.scalar(
+        text("SELECT table_rows FROM information_schema.tables WHERE table_schema = DATABASE() AND table_name = :table"),
+        {"table": table_name},
+    )
+    return int(estimate) if estimate is not None else None
+
+
+class EstimatedCount(CountStrategy):
+    """Uses the database's table statistics for unfiltered lists, shown as e.g. "about 1.2 million".
+
+    Statistics only describe whole tables, so filtered or searched lists use `fallback`, as do tables
+    with no statistics (e.g. never analyzed) or fewer than `min_estimate` rows, which are cheap to count.
+    """
+
+    def __init__(self, fallback: CountStrategy | None = None, min_estimate: int = 100_000):
+        self.fallback = fallback or ExactCount()
+        self.min_estimate = min_estimate
+
+    def estimate(self, view) -> int | None:
+        # The session may be bound to an Engine or to a Connection (e.g. one inside a test's transaction).
+        bind = view.session.get_bind(mapper=view.model.__mapper__)
+        estimator = ROW_ESTIMATORS.get(bind.dialect.name)
+        if estimator is None:
+            return None
+
+        table = view.model.__table__
+        table_name = f"{table.schema}.{table.name}" if table.schema else table.name
+
+        # Look up in a savepoint, so a failed lookup (e.g. no `sqlite_stat1` table because ANALYZE has never run)
+        # rolls back only itself rather than aborting the request's transaction.
+        try:
+            with view.session.begin_nested():
+                return estimator(view.session.connection(bind_arguments={"mapper": view.model.__mapper__}), table_name)
+        except DBAPIError:
+            return None
+
+    def count(self, view, count_query, filtered):
+        if not filtered:
+            estimate = self.estimate(view)
+            if estimate is not None and estimate >= self.min_estimate:
+                return ResultCount(estimate, estimated=True)
+
+        return self.fallback.count(view, count_query, filtered)
+
+
+# Every live CountCache, so writes seen by the session events below can invalidate them all.
+_count_caches: "weakref.WeakSet[CountCache]" = weakref.WeakSet()
+_CHANGED_TABLES = "_govuk_flask_admin_changed_tables"
+
+
+def query_tables(statement) -> frozenset[str]:
+    """Names of the tables a query reads from, including any it joins to (e.g. for relationship filters)."""
+    return frozenset(table.fullname for table in find_tables(statement) if isinstance(table, Table))
+
+
+class CountCache:
+    """An in-process cache of list counts, with a time-to-live and least-recently-used eviction.
+
+    Entries are tagged with the tables their count query reads. Changes made through any SQLAlchemy ORM
+    session in this process (flushed objects, including the association tables of their many-to-many
+    collections, and ORM bulk inserts/updates/deletes) invalidate the entries for the tables they touch
+    when the session commits or rolls back. Writes from other processes, or raw SQL, are only picked up
+    once `ttl` seconds have passed.
+    """
+
+    def __init__(self, ttl: float = 60, max_entries: int = 1024, clock: t.Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: OrderedDict[t.Hashable, tuple[float, frozenset[str], t.Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        _count_caches.add(self)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: t.Hashable):
+        """The cached count for `key`, or None if there isn't a live one."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires, _tables, count = entry
+            if expires <= self.clock():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return count
+
+    def set(self, key: t.Hashable, count, tables: frozenset[str]):
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, tables, count)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tables: t.Iterable[str]):
+        """Drops every entry whose count query reads from any of `tables`."""
+        tables = set(tables)
+        with self._lock:
+            for key in [key for key, (_expires, entry_tables, _count) in self._entries.items() if entry_tables & tables]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _record_changed_tables(session: Session, tables: t.Iterable[str]):
+    session.info.setdefault(_CHANGED_TABLES, set()).update(tables)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_tables(session, flush_context):
+    if not _count_caches:
+        return
+
+    changed = set()
+    deleted = set(session.deleted)
+    for obj in (*session.new, *session.dirty, *deleted):
+        state = inspect(obj)
+        changed.update(table.fullname for table in state.mapper.tables)
+        changed.update(_changed_secondary_tables(state, obj in deleted))
+    _record_changed_tables(session, changed)
+
+
+def _changed_secondary_tables(state, deleted: bool) -> t.Iterator[str]:
+    # Many-to-many collections are written to their association (`secondary`) table, which isn't one of the
+    # mapper's tables: rows are added or removed when the collection changes, or when the object is deleted.
+    for relationship in state.mapper.relationships:
+        if relationship.secondary is None or relationship.viewonly:
+            continue
+        if deleted or state.attrs[relationship.key].history.has_changes():
+            yield from (table.fullname for table in find_tables(relationship.secondary) if isinstance(table, Table))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_bulk_write_tables(orm_execute_state):
+    if not _count_caches or not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+
+    mapper = orm_execute_state.bind_mapper
+    tables = mapper.tables if mapper is not None else find_tables(orm_execute_state.statement, include_crud=True)
+    _record_changed_tables(orm_execute_state.session, (table.fullname for table in tables if isinstance(table, Table)))
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_count_caches(session):
+    # Rolled-back changes may already have been counted inside the transaction, so they invalidate too.
+    changed = session.info.pop(_CHANGED_TABLES, None)
+    if changed:
+        for cache in list(_count_caches):
+            cache.invalidate(changed)
@@ -0,0 +1,213 @@
+"""The list view's active filters, parsed from the request once.
+
+Flask-Admin passes filters around as loose `(index, name, value)` tuples, re-reading `request.args` and
+rebuilding URL arguments from them for every link on the page. A `FilterState` is parsed once per request
+(combining GOV.UK date inputs and the two ends of ranges, and dropping empty values on the way) and then shared,
+read-only, by the query, the links and the templates.
+"""
+import types
+import typing as t
+
+from flask_admin.model.base import ViewArgs
+from flask_admin.model.helpers import prettify_name
+
+if t.TYPE_CHECKING:
+    from govuk_flask_admin.value_lists import ValueListStore
+
+FILTER_ARG_PREFIX = "flt"
+
+# Suffixes of the three inputs of a GOV.UK date input, combined into one YYYY-MM-DD value.
+_DATE_PARTS = ("-day", "-month", "-year")
+
+# Suffixes of the two ends of a range filter's inputs, combined into one "<from> to <to>" value; either end can
+# be left out, giving "<from> to" or "to <to>".
+_RANGE_PARTS = ("-from", "-to")
+RANGE_SEPARATOR = " to "
+
+
+class ActiveFilter(t.NamedTuple):
+    """One filter applied to the list: which of the view's filters, and the value it was given."""
+
+    index: int
+    name: str
+    operation: str
+    value: str
+
+
+class FilterState:
+    """The active filters for a list, in the order they were given, and the URL arguments that reproduce them.
+
+    Immutable, so it can be shared between everything that reads it during a request. It's also a sequence of
+    `ActiveFilter`s, which still unpack as Flask-Admin's `(index, name, operation, value)` tuples.
+    """
+
+    __slots__ = ("filters", "url_args", "values_by_index", "invalid")
+
+    filters: tuple[ActiveFilter, ...]
+    url_args: t.Mapping[str, str]
+    # The values given to each of the view's filters, by the filter's index, in the order they were given.
+    values_by_index: t.Mapping[int, tuple[str, ...]]
+    # (value, filter) pairs that failed the filter's validation and were left out.
+    invalid: tuple[tuple[str, t.Any], ...]
+
+    def __init__(
+        self,
+        filters: t.Iterable[ActiveFilter] = (),
+        arg_names: t.Iterable[str] = (),
+        invalid: t.Iterable[tuple[str, t.Any]] = (),
+        url_values: t.Iterable[str] | None = None,
+    ):
+        filters = tuple(filters)
+        # Links repeat each filter's value as given, which for a stored value list is its token rather than the list.
+        url_values = tuple(url_values) if url_values is not None else tuple(flt.value for flt in filters)
+        url_args = {
+            f"{FILTER_ARG_PREFIX}{pos}_{name}": value for pos, (name, value) in enumerate(zip(arg_names, url_values))
+        }
+
+        values_by_index = {}
+        for flt in filters:
+            values_by_index[flt.index] = values_by_index.get(flt.index, ()) + (flt.value,)
+
+        object.__setattr__(self, "filters", filters)
+        object.__setattr__(self, "url_args", types.MappingProxyType(url_args))
+        object.__setattr__(self, "values_by_index", types.MappingProxyType(values_by_index))
+        object.__setattr__(self, "invalid", tuple(invalid))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __iter__(self):
+        return iter(self.filters)
+
+    def __len__(self):
+        return len(self.filters)
+
+    def __getitem__(self, position):
+        return self.filters[position]
+
+    def __bool__(self):
+        return bool(self.filters)
+
+    def __eq__(self, other):
+        if isinstance(other, FilterState):
+            return self.filters == other.filters
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.filters)
+
+    def __repr__(self):
+        return f"FilterState({list(self.filters)!r})"
+
+    def url_args_without(self, position: int) -> dict[str, str]:
+        """URL arguments for the same filters without the one at `position`, e.g. for its "remove" link."""
+        return {key: value for pos, (key, value) in enumerate(self.url_args.items()) if pos != position}
+
+    @classmethod
+    def parse(
+        cls, args, filter_args: t.Mapping[str, tuple[int, t.Any]], value_lists: "ValueListStore | None" = None
+    ) -> "FilterState":
+        """Reads the active filters from a request's query arguments.
+
+        :param args: The request's `MultiDict` of query arguments; it isn't changed.
+        :param filter_args: The view's `_filter_args`, mapping each filter's URL name to (index, filter).
+        :param value_lists: Where the view keeps long value lists; their tokens are read back from it, and
+            are invalid once they can't be found.
+        """
+        values = {}
+        for key, key_values in args.lists():
+            if not key.startswith(FILTER_ARG_PREFIX):
+                continue
+
+            # Filters left empty in the form are submitted as blank values; they aren't active.
+            if all(not value.strip() for value in key_values):
+                continue
+
+            values[key] = key_values
+
+        # GOV.UK date inputs are three fields, <name>-day, -month and -year, which filters expect as one YYYY-MM-DD.
+        for key in [key for key in values if key.endswith("-day")]:
+            base = key.removesuffix("-day")
+            parts = [args.get(base + suffix, "").strip() for suffix in _DATE_PARTS]
+
+            if all(parts) and all(base + suffix in args for suffix in _DATE_PARTS):
+                day, month, year = parts
+                values[base] = [f"{year}-{month.zfill(2)}-{day.zfill(2)}"]
+                for suffix in _DATE_PARTS:
+                    values.pop(base + suffix, None)
+
+        # Range filters have two inputs, <name>-from and <name>-to (each possibly a date input); a range with one
+        # of them left empty is open at that end.
+        range_bases = dict.fromkeys(
+            key.removesuffix(suffix) for key in values for suffix in _RANGE_PARTS if key.endswith(suffix)
+        )
+        for base in range_bases:
+            start, end = (values.pop(base + suffix, [""])[0].strip() for suffix in _RANGE_PARTS)
+            values[base] = [f"{start}{RANGE_SEPARATOR}{end}".strip()]
+
+        parsed = []
+        invalid = []
+        for key, key_values in values.items():
+            pos, _, name = key[len(FILTER_ARG_PREFIX):].partition("_")
+            if not name or name not in filter_args:
+                continue
+
+            idx, flt = filter_args[name]
+            # Filters taking several values (e.g. from a multiple select) get them one per line; others the first.
+            if getattr(flt, "multiple_values", False):
+                value = url_value = "\n".join(value for value in key_values if value.strip())
+                if value_lists is not None and value_lists.is_token(value):
+                    value = value_lists.get(url_value)
+                    if value is None:
+                        invalid.append((url_value, flt))
+                        continue
+            else:
+                value = url_value = key_values[0]
+
+            if flt.validate(value):
+                parsed.append((pos, name, url_value, ActiveFilter(idx, prettify_name(flt.name), flt.operation(), value)))
+            else:
+                invalid.append((url_value, flt))
+
+        # Filters are numbered in the order they were added; sort numerically so flt10 comes after flt9.
+        parsed.sort(key=lambda item: (not item[0].isdigit(), int(item[0]) if item[0].isdigit() else 0, item[0]))
+
+        return cls(
+            (item[3] for item in parsed),
+            (item[1] for item in parsed),
+            invalid,
+            (item[2] for item in parsed),
+        )
+
+
+class FilterCriteria:
+    """Stands in for a query when applying a filter, collecting the criteria it passes to `filter()`.
+
+    That lets a list's filters be combined into a single WHERE clause, built once for both the list and
+    count queries. Filters that do anything else to the query (e.g. join or order it) raise AttributeError,
+    and have to be applied to the real queries instead.
+    """
+
+    __slots__ = ("criteria",)
+
+    def __init__(self):
+        self.criteria = []
+
+    def filter(self, *criteria):
+        self.criteria.extend(criteria)
+        return self
+
+    where = filter
+
+
+class FilterViewArgs(ViewArgs):
+    """Flask-Admin's list arguments, whose copies (e.g. for page and sort links) share its `FilterState`."""
+
+    def clone(self, **kwargs):
+        if isinstance(self.filters, FilterState):
+            kwargs.setdefault("filters", self.filters)
+
+        return super().clone(**kwargs)
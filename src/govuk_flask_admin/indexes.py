@@ -0,0 +1,231 @@
+"""Checks a model view's filter, sort and search columns against the indexes on their tables.
+
+Every column in `column_filters`, `column_sortable_list` and `column_searchable_list` ends up in a WHERE or
+ORDER BY clause, as do the foreign keys joined to reach columns on related models. Without an index each of
+those means reading the whole table, which is fine on a developer's laptop and slow in production.
+`advise_indexes` lists the columns with no index that could serve them, with `CREATE INDEX` statements to
+add one. Run it with `flask govuk-flask-admin index-advice`, or log it at startup with
+`GovukFlaskAdmin(app, index_advice=True)`.
+"""
+import typing as t
+from dataclasses import dataclass
+
+from flask_admin.contrib.sqla import ModelView
+from flask_admin.contrib.sqla import filters as sqla_filters
+from sqlalchemy import Column, PrimaryKeyConstraint, Table, UniqueConstraint
+from sqlalchemy.orm import ColumnProperty, RelationshipProperty
+
+from govuk_flask_admin.search import CASEFOLD, CONTAINS, SearchIndex
+
+FILTER = "filter"
+SORT = "sort"
+SEARCH = "search"
+JOIN = "join"
+
+
+@dataclass(frozen=True)
+class IndexAdvice:
+    """A column (or columns) a view queries by, with no index that could serve it."""
+
+    view: str
+    table: Table
+    columns: tuple[Column, ...]
+    # How the view uses the column: any of "filter", "sort", "search" and "join".
+    uses: tuple[str, ...]
+    # A statement adding a suitable index, or None if no ordinary index would help.
+    ddl: str | None
+    note: str | None = None
+
+    def __str__(self):
+        columns = ", ".join(column.name for column in self.columns)
+        lines = [f"{self.view}: {self.table.fullname} ({columns}) is used to {'/'.join(self.uses)} with no index"]
+        if self.note:
+            lines.append(f"  {self.note}")
+        if self.ddl:
+            lines.append(f"  {self.ddl};")
+        return "\n".join(lines)
+
+
+def index_columns(table: Table) -> list[tuple[Column, ...]]:
+    """The columns of each index on `table`, in order, including the indexes databases create for primary keys
+    and unique constraints."""
+    indexes = [tuple(index.columns) for index in table.indexes]
+    indexes.extend(
+        tuple(constraint.columns)
+        for constraint in table.constraints
+        if isinstance(constraint, (PrimaryKeyConstraint, UniqueConstraint))
+    )
+    indexes.extend((column,) for column in table.columns if column.unique or column.index)
+    return [columns for columns in indexes if columns]
+
+
+def indexed_columns(table: Table) -> set[Column]:
+    """Columns that lead an index on `table`."""
+    return {columns[0] for columns in index_columns(table)}
+
+
+def has_index_on(table: Table, columns: tuple[Column, ...]) -> bool:
+    """Whether an index on `table` starts with `columns`, in that order."""
+    return any(index[: len(columns)] == columns for index in index_columns(table))
+
+
+def advise_indexes(view: ModelView, dialect) -> list[IndexAdvice]:
+    """Index advice for one SQLAlchemy model view, with DDL for `dialect`."""
+    uses: dict[Column, set[str]] = {}
+
+    def use(column, how):
+        column = _as_column(column)
+        if column is not None:
+            uses.setdefault(column, set()).add(how)
+
+    def join(path):
+        for item in path or ():
+            prop = getattr(item, "property", None)
+            if isinstance(prop, RelationshipProperty):
+                for local, remote in prop.local_remote_pairs:
+                    use(local, JOIN)
+                    use(remote, JOIN)
+
+    for flt in view._filters or ():
+        if isinstance(flt, sqla_filters.BaseSQLAFilter):
+            use(flt.column, FILTER)
+            join(view._filter_joins.get(flt.key_name or flt.column))
+
+    for name, sort in view._sortable_columns.items():
+        for column in sort if isinstance(sort, (list, tuple)) else [sort]:
+            use(column, SORT)
+        join(view._sortable_joins.get(name))
+
+    # Full-text backends search their own index table rather than the columns.
+    search_modes: dict[Column, str] = {}
+    if not isinstance(getattr(view, "search_backend", None), SearchIndex):
+        search_fields = view._search_fields or ()
+        modes = getattr(view, "_search_modes", None) or [CONTAINS] * len(search_fields)
+        for (field, path), mode in zip(search_fields, modes):
+            use(field, SEARCH)
+            join(path)
+            column = _as_column(field)
+            if column is not None:
+                search_modes[column] = mode
+
+    primary_key = _as_column(getattr(view.model, view._primary_key, None)) if isinstance(view._primary_key, str) else None
+    indexed: dict[Table, set[Column]] = {}
+    advice = []
+
+    for column, how in uses.items():
+        table = column.table
+        if not isinstance(table, Table):
+            continue
+
+        if _keyset_sorted(view, column, how, primary_key):
+            # Keyset pages are read in (sort column, primary key) order, which an index on the column alone can't serve.
+            indexed_for_use = column is primary_key or has_index_on(table, (column, primary_key))
+        else:
+            indexed_for_use = column in indexed.setdefault(table, indexed_columns(table))
+
+        if not indexed_for_use:
+            advice.append(_advise_column(view, dialect, column, how, primary_key, search_modes.get(column, CONTAINS)))
+
+    return advice
+
+
+def _as_column(column) -> Column | None:
+    prop = getattr(column, "property", None)
+    if isinstance(prop, ColumnProperty):
+        column = prop.columns[0]
+    return column if isinstance(column, Column) else None
+
+
+def _keyset_sorted(view, column, how, primary_key) -> bool:
+    """Whether `column` sorts a keyset-paginated view, which reads pages by (sort column, primary key)."""
+    return (
+        SORT in how
+        and getattr(view, "keyset_pagination", False)
+        and primary_key is not None
+        and primary_key.table is column.table
+    )
+
+
+def _advise_column(view, dialect, column, how, primary_key, search_mode) -> IndexAdvice:
+    table = column.table
+    uses = tuple(sorted(how))
+    columns = (column,)
+    nulls_first = ()
+    notes = []
+
+    if _keyset_sorted(view, column, how, primary_key):
+        columns = (column, primary_key)
+        # Keyset pages put NULLs first, which PostgreSQL's indexes only serve if they're built that way.
+        if column.nullable and dialect.name == "postgresql":
+            nulls_first = (column,)
+        if column in indexed_columns(table):
+            notes.append(
+                f"Keyset pages are read in ({column.name}, {primary_key.name}) order, which an index on "
+                f"{column.name} alone can't serve."
+            )
+
+    if SEARCH in how and search_mode == CASEFOLD:
+        # Case-insensitive search compares `lower(column)`, which needs an index on that expression.
+        if how == {SEARCH}:
+            return IndexAdvice(view.name, table, columns, uses, _lower_ddl(dialect, table, column))
+
+        notes.append(f"Case-insensitive search also needs an index on lower({column.name}).")
+
+    elif SEARCH in how and search_mode == CONTAINS:
+        # Search matches anywhere in the value (`ILIKE '%term%'`), which B-tree indexes can't help with.
+        if how == {SEARCH}:
+            if dialect.name == "postgresql":
+                note = "Search matches within values; a trigram index (needs the pg_trgm extension) can serve it."
+                return IndexAdvice(view.name, table, columns, uses, _trigram_ddl(dialect, table, column), note)
+
+            note = "Search matches within values, which an ordinary index can't serve; consider full-text search."
+            return IndexAdvice(view.name, table, columns, uses, None, note)
+
+        notes.append("An index helps filtering and sorting; search matches within values and will still read every row.")
+
+    note = " ".join(notes) or None
+    return IndexAdvice(view.name, table, columns, uses, _index_ddl(dialect, table, columns, nulls_first), note)
+
+
+def _index_name(dialect, table, columns, suffix="") -> str:
+    name = f"ix_{table.name}_{'_'.join(column.name for column in columns)}{suffix}"
+    return name[: dialect.max_identifier_length]
+
+
+def _index_ddl(dialect, table, columns, nulls_first=()) -> str:
+    # Built as text rather than with `sqlalchemy.Index`, which would add the index to the model's table.
+    preparer = dialect.identifier_preparer
+    column_list = ", ".join(
+        preparer.quote(column.name) + (" NULLS FIRST" if column in nulls_first else "") for column in columns
+    )
+    return (
+        f"CREATE INDEX {preparer.quote(_index_name(dialect, table, columns))} "
+        f"ON {preparer.format_table(table)} ({column_list})"
+    )
+
+
+def _lower_ddl(dialect, table, column) -> str:
+    preparer = dialect.identifier_preparer
+    return (
+        f"CREATE INDEX {preparer.quote(_index_name(dialect, table, (column,), '_lower'))} "
+        f"ON {preparer.format_table(table)} (lower({preparer.quote(column.name)}))"
+    )
+
+
+def _trigram_ddl(dialect, table, column) -> str:
+    preparer = dialect.identifier_preparer
+    return (
+        f"CREATE INDEX {preparer.quote(_index_name(dialect, table, (column,), '_trgm'))} "
+        f"ON {preparer.format_table(table)} USING gin ({preparer.quote(column.name)} gin_trgm_ops)"
+    )
+
+
+def advise_app_indexes(admins: t.Iterable) -> list[IndexAdvice]:
+    """Index advice for every SQLAlchemy model view registered with the given Flask-Admin instances."""
+    advice = []
+    for admin in admins:
+        for view in admin._views:
+            if isinstance(view, ModelView):
+                engine = view.session.get_bind(mapper=view.model.__mapper__)
+                advice.extend(advise_indexes(view, engine.dialect))
+    return advice
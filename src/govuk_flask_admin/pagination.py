@@ -0,0 +1,137 @@
+"""Keyset ("seek") pagination for GovukModelView.
+
+Rather than counting every matching row and skipping `page * page_size` of them with OFFSET, a keyset
+page is read from just after (or before) a boundary row, using the view's sort column with the primary
+key as a tie-breaker. Deep pages cost the same as the first, but the total isn't known, so only
+previous/next links can be offered.
+"""
+import base64
+import binascii
+import json
+import typing as t
+from dataclasses import dataclass
+from urllib.parse import urlencode
+
+from sqlalchemy import and_, or_
+
+CURSOR_ARG = "cursor"
+NEXT = "next"
+PREVIOUS = "previous"
+
+
+@dataclass(frozen=True)
+class KeysetCursor:
+    """A position in a keyset-paginated list: a boundary row and which way to read from it.
+
+    Encoded as an opaque, URL-safe token; the boundary row's sort value is looked up again by primary
+    key, so the token never carries other column values.
+    """
+
+    direction: str
+    pk: str | int
+
+    def encode(self) -> str:
+        payload = json.dumps([self.direction, self.pk], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+    @classmethod
+    def decode(cls, token: str | None) -> "KeysetCursor | None":
+        """Returns None for a missing or malformed token, which callers treat as the first page."""
+        if not token:
+            return None
+
+        try:
+            payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            direction, pk = json.loads(payload)
+        except (binascii.Error, ValueError, TypeError):
+            return None
+
+        if direction not in (NEXT, PREVIOUS) or not isinstance(pk, (str, int)) or isinstance(pk, bool):
+            return None
+
+        return cls(direction, pk)
+
+
+@dataclass(frozen=True)
+class KeysetColumns:
+    """The (sort column, primary key) pair a view is paginated on.
+
+    Both are mapped column attributes; `sort` is None when the list is ordered by primary key alone.
+    """
+
+    sort: t.Any
+    pk: t.Any
+    descending: bool = False
+    # Whether ORDER BY needs to say where NULLs go. MySQL and MariaDB don't support NULLS FIRST/LAST, but
+    # already sort NULLs first in ascending order.
+    explicit_nulls: bool = True
+
+    @property
+    def sort_nullable(self) -> bool:
+        return self.sort is not None and self.sort.property.columns[0].nullable
+
+    def order_by(self, reverse: bool = False) -> list:
+        """ORDER BY clauses for the list, or for reading it backwards.
+
+        NULL sort values come first in ascending order (and last in descending order) on every
+        database, so the order matches the predicates built by `seek`. That's said with NULLS FIRST/LAST
+        rather than an expression, so an index on (sort column, primary key) can still serve the order;
+        on PostgreSQL, which puts NULLs last by default, the index needs to be on
+        (sort column NULLS FIRST, primary key).
+        """
+        descending = self.descending != reverse
+        clauses = []
+
+        if self.sort is not None:
+            sort = self.sort.desc() if descending else self.sort.asc()
+            if self.sort_nullable and self.explicit_nulls:
+                sort = sort.nulls_last() if descending else sort.nulls_first()
+            clauses.append(sort)
+
+        clauses.append(self.pk.desc() if descending else self.pk.asc())
+        return clauses
+
+    def seek(self, sort_value, pk_value, after: bool):
+        """Filter for the rows strictly after (or before) a boundary row in the list's order."""
+        # Work in ascending terms; a descending list is the same order read backwards.
+        forwards = after != self.descending
+
+        if self.sort is None:
+            return self.pk > pk_value if forwards else self.pk < pk_value
+
+        if sort_value is None:
+            tie = and_(self.sort.is_(None), self.pk > pk_value if forwards else self.pk < pk_value)
+            return or_(tie, self.sort.is_not(None)) if forwards else tie
+
+        tie = and_(self.sort == sort_value, self.pk > pk_value if forwards else self.pk < pk_value)
+        if forwards:
+            return or_(self.sort > sort_value, tie)
+
+        clauses = [self.sort < sort_value, tie]
+        if self.sort_nullable:
+            clauses.append(self.sort.is_(None))
+        return or_(*clauses)
+
+
+@dataclass(frozen=True)
+class KeysetPage:
+    """Where the current keyset page sits, for building previous/next links."""
+
+    page: int
+    previous_cursor: str | None = None
+    next_cursor: str | None = None
+
+    def pager_url(self, url_generator):
+        """Wraps Flask-Admin's `pager_url` so links to the neighbouring pages carry their cursor.
+
+        The page number is kept in the URL purely for display; rows are located by the cursor.
+        """
+
+        def _pager_url(page):
+            url = url_generator(page)
+            cursor = self.previous_cursor if page < self.page else self.next_cursor
+            if page == 0 or cursor is None:
+                return url
+            return f"{url}{'&' if '?' in url else '?'}{urlencode({CURSOR_ARG: cursor})}"
+
+        return _pager_url
@@ -0,0 +1,403 @@
+"""Backends for the list view's search box.
+
+Flask-Admin searches with `ILIKE '%term%'` on every column in `column_searchable_list`, which no ordinary
+index can serve, so every search reads every row and gets slower as text columns grow. A view's
+`search_backend` decides how search is done instead:
+
+- `LikeSearch`, the default, is Flask-Admin's search, with a choice of how each column is matched: a
+  view's `column_search_modes` can make columns match exactly or by prefix, which an index can serve.
+- `SQLiteFTS5Search` keeps the searchable columns in an SQLite FTS5 table.
+- `PostgresFullTextSearch` keeps a `tsvector` of them in a table with a GIN index.
+
+The full-text backends match whole words and word prefixes (so "admin" finds "administrator", but "min"
+doesn't), rather than any part of a value. Their index tables are created and filled by
+`flask govuk-flask-admin reindex-search`, and kept up to date by the session events below as objects are
+added, changed and deleted through the ORM.
+"""
+import sys
+import typing as t
+import warnings
+import weakref
+
+from flask_admin.contrib.sqla.tools import parse_like_term
+from sqlalchemy import Column, Index, Integer, MetaData, String, Table, Unicode, and_, bindparam, cast, column, delete
+from sqlalchemy import event, false, func, insert, inspect, literal_column, or_, select, table
+from sqlalchemy.dialects.postgresql import REGCONFIG, TSVECTOR
+from sqlalchemy.orm import Mapper, Session
+
+if t.TYPE_CHECKING:
+    from govuk_flask_admin import GovukModelView
+
+
+class SearchBackend:
+    """How a view's search box finds rows."""
+
+    def bind(self, view: "GovukModelView"):
+        """Called once the view has worked out its `_search_fields`."""
+
+    def apply(self, view: "GovukModelView", query, count_query, joins, count_joins, search: str):
+        """Applies `search` to the list and count queries, as Flask-Admin's `ModelView._apply_search` does.
+
+        Returns `(query, count_query, joins, count_joins)`.
+        """
+        raise NotImplementedError
+
+
+# How `LikeSearch` matches each word of a search against a column, set per column in `column_search_modes`.
+# "exact" and "prefix" compare the column itself, so an ordinary index on it can serve them; "casefold" compares
+# `lower(column)`, which an index on that expression can serve.
+EXACT = "exact"
+PREFIX = "prefix"
+CONTAINS = "contains"
+CASEFOLD = "casefold"
+
+# How each mode is described in the search box's hint; "contains" is what people expect, so isn't mentioned.
+SEARCH_MODE_LABELS = {EXACT: "exact match", PREFIX: "starts with", CONTAINS: None, CASEFOLD: "exact match, any case"}
+
+
+def search_criterion(column, mode: str, term: str):
+    """A condition matching `term` against `column` in the given search mode, or None if it can never match."""
+    if mode == CONTAINS:
+        # As Flask-Admin does, including its "^term" (starts with) and "=term" (equals) syntax.
+        return cast(column, Unicode).ilike(parse_like_term(term))
+
+    if mode == EXACT:
+        if not isinstance(column.type, String):
+            try:
+                return column == column.type.python_type(term)
+            except (NotImplementedError, TypeError, ValueError):
+                return None
+        return column == term
+
+    if not isinstance(column.type, String):
+        column = cast(column, Unicode)
+
+    if mode == CASEFOLD:
+        return func.lower(column) == term.lower()
+
+    if mode == PREFIX:
+        # Most databases only serve `LIKE 'term%'` from an index under some collations, so it's bounded by a range,
+        # which an index always serves. The range alone isn't enough: under linguistic collations (e.g. en_US or
+        # MySQL's *_ci), values that don't start with the term can sort inside it.
+        escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        like = column.like(escaped + "%", escape="\\")
+        upper = _prefix_upper_bound(term)
+        return and_(column >= term, like) if upper is None else and_(column >= term, column < upper, like)
+
+    raise ValueError(f"Unknown search mode {mode!r}")
+
+
+def _prefix_upper_bound(prefix: str) -> str | None:
+    """The smallest string greater than every string starting with `prefix`, or None if there isn't one."""
+    while prefix:
+        last = ord(prefix[-1])
+        if last < sys.maxunicode:
+            return prefix[:-1] + chr(last + 1)
+        prefix = prefix[:-1]
+    return None
+
+
+class LikeSearch(SearchBackend):
+    """Flask-Admin's search: every word must match one of the searchable columns.
+
+    Words match anywhere in a column's value (`ILIKE '%word%'`), unless the view's `column_search_modes` gives
+    the column another mode.
+    """
+
+    def apply(self, view, query, count_query, joins, count_joins, search):
+        modes = view._search_modes or [CONTAINS] * len(view._search_fields)
+
+        for term in search.split(" "):
+            if not term:
+                continue
+
+            criteria = []
+            count_criteria = []
+
+            for (field, path), mode in zip(view._search_fields, modes):
+                query, joins, alias = view._apply_path_joins(query, joins, path, inner_join=False)
+                column = field if alias is None else getattr(alias, field.key)
+                criterion = search_criterion(column, mode, term)
+                if criterion is not None:
+                    criteria.append(criterion)
+
+                if count_query is not None:
+                    count_query, count_joins, count_alias = view._apply_path_joins(
+                        count_query, count_joins, path, inner_join=False
+                    )
+                    column = field if count_alias is None else getattr(count_alias, field.key)
+                    criterion = search_criterion(column, mode, term)
+                    if criterion is not None:
+                        count_criteria.append(criterion)
+
+            query = query.filter(or_(*criteria) if criteria else false())
+            if count_query is not None:
+                count_query = count_query.filter(or_(*count_criteria) if count_criteria else false())
+
+        return query, count_query, joins, count_joins
+
+
+# Every bound SearchIndex, so the session events below can keep them up to date.
+_search_indexes: "weakref.WeakSet[SearchIndex]" = weakref.WeakSet()
+_BULK_DELETED = "_govuk_flask_admin_bulk_deleted_mappers"
+
+
+class SearchIndex(SearchBackend):
+    """A search backend that keeps a copy of a model's searchable columns in an index table.
+
+    Index rows are keyed by the model's primary key, which has to be a single column. Searchable columns have
+    to be on the model itself, not on related models, so that changes to them can be seen as they're flushed.
+
+    ORM bulk inserts and updates (`session.execute(update(Model))`) and raw SQL aren't seen; run
+    `flask govuk-flask-admin reindex-search` after them.
+
+    Until `reindex-search` has created the index table, changes aren't indexed and searches fall back to
+    `LikeSearch`, with a warning, rather than failing.
+    """
+
+    def __init__(self, table_name: str | None = None, batch_size: int = 1000):
+        self.table_name = table_name
+        self.batch_size = batch_size
+        self.mapper: Mapper | None = None
+        self.primary_key: Column | None = None
+        self.columns: tuple[Column, ...] = ()
+        # Engines known to have the index table; once it's there, it isn't checked for again.
+        self._ready_engines: "weakref.WeakSet" = weakref.WeakSet()
+
+    def bind(self, view):
+        mapper = inspect(view.model)
+        columns = []
+        for field, path in view._search_fields:
+            if path or not isinstance(field, Column) or field.table is not mapper.local_table:
+                raise ValueError(
+                    f"{type(self).__name__} can only search columns of {mapper.class_.__name__} itself, not {field}"
+                )
+            columns.append(field)
+
+        if len(mapper.primary_key) != 1:
+            raise ValueError(f"{type(self).__name__} needs {mapper.class_.__name__} to have a single-column primary key")
+
+        if self.mapper is not None and (self.mapper is not mapper or self.columns != tuple(columns)):
+            raise ValueError(f"This {type(self).__name__} already indexes {self.mapper.class_.__name__}; give each view its own")
+
+        self.mapper = mapper
+        self.primary_key = mapper.primary_key[0]
+        self.columns = tuple(columns)
+        self._keys = {col: mapper.get_property_by_column(col).key for col in (self.primary_key, *self.columns)}
+        self.table_name = self.table_name or f"{mapper.local_table.name}_search"
+        self._build_table()
+        _search_indexes.add(self)
+
+    def apply(self, view, query, count_query, joins, count_joins, search):
+        terms = [term for term in search.split(" ") if term]
+        if not terms:
+            return query, count_query, joins, count_joins
+
+        if not self.is_ready(view.session.connection(bind_arguments={"mapper": self.mapper})):
+            return LikeSearch().apply(view, query, count_query, joins, count_joins, search)
+
+        criterion = self.primary_key.in_(self.matching_ids(terms))
+        query = query.filter(criterion)
+        if count_query is not None:
+            count_query = count_query.filter(criterion)
+
+        return query, count_query, joins, count_joins
+
+    def _build_table(self):
+        """Sets `self.table`, and `self.id_column` to its column holding the model's primary key."""
+        raise NotImplementedError
+
+    def create(self, connection):
+        """Creates the index table, if it doesn't already exist."""
+        raise NotImplementedError
+
+    def is_ready(self, connection) -> bool:
+        """Whether the index table exists, warning if it doesn't (i.e. `reindex-search` hasn't been run yet)."""
+        if connection.engine in self._ready_engines:
+            return True
+
+        if inspect(connection).has_table(self.table_name):
+            self._ready_engines.add(connection.engine)
+            return True
+
+        warnings.warn(
+            f"Search index table {self.table_name} doesn't exist, so {self.mapper.class_.__name__} isn't being "
+            "indexed or searched with it; run `flask govuk-flask-admin reindex-search` to create it",
+            stacklevel=2,
+        )
+        return False
+
+    def matching_ids(self, terms: list[str]):
+        """A SELECT of the primary keys of rows matching every one of `terms`."""
+        raise NotImplementedError
+
+    def _insert(self, connection, rows: list[dict]):
+        """Adds index rows for `rows`, which have the primary key as "id" and each searchable column by name."""
+        raise NotImplementedError
+
+    def _delete(self, connection, ids: t.Iterable):
+        ids = list(ids)
+        if ids:
+            connection.execute(delete(self.table).where(self.id_column.in_(ids)))
+
+    def _row(self, obj) -> dict:
+        state = inspect(obj)
+        row = {"id": state.attrs[self._keys[self.primary_key]].value}
+        for col in self.columns:
+            value = state.attrs[self._keys[col]].value
+            row[col.name] = "" if value is None else str(value)
+        return row
+
+    def _changed(self, obj) -> bool:
+        state = inspect(obj)
+        return any(state.attrs[self._keys[col]].history.has_changes() for col in self.columns)
+
+    def covers(self, obj) -> bool:
+        return inspect(obj).mapper.isa(self.mapper)
+
+    def sync(self, session: Session):
+        """Updates the index for objects in `session` that are being flushed."""
+        deleted = [obj for obj in session.deleted if self.covers(obj)]
+        changed = [
+            obj for obj in (*session.new, *session.dirty) if self.covers(obj) and (obj in session.new or self._changed(obj))
+        ]
+        if not deleted and not changed:
+            return
+
+        connection = session.connection(bind_arguments={"mapper": self.mapper})
+        if not self.is_ready(connection):
+            return
+
+        rows = [self._row(obj) for obj in changed]
+        self._delete(connection, [inspect(obj).identity[0] for obj in deleted] + [row["id"] for row in rows])
+        if rows:
+            self._insert(connection, rows)
+
+    def remove_orphans(self, session: Session):
+        """Deletes index rows whose object no longer exists, e.g. after an ORM bulk delete."""
+        connection = session.connection(bind_arguments={"mapper": self.mapper})
+        if self.is_ready(connection):
+            connection.execute(delete(self.table).where(self.id_column.not_in(select(self.primary_key))))
+
+    def reindex(self, session: Session) -> int:
+        """Creates the index table if needed and rebuilds it from the model's table. Returns the number of rows."""
+        connection = session.connection(bind_arguments={"mapper": self.mapper})
+        self.create(connection)
+        self._ready_engines.add(connection.engine)
+        connection.execute(delete(self.table))
+
+        indexed = 0
+        statement = select(self.primary_key.label("id"), *self.columns).execution_options(yield_per=self.batch_size)
+        for partition in connection.execute(statement).partitions():
+            rows = [
+                {"id": row.id, **{col.name: "" if row[i] is None else str(row[i]) for i, col in enumerate(self.columns, 1)}}
+                for row in partition
+            ]
+            self._insert(connection, rows)
+            indexed += len(rows)
+
+        return indexed
+
+
+class SQLiteFTS5Search(SearchIndex):
+    """Searches an SQLite FTS5 table holding a copy of the searchable columns, keyed by `rowid`.
+
+    Needs an integer primary key. `tokenize` is FTS5's tokenizer option; the default ignores case and accents.
+    """
+
+    def __init__(self, table_name: str | None = None, tokenize: str = "unicode61 remove_diacritics 2", batch_size: int = 1000):
+        super().__init__(table_name, batch_size)
+        self.tokenize = tokenize
+
+    def _build_table(self):
+        if not isinstance(self.primary_key.type, Integer):
+            raise ValueError(f"SQLiteFTS5Search needs {self.mapper.class_.__name__} to have an integer primary key")
+
+        # FTS5 tables can't be described with `Table`; this is just enough to build statements against.
+        self.table = table(self.table_name, column("rowid"), *(column(col.name) for col in self.columns))
+        self.id_column = self.table.c.rowid
+
+    def create(self, connection):
+        preparer = connection.dialect.identifier_preparer
+        columns = ", ".join(preparer.quote(col.name) for col in self.columns)
+        tokenize = self.tokenize.replace("'", "''")
+        connection.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {preparer.quote(self.table_name)} "
+            f"USING fts5({columns}, tokenize='{tokenize}')"
+        )
+
+    def matching_ids(self, terms):
+        # Each term is quoted, so FTS5 query syntax in it is taken literally, and matched as a word prefix.
+        query = " ".join('"{}"*'.format(term.replace('"', '""')) for term in terms)
+        return select(self.table.c.rowid).where(literal_column(self.table_name).match(query))
+
+    def _insert(self, connection, rows):
+        connection.execute(
+            insert(self.table).values(rowid=bindparam("id"), **{col.name: bindparam(col.name) for col in self.columns}),
+            rows,
+        )
+
+
+class PostgresFullTextSearch(SearchIndex):
+    """Searches a `tsvector` of the searchable columns, in a table with a GIN index.
+
+    `config` is the text search configuration used to split values into words: "simple" keeps every word as
+    it is, while e.g. "english" drops stop words and stems the rest, so "posting" also finds "posts".
+    """
+
+    def __init__(self, table_name: str | None = None, config: str = "simple", batch_size: int = 1000):
+        super().__init__(table_name, batch_size)
+        self.config = config
+
+    def _build_table(self):
+        self.table = Table(
+            self.table_name,
+            MetaData(),
+            Column("id", self.primary_key.type, primary_key=True),
+            Column("document", TSVECTOR, nullable=False),
+            Index(f"ix_{self.table_name}_document", "document", postgresql_using="gin"),
+        )
+        self.id_column = self.table.c.id
+
+    def create(self, connection):
+        self.table.create(connection, checkfirst=True)
+
+    def matching_ids(self, terms):
+        # Each term is quoted as a lexeme, so tsquery operators in it are taken literally, and matched as a prefix.
+        query = " & ".join("'{}':*".format(term.replace("\\", "\\\\").replace("'", "''")) for term in terms)
+        return select(self.table.c.id).where(
+            self.table.c.document.op("@@")(func.to_tsquery(cast(self.config, REGCONFIG), query))
+        )
+
+    def _insert(self, connection, rows):
+        document = func.to_tsvector(cast(self.config, REGCONFIG), bindparam("document"))
+        connection.execute(
+            insert(self.table).values(id=bindparam("id"), document=document),
+            [{"id": row["id"], "document": " ".join(row[col.name] for col in self.columns)} for row in rows],
+        )
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_search_indexes(session, flush_context):
+    for index in list(_search_indexes):
+        index.sync(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_bulk_deletes(orm_execute_state):
+    if _search_indexes and orm_execute_state.is_delete and orm_execute_state.bind_mapper is not None:
+        orm_execute_state.session.info.setdefault(_BULK_DELETED, set()).add(orm_execute_state.bind_mapper)
+
+
+@event.listens_for(Session, "before_commit")
+def _remove_bulk_deleted_rows(session):
+    mappers = session.info.pop(_BULK_DELETED, None)
+    if mappers:
+        for index in list(_search_indexes):
+            if any(mapper.isa(index.mapper) for mapper in mappers):
+                index.remove_orphans(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_bulk_deletes(session):
+    session.info.pop(_BULK_DELETED, None)
@@ -0,0 +1,109 @@
+"""Fast URL building for the links on a GovukModelView page.
+
+A list page builds hundreds of links (page numbers, sort headers, filter tags, and edit/details links for
+every row), nearly all to the view's own endpoints, which have no path arguments and differ only in their
+query string. Most of the cost of `url_for` for these is percent-encoding the same arguments over and over:
+every row's links carry the same (often long) `url` to return to, and every page and sort link carries the
+same filters. `UrlBuilder` resolves each endpoint's path once per request and encodes each argument once,
+so building a link is mostly joining strings it already has.
+"""
+import typing as t
+from urllib.parse import urlencode
+
+from flask import current_app, g, has_request_context, request, url_for
+from werkzeug.datastructures import iter_multi_items
+
+# `url_for` arguments that change more than the query string.
+_URL_FOR_OPTIONS = frozenset({"_anchor", "_method", "_scheme", "_external"})
+
+# Characters `werkzeug` leaves unescaped in query strings, so links are the same as those from `url_for`.
+_QUERY_SAFE = "!$'()*,/:;?@"
+
+
+class UrlBuilder:
+    """Builds URLs the same way as `url_for`, for the request it was made for.
+
+    Endpoints whose rules have path arguments or defaults, and calls with `url_for` options such as
+    `_external`, are passed on to `url_for`.
+    """
+
+    def __init__(self):
+        self.request = request._get_current_object()
+        self._paths: dict[str, str | None] = {}
+        self._encoded: dict[tuple, str] = {}
+
+    @classmethod
+    def current(cls) -> "UrlBuilder":
+        """The builder for the current request, made on first use."""
+        builder = g.get("_govuk_flask_admin_url_builder")
+        if builder is None or builder.request is not request._get_current_object():
+            builder = g._govuk_flask_admin_url_builder = cls()
+        return builder
+
+    def _resolve_endpoint(self, endpoint: str) -> str:
+        # Relative endpoints are resolved against the current blueprint, as `url_for` does.
+        if endpoint.startswith("."):
+            blueprint = self.request.blueprint
+            return f"{blueprint}{endpoint}" if blueprint is not None else endpoint[1:]
+        return endpoint
+
+    def _path(self, endpoint: str) -> str | None:
+        try:
+            return self._paths[endpoint]
+        except KeyError:
+            pass
+
+        try:
+            rules = list(current_app.url_map.iter_rules(endpoint))
+        except KeyError:
+            rules = []
+
+        # Only rules without path arguments put every value in the query string; anything else (including
+        # unknown endpoints, so they raise as usual) is left to `url_for`.
+        if rules and all(not rule.arguments and not rule.defaults for rule in rules):
+            # Any query string here comes from the app's `url_defaults`, which `build` applies to every URL.
+            path = url_for(endpoint).partition("?")[0]
+        else:
+            path = None
+
+        self._paths[endpoint] = path
+        return path
+
+    def build(self, endpoint: str, **values: t.Any) -> str:
+        if _URL_FOR_OPTIONS.intersection(values):
+            return url_for(endpoint, **values)
+
+        endpoint = self._resolve_endpoint(endpoint)
+        path = self._path(endpoint)
+        if path is None:
+            return url_for(endpoint, **values)
+
+        current_app.inject_url_defaults(endpoint, values)
+
+        items = [(key, value) for key, value in iter_multi_items(values) if value is not None]
+        if not items:
+            return path
+
+        url_map = current_app.url_map
+        if url_map.sort_parameters:
+            items.sort(key=url_map.sort_key)
+
+        return f"{path}?{'&'.join(self._encode(key, value) for key, value in items)}"
+
+    def _encode(self, key, value) -> str:
+        # The type is part of the key, as e.g. `1` and `True` are equal but encode differently.
+        cache_key = (key, type(value), value)
+        try:
+            return self._encoded[cache_key]
+        except KeyError:
+            encoded = self._encoded[cache_key] = urlencode(((key, value),), safe=_QUERY_SAFE)
+            return encoded
+        except TypeError:
+            return urlencode(((key, value),), safe=_QUERY_SAFE)
+
+
+def build_url(endpoint: str, **values: t.Any) -> str:
+    """`url_for`, using the current request's `UrlBuilder` where there is one."""
+    if not has_request_context():
+        return url_for(endpoint, **values)
+    return UrlBuilder.current().build(endpoint, **values)
@@ -0,0 +1,171 @@
+"""`column IN (...)` for lists of values too long to bind one parameter each.
+
+`column.in_(values)` binds every value as its own parameter. That's fine for a handful, but a list of thousands
+of pasted IDs makes a statement that's slow to build, can't be cached, and on SQLite can run into the limit on
+parameters in a statement (999 before SQLite 3.32, 32,766 since). `in_values` binds lists up to `max_bound`
+values as usual, and longer ones as a single parameter read as a table:
+
+- SQLite: `column IN (SELECT value FROM json_each(?))`, with the values as a JSON array.
+- PostgreSQL: `column = ANY(?)`, with the values as an array.
+
+Other databases get an ordinary bound `IN`.
+
+The lists themselves can be too long for the list page's links, which repeat the filters (sort headers, pages,
+export, and the return URL of every row's edit and details links). A `ValueListStore` keeps long lists on the
+server under a short token, which the links carry instead.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+import typing as t
+from collections import OrderedDict
+from decimal import Decimal
+
+from sqlalchemy import Boolean, String, any_, bindparam, func, literal_column, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ColumnElement
+
+# Lists longer than this are bound as one parameter, where the database allows it.
+MAX_BOUND_VALUES = 500
+
+# A stored list's token: "@" and the start of the SHA-256 of its text.
+_TOKEN = re.compile(r"@[0-9a-f]{24}")
+
+
+class ValueListStore:
+    """An in-process store of long value lists, so links to a filtered list carry a short token instead.
+
+    Tokens are made from each list's content, so the same list always gets the same token. Entries expire `ttl`
+    seconds after they were last used, and the least recently used are dropped past `max_entries`. As lists are
+    kept in this process, a token made by another process (or one that's expired) isn't found, and has to be
+    entered again; run a single process, use sticky sessions, or subclass this to keep lists somewhere shared.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 3600,
+        max_entries: int = 256,
+        min_length: int = 500,
+        clock: t.Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Lists this many characters long or shorter stay in the URL.
+        self.min_length = min_length
+        self.clock = clock
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def is_token(value: str) -> bool:
+        return _TOKEN.fullmatch(value) is not None
+
+    def put(self, values: str) -> str:
+        """Keeps `values`, the list's text, and returns the token to look it up by."""
+        token = "@" + hashlib.sha256(values.encode()).hexdigest()[:24]
+        with self._lock:
+            self._entries[token] = (self.clock() + self.ttl, values)
+            self._entries.move_to_end(token)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return token
+
+    def get(self, token: str) -> str | None:
+        """The list kept under `token`, or None if there isn't a live one."""
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                return None
+
+            expires, values = entry
+            if expires <= self.clock():
+                del self._entries[token]
+                return None
+
+            self._entries[token] = (self.clock() + self.ttl, values)
+            self._entries.move_to_end(token)
+            return values
+
+
+class InValues(ColumnElement):
+    """`column IN (values)`, compiled for the database it runs on. Made by `in_values`."""
+
+    __visit_name__ = "govuk_flask_admin_in_values"
+    # The values are part of the element, and there can be thousands of them; don't cache statements using it.
+    inherit_cache = False
+    type = Boolean()
+    _is_implicitly_boolean = True
+
+    def __init__(self, column, values, max_bound: int = MAX_BOUND_VALUES):
+        self.column = column
+        self.values = list(values)
+        self.max_bound = max_bound
+
+    def get_children(self, **kwargs):
+        return (self.column,)
+
+    @property
+    def _from_objects(self):
+        return self.column._from_objects
+
+    def bound_in(self):
+        return self.column.in_(self.values)
+
+
+def in_values(column, values, max_bound: int = MAX_BOUND_VALUES) -> InValues:
+    """A condition that `column` is one of `values`, binding long lists as a single parameter."""
+    return InValues(column, values, max_bound)
+
+
+@compiles(InValues)
+def _compile_bound_in(element, compiler, **kw):
+    return compiler.process(element.bound_in(), **kw)
+
+
+@compiles(InValues, "sqlite")
+def _compile_sqlite_json_each(element, compiler, **kw):
+    if len(element.values) <= element.max_bound:
+        return compiler.process(element.bound_in(), **kw)
+
+    # Bind the values as the column would bind them (e.g. enums by name, dates as ISO strings).
+    processor = element.column.type.bind_processor(compiler.dialect)
+    values = [processor(value) for value in element.values] if processor else element.values
+
+    column = element.column
+    if values and all(isinstance(value, (bytes, bytearray, memoryview)) for value in values):
+        # JSON has no bytes, and SQLite can't turn text back into a blob before 3.41, so compare hex digits.
+        column = func.hex(column)
+        values = [bytes(value).hex().upper() for value in values]
+
+    try:
+        payload = json.dumps(values, default=_json_value)
+    except TypeError:
+        # Values of types only the database driver knows how to adapt are bound one by one.
+        return compiler.process(element.bound_in(), **kw)
+
+    table = select(literal_column("value")).select_from(func.json_each(bindparam(None, payload, type_=String())))
+    return compiler.process(column.in_(table), **kw)
+
+
+def _json_value(value):
+    # Anything else JSON can't hold goes in as text, which SQLite converts to the column's affinity to compare.
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Can't bind {type(value).__name__} values in a JSON array")
+
+
+@compiles(InValues, "postgresql")
+def _compile_postgresql_any(element, compiler, **kw):
+    if len(element.values) <= element.max_bound:
+        return compiler.process(element.bound_in(), **kw)
+
+    array = bindparam(None, element.values, type_=ARRAY(element.column.type))
+    return compiler.process(element.column == any_(array), **kw)
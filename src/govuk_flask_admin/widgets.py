@@ -2,6 +2,8 @@
 from govuk_frontend_wtf.gov_form_base import GovFormBase
 from wtforms.widgets.core import Select
 
+from govuk_flask_admin.assets import SELECT_WITH_SEARCH_ENTRY, require_js_entry
+
 
 class GovSelectWithSearch(GovFormBase, Select):
     """
@@ -22,6 +24,9 @@ class GovSelectWithSearch(GovFormBase, Select):
 
     The Python widget is custom implementation for Flask-Admin/WTForms,
     while the JavaScript/CSS are adapted from govuk_publishing_components.
+
+    Rendering the widget records that the page needs the select-with-search JS entry, so Choices.js
+    is only loaded on pages that use it.
     """
 
     template = "select-with-search.html"
@@ -42,6 +47,8 @@ class GovSelectWithSearch(GovFormBase, Select):
         # Pass multiple flag to template
         kwargs["multiple"] = self.multiple
 
+        require_js_entry(SELECT_WITH_SEARCH_ENTRY)
+
         return super().__call__(field, **kwargs)
 
     def map_gov_params(self, field, **kwargs):
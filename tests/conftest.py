@@ -1,14 +1,52 @@
 """Shared pytest fixtures for all tests."""
 import pytest
 import datetime
+import json
 import random
 
+import govuk_flask_admin
 # Import from app.py instead of redefining
 from app import create_app, User, Account, Post, Base, FavouriteColour, _create_app
 
 # Store app components at module level for session scope
 _app_components = None
 
+# Stand-ins for the hashed files a Vite build writes, keyed by manifest entry.
+STAND_IN_ENTRIES = {
+    "src/assets/main.scss": ("main-AbC123xy.css", "body{color:#0b0c0c}" * 200),
+    "src/assets/main.js": ("main-De45FgHi.js", "console.log('govuk');" * 200),
+    "_choices-Pq89RsTu.js": ("choices-Pq89RsTu.js", "export default 1;"),
+    "src/assets/select-with-search.js": ("select-with-search-Jk67LmNo.js", "import './choices-Pq89RsTu.js';"),
+    **{
+        f"src/assets/critical/{name}.scss": (f"{name}-Cr1t{name[:2]}.css", f".govuk-header{{display:block}} /* {name} */")
+        for name in ("list", "details", "edit")
+    },
+}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def vite_dist(tmp_path_factory):
+    """Point GovukFlaskAdmin at a stand-in Vite build, so tests don't need `npm run build`."""
+    dist = tmp_path_factory.mktemp("dist")
+    assets = dist / "assets"
+    (assets / "fonts").mkdir(parents=True)
+    (assets / "images").mkdir()
+
+    manifest = {}
+    for src, (file, content) in STAND_IN_ENTRIES.items():
+        (assets / file).write_text(content)
+        manifest[src] = {"file": f"assets/{file}", "src": src, "isEntry": not src.startswith("_")}
+    manifest["src/assets/select-with-search.js"]["imports"] = ["_choices-Pq89RsTu.js"]
+    (assets / "fonts" / "bold-b542beb274-v2.woff2").write_bytes(b"\x00woff2" * 100)
+    (assets / "fonts" / "light-94a07e06a1-v2.woff2").write_bytes(b"\x00woff2" * 100)
+    (assets / "images" / "favicon.svg").write_text("<svg></svg>")
+    (dist / "manifest.json").write_text(json.dumps(manifest))
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(govuk_flask_admin, "MANIFEST_FILE", dist / "manifest.json")
+        mp.setattr(govuk_flask_admin, "ASSETS_DIR", assets)
+        yield dist
+
 
 def get_app_components():
     """Get or create app components (app, db, admin) for testing."""
@@ -0,0 +1,236 @@
+"""Integration tests for list view count strategies."""
+import datetime
+import re
+
+import pytest
+from sqlalchemy import event, text
+
+from govuk_flask_admin.counting import CappedCount, CountCache, EstimatedCount, WindowCount
+
+
+@pytest.mark.integration
+class TestCountStrategies:
+    """Test GovukModelView.count_strategy in the list view."""
+
+    def test_exact_count_is_shown_by_default(self, client, user_model_view, sample_users):
+        """Test the default strategy shows the exact total."""
+        total = user_model_view.get_count_query().scalar()
+
+        response = client.get("/admin/user/")
+
+        assert f"{total} results" in response.data.decode("utf-8")
+
+    def test_capped_count_is_shown_as_lower_bound(self, client, user_model_view, sample_users, monkeypatch):
+        """Test a capped count is shown with a plus sign, in the footer and export button."""
+        monkeypatch.setattr(user_model_view, "count_strategy", CappedCount(cap=5))
+
+        html_content = client.get("/admin/user/").data.decode("utf-8")
+
+        assert "5+ results" in html_content
+        assert "Download 5+ results as CSV" in html_content
+
+    def test_count_cap_gives_open_ended_pagination(self, client, user_model_view, sample_users, monkeypatch):
+        """Test count_cap shows a lower bound and links onwards without a last-page link."""
+        monkeypatch.setattr(user_model_view, "count_cap", 3)
+        monkeypatch.setattr(user_model_view, "page_size", 2)
+
+        html_content = client.get("/admin/user/?page=1").data.decode("utf-8")
+
+        assert "3+ results" in html_content
+        assert 'rel="next"' in html_content
+        assert "govuk-pagination__item--ellipses" in html_content
+
+    def test_count_cap_full_last_page_has_no_next_link(self, client, user_model_view, sample_users, monkeypatch):
+        """Test open-ended pagination only links onwards when there's another row, even if the page is full."""
+        monkeypatch.setattr(user_model_view, "count_cap", 3)
+        monkeypatch.setattr(user_model_view, "page_size", 5)
+
+        assert 'rel="next"' in client.get("/admin/user/").data.decode("utf-8")
+        assert 'rel="next"' not in client.get("/admin/user/?page=1").data.decode("utf-8")
+
+    def test_count_cap_unpaginated_list_has_no_next_link(self, client, user_model_view, sample_users, monkeypatch):
+        """Test a list with no page size shows every row and no next link."""
+        monkeypatch.setattr(user_model_view, "count_cap", 3)
+        monkeypatch.setattr(user_model_view, "page_size", 0)
+
+        response = client.get("/admin/user/")
+
+        assert response.status_code == 200
+        assert len(set(re.findall(r'href="/admin/user/edit/\?id=(\d+)&', response.data.decode("utf-8")))) == 10
+        assert 'rel="next"' not in response.data.decode("utf-8")
+
+    def test_count_cap_not_reached_is_exact(self, client, user_model_view, sample_users, monkeypatch):
+        """Test a cap above the number of rows gives the normal count and pagination."""
+        monkeypatch.setattr(user_model_view, "count_cap", 10_000)
+
+        html_content = client.get("/admin/user/").data.decode("utf-8")
+
+        assert "+ results" not in html_content
+
+    def test_estimated_count_is_shown_as_about(self, client, db, user_model_view, sample_users, monkeypatch):
+        """Test an estimate from database statistics is shown as approximate."""
+        db.session.execute(text("ANALYZE"))
+        monkeypatch.setattr(user_model_view, "count_strategy", EstimatedCount(min_estimate=1))
+
+        html_content = client.get("/admin/user/").data.decode("utf-8")
+
+        assert re.search(r"Showing\s+about \d+ results", html_content)
+
+    def test_estimated_count_not_used_for_search(self, client, db, user_model_view, sample_users, monkeypatch):
+        """Test searches still get an exact count."""
+        db.session.execute(text("ANALYZE"))
+        monkeypatch.setattr(user_model_view, "count_strategy", EstimatedCount(min_estimate=1))
+
+        html_content = client.get("/admin/user/?search=user1@example.com").data.decode("utf-8")
+
+        assert "Showing" in html_content
+        assert "about " not in html_content
+
+
+@pytest.mark.integration
+class TestCountCache:
+    """Test GovukModelView.count_cache in the list view."""
+
+    @pytest.fixture
+    def count_queries(self, db, app):
+        """Record the COUNT statements run against the database."""
+        statements = []
+        engine = db.engine
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT COUNT"):
+                statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", record)
+        yield statements
+        event.remove(engine, "before_cursor_execute", record)
+
+    @pytest.fixture
+    def cached_view(self, user_model_view, monkeypatch):
+        monkeypatch.setattr(user_model_view, "count_cache", CountCache(ttl=60))
+        return user_model_view
+
+    def test_repeat_requests_reuse_count(self, client, sample_users, cached_view, count_queries):
+        """Test reloading the same list runs the count query once."""
+        client.get("/admin/user/?search=user")
+        client.get("/admin/user/?search=user&page=1")
+
+        assert len(count_queries) == 1
+
+    def test_different_filters_are_counted_separately(self, client, sample_users, cached_view, count_queries):
+        """Test a different search gets its own count."""
+        first = client.get("/admin/user/?search=user1").data.decode("utf-8")
+        second = client.get("/admin/user/?search=user").data.decode("utf-8")
+
+        assert len(count_queries) == 2
+        assert re.search(r"Showing\s+1 result\s", first)
+        assert re.search(r"Showing\s+\d+ results", second)
+
+    def test_commit_refreshes_count(self, app, db, client, sample_users, cached_view, count_queries):
+        """Test adding a row invalidates the cached count for its table."""
+        from tests.conftest import FavouriteColour, User
+
+        client.get("/admin/user/?search=example.com")
+
+        with app.app_context():
+            db.session.add(
+                User(
+                    email="cached@example.com",
+                    name="Cached",
+                    age=30,
+                    job="Job",
+                    favourite_colour=FavouriteColour.RED,
+                    created_at=datetime.date(2024, 1, 1),
+                )
+            )
+            db.session.commit()
+
+        client.get("/admin/user/?search=example.com")
+
+        assert len(count_queries) == 2
+
+    def test_cache_key_ignores_filter_order(self, app, cached_view):
+        """Test the same filters in a different order share a cache key."""
+        with app.test_request_context():
+            first = cached_view.get_count_cache_key("x", [(0, "Age", "equals", "30"), (1, "Job", "equals", "Dev")])
+            second = cached_view.get_count_cache_key("x", [(1, "Job", "equals", "Dev"), (0, "Age", "equals", "30")])
+
+        assert first == second
+
+
+@pytest.mark.integration
+class TestWindowCount:
+    """Test WindowCount in the list view."""
+
+    @pytest.fixture
+    def selects(self, db):
+        """Record the SELECT statements run against the database."""
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        yield statements
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    @pytest.fixture
+    def window_view(self, user_model_view, monkeypatch):
+        monkeypatch.setattr(user_model_view, "count_strategy", WindowCount())
+        return user_model_view
+
+    def test_total_matches_exact_count(self, client, sample_users, window_view):
+        """Test the windowed total is the same as a separate count."""
+        total = window_view.get_count_query().scalar()
+
+        html_content = client.get("/admin/user/").data.decode("utf-8")
+
+        assert re.search(rf"Showing\s+{total} results", html_content)
+
+    def test_rows_and_count_come_from_one_query(self, client, sample_users, window_view, selects):
+        """Test the list view runs no separate count query."""
+        client.get("/admin/user/?search=example.com")
+
+        user_selects = [statement for statement in selects if "FROM user" in statement]
+        assert len(user_selects) == 1
+        assert "OVER ()" in user_selects[0]
+
+    def test_filtered_total(self, client, sample_users, window_view):
+        """Test the windowed total reflects the search."""
+        html_content = client.get("/admin/user/?search=user1@example.com").data.decode("utf-8")
+
+        assert re.search(r"Showing\s+1 result\s", html_content)
+
+    def test_empty_page_falls_back(self, client, sample_users, window_view, monkeypatch):
+        """Test a page past the end still shows the total, from the fallback count."""
+        monkeypatch.setattr(window_view, "page_size", 2)
+        total = window_view.get_count_query().scalar()
+
+        html_content = client.get("/admin/user/?page=999").data.decode("utf-8")
+
+        assert re.search(rf"Showing\s+{total} results", html_content)
+
+    def test_empty_first_page_is_zero(self, client, sample_users, window_view):
+        """Test a search with no matches counts as zero without another query."""
+        html_content = client.get("/admin/user/?search=no-such-user").data.decode("utf-8")
+
+        assert re.search(r"Showing\s+0 results", html_content)
+
+    def test_window_count_fills_count_cache(self, client, sample_users, window_view, monkeypatch, selects):
+        """Test the windowed total is cached for later requests."""
+        monkeypatch.setattr(window_view, "count_cache", CountCache(ttl=60))
+
+        client.get("/admin/user/?search=user")
+        client.get("/admin/user/?search=user")
+
+        assert sum("OVER ()" in statement for statement in selects) == 1
+
+    def test_filtered_only_counts_unfiltered_lists_separately(self, client, sample_users, monkeypatch, window_view, selects):
+        """Test filtered_only leaves unfiltered lists to the fallback count."""
+        monkeypatch.setattr(window_view, "count_strategy", WindowCount(filtered_only=True))
+
+        client.get("/admin/user/")
+        client.get("/admin/user/?search=user")
+
+        assert sum("OVER ()" in statement for statement in selects) == 1
@@ -4,7 +4,7 @@ import pytest
 from sqlalchemy import Column, DateTime, create_engine
 from sqlalchemy.orm import declarative_base, Session
 
-from govuk_flask_admin import DateTimeEqualFilter, DateTimeAfterFilter, DateTimeBeforeFilter
+from govuk_flask_admin import DateTimeEqualFilter, DateTimeAfterFilter, DateTimeBeforeFilter, DateTimeRangeFilter
 
 
 Base = declarative_base()
@@ -232,6 +232,84 @@ class TestDateTimeBeforeFilter:
         assert filter_instance.operation() == "before"
 
 
+class TestDateTimeRangeFilter:
+    """Tests for DateTimeRangeFilter with second-level precision."""
+
+    def test_second_level_precision_includes_all_of_the_end_second(self, db_session):
+        """Test that a range to a second matches every record within that second."""
+        column = DateTimeTestModel.created_at
+        filter_instance = DateTimeRangeFilter(column, 'Created At')
+
+        value = filter_instance.clean("2024-01-15 10:30:45 to 2024-01-15 10:30:45")
+        results = filter_instance.apply(db_session.query(DateTimeTestModel), value).all()
+
+        # Same as DateTimeEqualFilter: the 4 records within 10:30:45 (0.0, 0.1, 0.5, 0.999999)
+        assert len(results) == 4
+
+    def test_range_includes_start_second(self, db_session):
+        """Test that the start second is included, unlike with DateTimeAfterFilter."""
+        column = DateTimeTestModel.created_at
+        filter_instance = DateTimeRangeFilter(column, 'Created At')
+
+        value = filter_instance.clean("2024-01-15 10:30:44 to 2024-01-15 10:30:46")
+        results = filter_instance.apply(db_session.query(DateTimeTestModel), value).all()
+
+        # 1 sec before, the 4 records within 10:30:45 and 1 sec later; not 2 sec later
+        assert len(results) == 6
+
+    def test_microsecond_end_is_exact(self, db_session):
+        """Test that an end with microseconds includes only up to that instant."""
+        column = DateTimeTestModel.created_at
+        filter_instance = DateTimeRangeFilter(column, 'Created At')
+
+        start = datetime(2024, 1, 15, 10, 30, 45)
+        results = filter_instance.apply(
+            db_session.query(DateTimeTestModel), [start, start + timedelta(microseconds=100000)]
+        ).all()
+
+        assert len(results) == 2
+
+    def test_single_half_open_predicate(self, db_session):
+        """Test that the range is one `>= AND <` predicate rather than BETWEEN or two filters."""
+        column = DateTimeTestModel.created_at
+        filter_instance = DateTimeRangeFilter(column, 'Created At')
+
+        value = filter_instance.clean("2024-01-15 10:30:44 to 2024-01-15 10:30:46")
+        sql = str(filter_instance.apply(db_session.query(DateTimeTestModel), value).statement)
+
+        assert "BETWEEN" not in sql
+        assert "WHERE test_model.created_at >= :created_at_1 AND test_model.created_at < :created_at_2" in sql
+
+    def test_validates_order_and_format(self):
+        """Test that the end must not be before the start, and at least one end must be given."""
+        filter_instance = DateTimeRangeFilter(DateTimeTestModel.created_at, 'Created At')
+
+        assert filter_instance.validate("2024-01-15 10:30:44 to 2024-01-15 10:30:44")
+        assert filter_instance.validate("2024-01-15 10:30:44 to")
+        assert filter_instance.validate("to 2024-01-15 10:30:44")
+        assert not filter_instance.validate("2024-01-15 10:30:45 to 2024-01-15 10:30:44")
+        assert not filter_instance.validate(" to ")
+        assert not filter_instance.validate("2024-01-15 to 2024-01-16")
+
+    def test_open_ended_ranges(self, db_session):
+        """Test that a range with only a start or an end is open at the other end."""
+        filter_instance = DateTimeRangeFilter(DateTimeTestModel.created_at, 'Created At')
+        query = db_session.query(DateTimeTestModel)
+
+        from_start = filter_instance.apply(query, filter_instance.clean("2024-01-15 10:30:46 to")).all()
+        to_end = filter_instance.apply(query, filter_instance.clean("to 2024-01-15 10:30:44")).all()
+
+        assert from_start and all(record.created_at >= datetime(2024, 1, 15, 10, 30, 46) for record in from_start)
+        assert to_end and all(record.created_at < datetime(2024, 1, 15, 10, 30, 45) for record in to_end)
+        assert len(from_start) + len(to_end) + 4 == query.count()
+
+    def test_operation_name(self):
+        """Test that filter returns correct operation name."""
+        filter_instance = DateTimeRangeFilter(DateTimeTestModel.created_at, 'Created At')
+
+        assert filter_instance.operation() == "between"
+
+
 class TestDateTimeFilterIntegration:
     """Integration tests for datetime filters working together."""
 
@@ -0,0 +1,101 @@
+"""Integration tests for deferring the list count to a separate request."""
+import html
+import re
+
+import pytest
+from sqlalchemy import event
+
+from govuk_flask_admin import DEFER_COUNT_COOKIE
+
+
+@pytest.mark.integration
+class TestDeferredCount:
+    """Test GovukModelView.defer_count and the count endpoint."""
+
+    @pytest.fixture
+    def deferred_view(self, user_model_view, monkeypatch):
+        monkeypatch.setattr(user_model_view, "defer_count", True)
+        monkeypatch.setattr(user_model_view, "page_size", 4)
+        return user_model_view
+
+    @pytest.fixture
+    def count_queries(self, db):
+        """Record the COUNT statements run against the database."""
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT COUNT"):
+                statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        yield statements
+        event.remove(db.engine, "before_cursor_execute", record)
+
+    def test_counts_as_usual_without_javascript(self, client, sample_users, deferred_view, count_queries):
+        """Test the first visit (or one without JavaScript) still gets the total and numbered pages."""
+        html_content = client.get("/admin/user/").data.decode("utf-8")
+
+        assert len(count_queries) == 1
+        assert "data-gfa-deferred-count=" not in html_content
+        assert "govuk-pagination__item" in html_content
+        assert f"document.cookie = '{DEFER_COUNT_COOKIE}=1" in html_content
+
+    def test_defers_count_with_javascript(self, client, sample_users, deferred_view, count_queries):
+        """Test list pages skip the count once the script has set its cookie."""
+        client.set_cookie(DEFER_COUNT_COOKIE, "1")
+
+        html_content = client.get("/admin/user/?search=example").data.decode("utf-8")
+
+        assert count_queries == []
+        assert "4 results on this page" in html_content
+        assert "data-gfa-deferred-pagination" in html_content
+        assert 'rel="next"' in html_content
+        assert "Download results as CSV" in html_content
+
+        count_url = html.unescape(re.search(r'data-gfa-deferred-count="([^"]+)"', html_content).group(1))
+        assert count_url.startswith("/admin/user/count/?")
+        assert "search=example" in count_url
+
+    def test_count_endpoint_returns_total_and_pagination(self, client, sample_users, deferred_view):
+        """Test the count endpoint gives the footer text and numbered pagination for the same list."""
+        total = deferred_view.get_count_query().scalar()
+
+        result = client.get("/admin/user/count/?page=1").get_json()
+
+        assert result["count"] == total
+        assert result["text"] == f"{total} results"
+        assert result["num_pages"] == -(-total // 4)
+        assert "govuk-pagination__item--current" in result["pagination"]
+        assert 'href="/admin/user/?page=2' in result["pagination"]
+
+    def test_count_endpoint_applies_search(self, client, sample_users, deferred_view):
+        """Test the count endpoint counts only the rows matching the list's search."""
+        result = client.get("/admin/user/count/?search=user1@example.com").get_json()
+
+        assert result == {
+            "count": 1,
+            "text": "1 result",
+            "estimated": False,
+            "capped": False,
+            "num_pages": 1,
+            "pagination": '<p class="govuk-body"></p>',
+        }
+
+    def test_count_endpoint_uses_count_cap(self, client, sample_users, deferred_view, monkeypatch):
+        """Test the count endpoint describes capped counts and gives open-ended pagination."""
+        monkeypatch.setattr(deferred_view, "count_cap", 5)
+
+        result = client.get("/admin/user/count/").get_json()
+
+        assert result["text"] == "5+ results"
+        assert result["capped"] is True
+        assert "govuk-pagination__item--ellipses" in result["pagination"]
+
+    def test_get_list_outside_a_request_counts_exactly(self, app, sample_users, deferred_view, count_queries):
+        """Test get_list called outside a request (e.g. from a script) reads from the start with an exact count."""
+        with app.app_context():
+            count, rows = deferred_view.get_list(0, None, False, None, [])
+
+        assert count == len(sample_users)
+        assert len(rows) == 4
+        assert len(count_queries) == 1
@@ -1,4 +1,6 @@
 """Integration tests for filtering functionality."""
+import re
+
 import pytest
 
 
@@ -61,6 +63,64 @@ class TestDateFilters:
         # TODO: Verify filter applied correctly
 
 
+@pytest.mark.integration
+class TestDateRangeFilter:
+    """Test the date range filter."""
+
+    def _range_filter(self, view):
+        return next(idx for idx, flt in enumerate(view._filters) if type(flt).__name__ == "DateRangeFilter")
+
+    def test_range_includes_both_days(self, client, user_model_view, sample_users):
+        """Test a range from one day to another includes users created on either day."""
+        idx = self._range_filter(user_model_view)
+        query = "&".join(
+            f"flt0_{idx}-{end}-{part}={value}"
+            for end, date in (("from", (2, 1, 2024)), ("to", (4, 1, 2024)))
+            for part, value in zip(("day", "month", "year"), date)
+        )
+
+        response = client.get(f'/admin/user/?{query}')
+
+        for i in range(1, 4):
+            assert f"user{i}@example.com".encode() in response.data
+        assert b"user0@example.com" not in response.data
+        assert b"user4@example.com" not in response.data
+        assert b"between: 2024-01-02 to 2024-01-04" in response.data
+
+    def test_fieldset_displayed(self, client, user_model_view, sample_users):
+        """Test the range is one fieldset with "From" and "To" date inputs, filled from the active filter."""
+        idx = self._range_filter(user_model_view)
+
+        response = client.get(f'/admin/user/?flt0_{idx}=2024-01-02+to+2024-01-04')
+
+        assert f'name="flt{idx}_{idx}-from-day" type="text" value="02"'.encode() in response.data
+        assert f'name="flt{idx}_{idx}-to-day" type="text" value="04"'.encode() in response.data
+        assert b"Includes this day" in response.data
+
+    def test_range_with_only_a_start(self, client, user_model_view, sample_users):
+        """Test a range from a day with no end includes every user created on or after it."""
+        idx = self._range_filter(user_model_view)
+
+        response = client.get(f'/admin/user/?flt0_{idx}-from-day=3&flt0_{idx}-from-month=1&flt0_{idx}-from-year=2024')
+
+        assert b"user0@example.com" not in response.data
+        assert b"user1@example.com" not in response.data
+        assert b"user2@example.com" in response.data
+        assert b"user9@example.com" in response.data
+        assert f'name="flt{idx}_{idx}-from-day" type="text" value="03"'.encode() in response.data
+
+    def test_range_with_only_an_end(self, client, user_model_view, sample_users):
+        """Test a range to a day with no start includes every user created on or before it."""
+        idx = self._range_filter(user_model_view)
+
+        response = client.get(f'/admin/user/?flt0_{idx}-to-day=2&flt0_{idx}-to-month=1&flt0_{idx}-to-year=2024')
+
+        assert b"user0@example.com" in response.data
+        assert b"user1@example.com" in response.data
+        assert b"user2@example.com" not in response.data
+        assert f'name="flt{idx}_{idx}-to-day" type="text" value="02"'.encode() in response.data
+
+
 @pytest.mark.integration
 class TestIntegerFilters:
     """Test integer filter functionality."""
@@ -117,3 +177,131 @@ class TestFilterUI:
         """Test 'Clear all' link present when filters active."""
         # TODO: Apply filter
         # TODO: Assert clear link present
+
+    def test_filter_given_twice_shows_first_value(self, client, sample_users):
+        """Test a single-value filter given more than once shows its first value in the form."""
+        response = client.get('/admin/user/?flt0_0=30&flt1_0=40')
+
+        assert b'id="flt0_0" name="flt0_0" type="text" value="30"' in response.data
+
+
+def _email_list_filter(view):
+    return next(idx for idx, flt in enumerate(view._filters) if type(flt).__name__ == "FilterInValues")
+
+
+@pytest.mark.integration
+class TestValueListFilter:
+    """Test the "is one of" filter for pasted lists of values."""
+
+    def test_textarea_displayed(self, client, user_model_view, sample_users):
+        """Test the filter without options is a textarea for one value per line."""
+        idx = _email_list_filter(user_model_view)
+
+        response = client.get('/admin/user/')
+
+        assert f'<textarea class="govuk-textarea" id="flt{idx}_{idx}"'.encode() in response.data
+        assert b"One per line, or separated by commas" in response.data
+
+    def test_filter_given_twice_shows_every_value(self, client, user_model_view, sample_users):
+        """Test the textarea shows the values of every list given to the filter."""
+        idx = _email_list_filter(user_model_view)
+
+        response = client.get(f'/admin/user/?flt0_{idx}=user1@example.com&flt1_{idx}=user2@example.com')
+
+        textarea = response.data.split(f'id="flt{idx}_{idx}"'.encode(), 1)[1].split(b"</textarea>", 1)[0]
+        assert b"user1@example.com" in textarea
+        assert b"user2@example.com" in textarea
+
+    def test_filters_by_pasted_list(self, client, user_model_view, sample_users):
+        """Test only users with the listed emails are shown."""
+        idx = _email_list_filter(user_model_view)
+
+        response = client.get(f'/admin/user/?flt0_{idx}=user1@example.com%0D%0Auser3@example.com,nobody@example.com')
+
+        assert b"user1@example.com" in response.data
+        assert b"user3@example.com" in response.data
+        assert b"user2@example.com" not in response.data
+
+    def test_empty_list_is_flashed_as_invalid(self, client, user_model_view, sample_users):
+        """Test a list of only commas and blank lines isn't applied, and is reported as invalid."""
+        idx = _email_list_filter(user_model_view)
+
+        response = client.get('/admin/user/', query_string={f"flt0_{idx}": ",\n , \n"})
+
+        assert response.status_code == 200
+        assert len(set(re.findall(r'href="/admin/user/edit/\?id=(\d+)&', response.data.decode("utf-8")))) == 10
+        assert "Invalid Filter Value" in response.data.decode("utf-8")
+
+    def test_long_lists_bound_as_one_parameter(self, client, user_model_view, sample_users, monkeypatch):
+        """Test a list longer than max_bound_values finds the same users."""
+        idx = _email_list_filter(user_model_view)
+        monkeypatch.setattr(user_model_view._filters[idx], "max_bound_values", 10)
+        emails = [f"user{i}@example.com" for i in range(2, 1000)]
+
+        response = client.get('/admin/user/', query_string={f"flt0_{idx}": "\n".join(emails)})
+
+        assert b"user2@example.com" in response.data
+        assert b"user9@example.com" in response.data
+        assert b"user1@example.com" not in response.data
+
+    def test_filter_form_is_posted(self, client, user_model_view, sample_users):
+        """Test views with value-list filters post the filter form, to keep long lists out of the URL."""
+        response = client.get('/admin/user/')
+
+        assert b'<form id="filter_form" method="POST" action="/admin/user/filter/">' in response.data
+
+    def test_posted_filters_redirect_to_the_list(self, client, user_model_view, sample_users):
+        """Test the posted form redirects to the list with its filters, leaving out blank fields."""
+        idx = _email_list_filter(user_model_view)
+
+        response = client.post(
+            '/admin/user/filter/', data={f"flt0_{idx}": "user1@example.com\nuser3@example.com", "search": ""}
+        )
+
+        assert response.status_code == 302
+        assert response.location == f"/admin/user/?flt0_{idx}=user1@example.com%0Auser3@example.com"
+
+    def test_long_posted_lists_are_kept_out_of_links(self, client, user_model_view, sample_users):
+        """Test a long list is stored, and the list's links (including each row's return URL) carry its token."""
+        idx = _email_list_filter(user_model_view)
+        emails = [f"user{i}@example.com" for i in range(1, 200)]
+
+        response = client.post('/admin/user/filter/', data={f"flt0_{idx}": "\n".join(emails), "sort": "1"})
+        token = user_model_view.value_list_store.put("\n".join(emails))
+
+        assert response.location == f"/admin/user/?flt0_{idx}={token}&sort=1"
+
+        html_content = client.get(response.location).data.decode("utf-8")
+        edit_links = re.findall(r'href="(/admin/user/edit/\?id=(\d+)&[^"]+)"', html_content)
+
+        assert len({row_id for _link, row_id in edit_links}) == 9
+        assert all(token in link and "user2" not in link for link, _row_id in edit_links)
+        assert "user2@example.com" in html_content.split(f'id="flt{idx}_{idx}"', 1)[1]
+
+    def test_expired_lists_are_flashed(self, client, user_model_view, sample_users):
+        """Test a token whose list can't be found isn't applied, and asks for the list again."""
+        idx = _email_list_filter(user_model_view)
+
+        response = client.get('/admin/user/', query_string={f"flt0_{idx}": "@" + "0" * 24})
+
+        assert len(set(re.findall(r'href="/admin/user/edit/\?id=(\d+)&', response.data.decode("utf-8")))) == 10
+        assert "The list of values for Email has expired. Enter it again." in response.data.decode("utf-8")
+
+    def test_filter_form_is_a_get_without_a_store(self, client, user_model_view, sample_users, monkeypatch):
+        """Test views without a value_list_store keep the GET filter form, and have no filter endpoint."""
+        monkeypatch.setattr(user_model_view, "value_list_store", None)
+
+        assert b'<form id="filter_form" method="GET"' in client.get('/admin/user/').data
+        assert client.post('/admin/user/filter/').status_code == 404
+
+    def test_options_displayed_as_multiple_select(self, app):
+        """Test a filter with options is a multiple select-with-search with the active values selected."""
+        macros = app.jinja_env.get_template("admin/model/layout.html").module
+        flt = {"index": 0, "type": "value-list", "operation": "is one of", "options": [("RED", "red"), ("BLUE", "blue")]}
+
+        with app.test_request_context('/admin/user/'):
+            html = str(macros.render_filter_input(flt, "flt0_0", "RED\nBLUE", []))
+
+        assert 'data-module="select-with-search"' in html
+        assert "multiple" in html
+        assert html.count("selected") == 2
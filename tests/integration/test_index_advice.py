@@ -0,0 +1,59 @@
+"""Integration tests for the index-advice command and startup report."""
+import logging
+
+import pytest
+from flask import Flask
+
+from govuk_flask_admin import GovukFlaskAdmin
+
+
+@pytest.mark.integration
+class TestIndexAdviceCommand:
+    """Test `flask govuk-flask-admin index-advice`."""
+
+    def test_lists_advice(self, app):
+        """Test the command prints a CREATE INDEX statement for unindexed columns."""
+        result = app.test_cli_runner().invoke(args=["govuk-flask-admin", "index-advice"])
+
+        assert result.exit_code == 0
+        assert "CREATE INDEX ix_post_author_id ON post (author_id);" in result.output
+
+    def test_check_fails_when_indexes_are_missing(self, app):
+        """Test --check exits non-zero when there is advice, e.g. to fail a CI job."""
+        result = app.test_cli_runner().invoke(args=["govuk-flask-admin", "index-advice", "--check"])
+
+        assert result.exit_code == 1
+
+    def test_check_passes_without_views(self):
+        """Test --check succeeds when nothing needs an index."""
+        app = Flask(__name__)
+        GovukFlaskAdmin(app)
+
+        result = app.test_cli_runner().invoke(args=["govuk-flask-admin", "index-advice", "--check"])
+
+        assert result.exit_code == 0
+        assert "Every filter, sort and search column has an index." in result.output
+
+
+@pytest.mark.integration
+class TestIndexAdviceLogging:
+    """Test GovukFlaskAdmin(index_advice=True)."""
+
+    def test_logged_once_on_first_request(self, app, caplog):
+        """Test advice is logged on the first request only."""
+        test_app = Flask(__name__)
+        GovukFlaskAdmin(test_app, index_advice=True)
+        test_app.extensions["admin"] = app.extensions["admin"]
+
+        @test_app.route("/")
+        def index():
+            return ""
+
+        with caplog.at_level(logging.WARNING, logger=test_app.logger.name):
+            test_app.test_client().get("/")
+            first = len(caplog.records)
+            test_app.test_client().get("/")
+
+        assert first > 0
+        assert len(caplog.records) == first
+        assert any("ix_post_author_id" in record.getMessage() for record in caplog.records)
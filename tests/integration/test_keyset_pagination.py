@@ -0,0 +1,200 @@
+"""Integration tests for keyset pagination."""
+import datetime
+import html
+import re
+import uuid
+
+import pytest
+from sqlalchemy import Uuid, select
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
+from app import _create_app
+from govuk_flask_admin import GovukModelView
+from govuk_flask_admin.pagination import KeysetCursor
+
+
+def _ids(response):
+    return [int(pk) for pk in re.findall(r'href="/admin/user/edit/\?id=(\d+)&', response.data.decode("utf-8"))]
+
+
+def _link(response, rel):
+    match = re.search(rf'href="([^"]*)" rel="{rel}"', response.data.decode("utf-8"))
+    return html.unescape(match.group(1)) if match else None
+
+
+@pytest.mark.integration
+class TestKeysetPagination:
+    """Test GovukModelView.keyset_pagination."""
+
+    @pytest.fixture
+    def keyset_users(self, db, app):
+        """Create users with repeated ages, returning every user's id in order."""
+        from tests.conftest import User, FavouriteColour
+
+        with app.app_context():
+            users = [
+                User(
+                    email=f"keyset{i:02d}@example.com",
+                    name=f"Keyset User {i}",
+                    age=20 + (i % 4),
+                    job="Tester",
+                    favourite_colour=list(FavouriteColour)[i % 3],
+                    created_at=datetime.date(2024, 1, 1),
+                    last_logged_in_at=None if i % 5 == 0 else datetime.datetime(2024, 1, 1) + datetime.timedelta(hours=i % 7),
+                )
+                for i in range(40)
+            ]
+            db.session.add_all(users)
+            db.session.commit()
+            yield db.session.scalars(select(User.id).order_by(User.id)).all()
+
+            db.session.query(User).delete()
+            db.session.commit()
+
+    @pytest.fixture
+    def keyset_view(self, user_model_view, monkeypatch):
+        monkeypatch.setattr(user_model_view, "keyset_pagination", True)
+        return user_model_view
+
+    def _walk(self, client, url):
+        """Follow next links from `url`, then previous links back, returning the pages seen each way."""
+        forwards = []
+        while url:
+            response = client.get(url)
+            assert response.status_code == 200
+            forwards.append((url, _ids(response)))
+            last, url = url, _link(response, "next")
+
+        backwards = []
+        url = last
+        while url:
+            response = client.get(url)
+            backwards.append(_ids(response))
+            url = _link(response, "prev")
+
+        return [ids for _url, ids in forwards], backwards[::-1]
+
+    def test_walks_every_row_once_in_default_order(self, client, keyset_users, keyset_view):
+        """Test next links visit every row exactly once, and previous links return the same pages."""
+        forwards, backwards = self._walk(client, "/admin/user/")
+
+        assert [len(page) for page in forwards[:-1]] == [15] * (len(forwards) - 1)
+        assert sum(forwards, []) == keyset_users
+        assert backwards == forwards
+
+    @pytest.mark.parametrize("column", ["age", "last_logged_in_at"])
+    @pytest.mark.parametrize("desc", [False, True])
+    def test_walks_every_row_once_when_sorted(self, client, app, keyset_users, keyset_view, column, desc):
+        """Test sorting on a column with ties (and NULLs) still visits every row exactly once."""
+        sort = [name for name, _label in keyset_view._list_columns].index(column)
+        url = f"/admin/user/?sort={sort}" + ("&desc=1" if desc else "")
+
+        forwards, backwards = self._walk(client, url)
+
+        seen = sum(forwards, [])
+        assert sorted(seen) == sorted(keyset_users)
+        assert len(seen) == len(set(seen))
+        assert backwards == forwards
+
+    def test_skips_count_query(self, client, keyset_users, keyset_view):
+        """Test the total isn't shown, and the footer counts the rows on this page."""
+        response = client.get("/admin/user/")
+        html_content = response.data.decode("utf-8")
+
+        assert "15 results on this page" in html_content
+        assert "Download results as CSV" in html_content
+
+    def test_pagination_is_previous_next_only(self, client, keyset_users, keyset_view):
+        """Test keyset pages get block-style previous/next links without page numbers."""
+        response = client.get(_link(client.get("/admin/user/"), "next"))
+        html_content = response.data.decode("utf-8")
+
+        assert 'rel="prev"' in html_content
+        assert 'rel="next"' in html_content
+        assert "govuk-pagination__item" not in html_content
+
+    def test_sort_links_drop_the_cursor(self, client, keyset_users, keyset_view):
+        """Test changing the sort starts from the first page rather than reusing the cursor."""
+        response = client.get(_link(client.get("/admin/user/"), "next"))
+        html_content = html.unescape(response.data.decode("utf-8"))
+
+        sort_links = re.findall(r'href="(/admin/user/\?[^"]*sort=[^"]*)"', html_content)
+        assert sort_links
+        assert not any("cursor=" in link for link in sort_links)
+
+    def test_invalid_cursor_shows_first_page(self, client, keyset_users, keyset_view):
+        """Test a garbled cursor falls back to the first page."""
+        response = client.get("/admin/user/?page=3&cursor=garbage")
+
+        assert response.status_code == 200
+        assert _ids(response) == keyset_users[:15]
+        assert 'rel="prev"' not in response.data.decode("utf-8")
+
+    def test_export_ignores_cursor(self, client, keyset_users, keyset_view):
+        """Test exports read from the start, even from a later keyset page."""
+        next_url = _link(client.get("/admin/user/"), "next")
+        response = client.get("/admin/user/export/csv/?" + next_url.split("?", 1)[1])
+
+        assert response.status_code == 200
+        rows = response.data.decode("utf-8").strip().splitlines()[1:]
+        assert len(rows) == len(keyset_users)
+
+
+class KeysetNoteBase(DeclarativeBase):
+    pass
+
+
+class KeysetNote(KeysetNoteBase):
+    __tablename__ = "keyset_note"
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    title: Mapped[str]
+
+
+@pytest.mark.integration
+class TestKeysetPaginationNonIntegerKeys:
+    """Test keyset pagination on a model with a UUID primary key."""
+
+    @pytest.fixture
+    def note_client(self, tmp_path):
+        """A client for a separate demo app with a keyset-paginated view of notes, and the notes' ids in order."""
+        app, db, admin = _create_app({"SQLALCHEMY_ENGINES": {"default": f"sqlite:///{tmp_path / 'notes.sqlite'}"}})
+
+        class NoteView(GovukModelView):
+            keyset_pagination = True
+            page_size = 3
+
+        with app.app_context():
+            KeysetNoteBase.metadata.create_all(db.engine)
+            db.session.add_all(KeysetNote(title=f"Note {i}") for i in range(7))
+            db.session.commit()
+            ids = sorted(str(pk) for pk in db.session.scalars(select(KeysetNote.id)))
+
+            admin.add_view(NoteView(KeysetNote, db.session, name="Keyset note", endpoint="keyset_note"))
+
+        return app.test_client(), ids
+
+    def _note_ids(self, response):
+        return re.findall(r'href="/admin/keyset_note/edit/\?id=([0-9a-f-]{36})&', response.data.decode("utf-8"))
+
+    def test_next_page_follows_cursor(self, note_client):
+        """Test the cursor's UUID, encoded as a string, finds the boundary row for the next page."""
+        client, ids = note_client
+
+        first = client.get("/admin/keyset_note/")
+        response = client.get(_link(first, "next"))
+
+        assert response.status_code == 200
+        assert self._note_ids(first) == ids[:3]
+        assert self._note_ids(response) == ids[3:6]
+
+    @pytest.mark.parametrize("pk", [5, "not-a-uuid"])
+    def test_cursor_of_the_wrong_type_shows_first_page(self, note_client, pk):
+        """Test a crafted cursor whose key isn't a UUID falls back to the first page."""
+        client, ids = note_client
+
+        response = client.get("/admin/keyset_note/", query_string={"page": 1, "cursor": KeysetCursor("next", pk).encode()})
+
+        assert response.status_code == 200
+        assert self._note_ids(response) == ids[:3]
+        assert 'rel="prev"' not in response.data.decode("utf-8")
@@ -0,0 +1,82 @@
+"""Integration tests for relationship filters whose options are looked up as you type."""
+import re
+
+import pytest
+
+from app import Post, User
+from govuk_flask_admin import FilterRelated
+
+
+@pytest.fixture
+def post_view(admin_instance):
+    view = next(view for view in admin_instance._views if view.name == "Post")
+    # The view's session outlives tests, and SQLite reuses the ids of deleted users; don't label options from stale ones.
+    view.session.expire_all()
+    return view
+
+
+@pytest.fixture
+def author_filter(post_view):
+    return next(idx for idx, flt in enumerate(post_view._filters) if isinstance(flt, FilterRelated))
+
+
+@pytest.mark.integration
+class TestFilterLookup:
+    """Test the view's filter_lookup endpoint."""
+
+    def test_pages_of_options(self, client, post_view, author_filter, sample_users, monkeypatch):
+        """Test options come a page at a time, saying whether there are more."""
+        monkeypatch.setattr(post_view._filters[author_filter], "page_size", 4)
+
+        url = f"/admin/post/filter-lookup/?filter={author_filter}&q=Test+User"
+
+        pages = [client.get(f"{url}&page={page}").get_json() for page in range(3)]
+
+        assert [page["more"] for page in pages] == [True, True, False]
+        assert [option["value"] for page in pages for option in page["results"]] == sorted(user.id for user in sample_users)
+        assert pages[0]["results"][0]["label"] == "Test User 0 (user0@example.com)"
+
+    def test_every_word_must_match(self, client, author_filter, sample_users):
+        """Test each word of the search matches one of the search fields."""
+        response = client.get(f"/admin/post/filter-lookup/?filter={author_filter}&q=user3@ test")
+
+        assert [option["label"] for option in response.get_json()["results"]] == ["Test User 3 (user3@example.com)"]
+
+    def test_only_lookup_filters(self, client, author_filter):
+        """Test other filters and unknown indexes aren't found."""
+        assert client.get("/admin/post/filter-lookup/?filter=0").status_code == 404
+        assert client.get(f"/admin/post/filter-lookup/?filter={author_filter + 1}").status_code == 404
+        assert client.get("/admin/post/filter-lookup/").status_code == 404
+
+
+@pytest.mark.integration
+class TestFilterRelatedList:
+    """Test lists filtered by a related object."""
+
+    def test_renders_only_the_chosen_option(self, client, author_filter, sample_users):
+        """Test the filter form's select has the chosen author and a blank option, not every user."""
+        author = sample_users[2]
+
+        response = client.get(f"/admin/post/?flt0_{author_filter}={author.id}")
+        html = response.data.decode()
+        select = re.search(rf'<select[^>]*id="flt{author_filter}_{author_filter}".*?</select>', html, re.S).group(0)
+
+        assert f'data-lookup-url="/admin/post/filter-lookup/?filter={author_filter}"' in select
+        assert re.findall(r"<option[^>]*>([^<]*)</option>", select) == ["", "Test User 2 (user2@example.com)"]
+        assert "is: Test User 2 (user2@example.com)" in html
+
+    def test_filters_by_the_chosen_object(self, app, db, post_view, author_filter, sample_users):
+        """Test only the chosen author's posts are listed."""
+        author = sample_users[2]
+
+        with app.test_request_context(f"/admin/post/?flt0_{author_filter}={author.id}"):
+            count, posts = post_view.get_list(0, None, None, None, post_view._get_list_filter_args())
+
+        assert count == db.session.query(Post).filter_by(author_id=author.id).count()
+        assert {post.author_id for post in posts} == {author.id}
+
+    def test_unknown_object_shows_value(self, client, author_filter, sample_users):
+        """Test a value with no matching object still shows as a filter, with its value."""
+        response = client.get(f"/admin/post/?flt0_{author_filter}=999999")
+
+        assert b"is: 999999" in response.data
@@ -0,0 +1,199 @@
+"""Integration tests for full-text search backends."""
+import datetime
+
+import pytest
+from sqlalchemy import delete, select
+
+from app import Post, User
+from govuk_flask_admin import GovukModelView
+from govuk_flask_admin.search import LikeSearch, SQLiteFTS5Search, _search_indexes
+
+
+@pytest.fixture
+def fts_view(app, db):
+    """A Post view searching an FTS5 index, with the index built."""
+
+    class PostFTSView(GovukModelView):
+        column_searchable_list = ["title", "content"]
+        search_backend = SQLiteFTS5Search()
+
+    backend = PostFTSView.search_backend
+    with app.app_context():
+        view = PostFTSView(Post, db.session, name="Post FTS", endpoint="post_fts")
+        backend.reindex(db.session)
+        db.session.commit()
+
+    yield view
+
+    _search_indexes.discard(backend)
+    with app.app_context():
+        db.session.execute(delete(backend.table))
+        db.session.commit()
+
+
+def _search(app, view, search):
+    with app.test_request_context("/admin/post_fts/"):
+        count, posts = view.get_list(0, None, False, search, None, page_size=100)
+        return count, sorted(post.id for post in posts)
+
+
+@pytest.mark.integration
+class TestSQLiteFTS5Search:
+    """Test searching with SQLiteFTS5Search."""
+
+    @pytest.mark.parametrize("search", ["written", "User 3", "Post 2 by", "content USER"])
+    def test_whole_words_match_like_search(self, app, fts_view, sample_users, monkeypatch, search):
+        """Test whole-word searches find the same posts as Flask-Admin's LIKE search."""
+        fts_count, fts_ids = _search(app, fts_view, search)
+
+        monkeypatch.setattr(fts_view, "search_backend", LikeSearch())
+        like_count, like_ids = _search(app, fts_view, search)
+
+        assert fts_ids
+        assert (fts_count, fts_ids) == (like_count, like_ids)
+
+    def test_word_prefixes_match(self, app, fts_view, sample_users):
+        """Test a search term matches words it starts."""
+        assert _search(app, fts_view, "writ")[0] == _search(app, fts_view, "written")[0] > 0
+        assert _search(app, fts_view, "ritten")[0] == 0
+
+    def test_query_syntax_is_taken_literally(self, app, fts_view, sample_users):
+        """Test FTS5 operators and quotes in the search box don't cause errors."""
+        for search in ['"', "NOT post", "title:post", "post*", "(", "a OR"]:
+            _search(app, fts_view, search)
+
+    def test_index_follows_orm_changes(self, app, db, fts_view, sample_users):
+        """Test added, changed and deleted posts are reflected in the index when the session flushes."""
+        with app.app_context():
+            post = Post(
+                title="Quarterly zeppelin report",
+                content="",
+                author_id=sample_users[0].id,
+                created_at=datetime.datetime(2024, 1, 1),
+            )
+            db.session.add(post)
+            db.session.commit()
+            post_id = post.id
+
+            assert _search(app, fts_view, "zeppelin") == (1, [post_id])
+
+            db.session.get(Post, post_id).title = "Quarterly airship report"
+            db.session.commit()
+
+            assert _search(app, fts_view, "zeppelin")[0] == 0
+            assert _search(app, fts_view, "airship") == (1, [post_id])
+
+            db.session.delete(db.session.get(Post, post_id))
+            db.session.commit()
+
+            assert _search(app, fts_view, "airship")[0] == 0
+
+    def test_bulk_deletes_remove_index_rows(self, app, db, fts_view, sample_users):
+        """Test index rows of posts removed by an ORM bulk delete are removed when the session commits."""
+        table = fts_view.search_backend.table
+
+        with app.app_context():
+            db.session.execute(delete(Post).where(Post.author_id == sample_users[0].id))
+            db.session.commit()
+
+            indexed = set(db.session.scalars(select(table.c.rowid)))
+            assert indexed == set(db.session.scalars(select(Post.id)))
+
+    def test_reindex_command(self, app, db, admin_instance, fts_view, sample_users, monkeypatch):
+        """Test `reindex-search` rebuilds the index of views with a search index."""
+        monkeypatch.setattr(admin_instance, "_views", [*admin_instance._views, fts_view])
+
+        with app.app_context():
+            db.session.execute(delete(fts_view.search_backend.table))
+            db.session.commit()
+        assert _search(app, fts_view, "written")[0] == 0
+
+        result = app.test_cli_runner().invoke(args=["govuk-flask-admin", "reindex-search"])
+
+        with app.app_context():
+            posts = db.session.query(Post).count()
+        assert result.exit_code == 0, result.output
+        assert f"Indexed {posts} rows of Post FTS in post_search" in result.output
+        assert _search(app, fts_view, "written")[0] == posts
+
+
+@pytest.fixture
+def unindexed_view(app, db):
+    """A Post view searching an FTS5 index that `reindex-search` hasn't created yet."""
+
+    class PostUnindexedView(GovukModelView):
+        column_searchable_list = ["title", "content"]
+        search_backend = SQLiteFTS5Search(table_name="post_search_unindexed")
+
+    backend = PostUnindexedView.search_backend
+    with app.app_context():
+        yield PostUnindexedView(Post, db.session, name="Post unindexed", endpoint="post_fts")
+
+    _search_indexes.discard(backend)
+
+
+@pytest.mark.integration
+class TestSearchIndexNotYetCreated:
+    """Test views with a search index whose table hasn't been created yet."""
+
+    def test_changes_are_saved_with_a_warning(self, app, db, sample_users, unindexed_view):
+        """Test committing changes to the model still works, warning that they aren't indexed."""
+        with app.app_context():
+            post = Post(title="Unindexed post", content="", author_id=sample_users[0].id, created_at=datetime.datetime(2024, 1, 1))
+            db.session.add(post)
+            with pytest.warns(UserWarning, match="reindex-search"):
+                db.session.commit()
+
+            assert db.session.scalar(select(Post.id).where(Post.title == "Unindexed post")) == post.id
+
+    def test_search_falls_back_to_like_search(self, app, sample_users, unindexed_view, monkeypatch):
+        """Test searches find what Flask-Admin's LIKE search finds, warning that the index is missing."""
+        with pytest.warns(UserWarning, match="post_search_unindexed"):
+            unindexed = _search(app, unindexed_view, "written")
+
+        monkeypatch.setattr(unindexed_view, "search_backend", LikeSearch())
+
+        assert unindexed[0] > 0
+        assert unindexed == _search(app, unindexed_view, "written")
+
+
+@pytest.mark.integration
+class TestColumnSearchModes:
+    """Test searching with per-column search modes."""
+
+    @pytest.fixture
+    def user_view(self, app, db):
+        class UserSearchView(GovukModelView):
+            column_searchable_list = ["email", "name", "age"]
+            column_search_modes = {"email": "casefold", "name": "prefix", "age": "exact"}
+
+        with app.app_context():
+            return UserSearchView(User, db.session, name="User search", endpoint="user_search")
+
+    def _emails(self, app, view, search):
+        with app.test_request_context("/admin/user_search/"):
+            _count, users = view.get_list(0, None, False, search, None, page_size=100)
+            return sorted(user.email for user in users)
+
+    def test_prefix(self, app, user_view, sample_users):
+        """Test prefix columns only match values starting with the search."""
+        assert len(self._emails(app, user_view, "Test")) == len(sample_users)
+        assert self._emails(app, user_view, "User") == []
+
+    def test_casefold(self, app, user_view, sample_users):
+        """Test casefold columns match whole values in any case."""
+        assert self._emails(app, user_view, "USER1@Example.com") == ["user1@example.com"]
+        assert self._emails(app, user_view, "user1") == []
+
+    def test_exact_number(self, app, user_view, sample_users):
+        """Test exact number columns match the number, and words don't break the search."""
+        assert self._emails(app, user_view, "25") == ["user5@example.com"]
+        assert self._emails(app, user_view, "twenty") == []
+
+    def test_hint_shows_modes(self, client, sample_users, monkeypatch, user_model_view):
+        """Test the search box's hint says how columns are matched."""
+        monkeypatch.setattr(user_model_view, "column_search_modes", {"email": "prefix"})
+
+        response = client.get("/admin/user/")
+
+        assert "In email (starts with), name" in response.data.decode("utf-8")
@@ -0,0 +1,230 @@
+"""Integration tests for GOV.UK asset delivery from GovukFlaskAdmin."""
+import pytest
+from flask import Flask
+from flask_admin import Admin
+from flask_sqlalchemy_lite import SQLAlchemy
+from jinja2 import ChoiceLoader, PackageLoader, PrefixLoader
+
+from app import Base, Post, User
+from govuk_flask_admin import GovukFlaskAdmin, GovukFrontendTheme, GovukModelView
+
+
+def make_app(**govuk_flask_admin_kwargs):
+    """Create a minimal admin app with the given GovukFlaskAdmin options."""
+    app = Flask(__name__)
+    app.config["SECRET_KEY"] = "test-secret"
+    app.config["TESTING"] = True
+    app.config["SQLALCHEMY_ENGINES"] = {"default": "sqlite:///:memory:"}
+    app.jinja_options = {
+        "loader": ChoiceLoader([
+            PrefixLoader({"govuk_frontend_jinja": PackageLoader("govuk_frontend_jinja")}),
+            PrefixLoader({"govuk_frontend_wtf": PackageLoader("govuk_frontend_wtf")}),
+            PackageLoader("govuk_flask_admin"),
+        ])
+    }
+
+    admin = Admin(app, theme=GovukFrontendTheme())
+    GovukFlaskAdmin(app, service_name="Test Service", **govuk_flask_admin_kwargs)
+    db = SQLAlchemy(app)
+
+    with app.app_context():
+        Base.metadata.create_all(db.engine)
+        admin.add_view(GovukModelView(User, db.session))
+
+    return app
+
+
+@pytest.mark.integration
+class TestPreloadHeaders:
+    """Test preload Link headers on admin pages."""
+
+    def test_admin_page_has_preload_links(self, client):
+        """Test admin pages preload the main CSS, JS and fonts."""
+        response = client.get('/admin/user/')
+        assert response.status_code == 200
+
+        link = response.headers["Link"]
+        assert "rel=preload; as=style" in link
+        assert "rel=modulepreload" in link
+        assert 'as=font; type="font/woff2"; crossorigin' in link
+
+    def test_static_assets_have_no_preload_links(self, client, app):
+        """Test non-page responses don't get preload headers."""
+        css_url = app.extensions["govuk_flask_admin"].manifest.entry_file("src/assets/main.scss")
+        response = client.get(f"/_govuk_flask_admin/{css_url.split('/')[-1]}")
+
+        assert response.status_code == 200
+        assert "Link" not in response.headers
+
+    def test_preload_can_be_disabled(self):
+        """Test preload_assets=False leaves responses alone."""
+        client = make_app(preload_assets=False).test_client()
+        response = client.get('/admin/user/')
+
+        assert response.status_code == 200
+        assert "Link" not in response.headers
+
+
+@pytest.mark.integration
+class TestEarlyHints:
+    """Test 103 Early Hints for admin views."""
+
+    def test_sends_early_hints_when_server_supports_it(self):
+        """Test the preload links are passed to the server's early hints callable."""
+        client = make_app(early_hints=True).test_client()
+        hints = []
+
+        response = client.get('/admin/user/', environ_base={"wsgi.early_hints": hints.append})
+
+        assert response.status_code == 200
+        assert len(hints) == 1
+        assert hints[0] == [("Link", response.headers["Link"])]
+
+    def test_no_early_hints_for_non_admin_endpoints(self):
+        """Test early hints are only sent for admin views."""
+        app = make_app(early_hints=True)
+        hints = []
+
+        app.test_client().get('/_govuk_flask_admin/missing.css', environ_base={"wsgi.early_hints": hints.append})
+
+        assert hints == []
+
+    def test_early_hints_off_by_default(self):
+        """Test nothing is sent unless early_hints is enabled."""
+        client = make_app().test_client()
+        hints = []
+
+        client.get('/admin/user/', environ_base={"wsgi.early_hints": hints.append})
+
+        assert hints == []
+
+
+@pytest.mark.integration
+class TestExternalAssetHost:
+    """Test serving the asset bundle from an external host."""
+
+    def test_page_uses_external_asset_urls(self):
+        """Test CSS, JS, assetPath and preload links all point at the external host."""
+        client = make_app(assets_url="https://cdn.example.com/gfa/").test_client()
+        response = client.get('/admin/user/')
+        html = response.data.decode('utf-8')
+
+        assert response.status_code == 200
+        assert 'href="https://cdn.example.com/gfa/main-' in html
+        assert 'src="https://cdn.example.com/gfa/main-' in html
+        assert 'https://cdn.example.com/gfa/assets/' in html
+        assert '/_govuk_flask_admin/' not in html
+        assert "</_govuk_flask_admin/" not in response.headers["Link"]
+
+    def test_default_uses_static_route(self, client):
+        """Test assets are served by the app when no external host is set."""
+        html = client.get('/admin/user/').data.decode('utf-8')
+
+        assert 'href="/_govuk_flask_admin/main-' in html
+
+
+@pytest.mark.integration
+class TestExportAssetsCommand:
+    """Test the `flask govuk-flask-admin export-assets` command."""
+
+    def test_exports_asset_tree(self, app, tmp_path):
+        """Test the whole dist/assets tree is copied with the static route's layout."""
+        destination = tmp_path / "cdn"
+        result = app.test_cli_runner().invoke(args=["govuk-flask-admin", "export-assets", str(destination)])
+
+        assert result.exit_code == 0, result.output
+        static_assets = app.extensions["govuk_flask_admin"].static_assets
+        for filename in static_assets.assets:
+            assert (destination / filename).is_file()
+        assert "Immutable (content-hashed) files:" in result.output
+
+    def test_clean_removes_stale_files(self, app, tmp_path):
+        """Test --clean clears files left over from a previous export."""
+        destination = tmp_path / "cdn"
+        destination.mkdir()
+        (destination / "stale.css").write_text("old")
+
+        result = app.test_cli_runner().invoke(
+            args=["govuk-flask-admin", "export-assets", str(destination), "--clean"]
+        )
+
+        assert result.exit_code == 0, result.output
+        assert not (destination / "stale.css").exists()
+
+
+@pytest.mark.integration
+class TestPerPageScripts:
+    """Test per-page JS entries are only included where their widgets render."""
+
+    def test_list_page_omits_select_with_search(self, client, sample_users):
+        """Test Choices.js isn't loaded on pages without select-with-search."""
+        html = client.get('/admin/user/').data.decode('utf-8')
+
+        assert 'data-module="select-with-search"' not in html
+        assert 'select-with-search-' not in html
+
+    def test_form_with_select_with_search_includes_entry(self, client, sample_users):
+        """Test pages rendering GovSelectWithSearch include its entry."""
+        html = client.get('/admin/user/new/').data.decode('utf-8')
+
+        assert 'data-module="select-with-search"' in html
+        assert '<script type="module" src="/_govuk_flask_admin/select-with-search-' in html
+
+
+@pytest.mark.integration
+class TestCriticalCss:
+    """Test critical CSS inlining per page template."""
+
+    @pytest.mark.parametrize("url, entry", [
+        ('/admin/user/', "src/assets/critical/list.scss"),
+        ('/admin/user/new/', "src/assets/critical/edit.scss"),
+    ])
+    def test_inlines_critical_css_for_template(self, client, app, sample_users, url, entry):
+        """Test the page's critical CSS is inlined and the full stylesheet is non-blocking."""
+        manifest = app.extensions["govuk_flask_admin"].manifest
+        html = client.get(url).data.decode('utf-8')
+
+        assert f"<style>{manifest.read_entry(entry)}</style>" in html
+        assert 'media="print" data-gfa-async-stylesheet>' in html
+        assert '<noscript><link rel="stylesheet"' in html
+
+    def test_details_page_inlines_critical_css(self, client, app, sample_users, db):
+        """Test the details template gets its own critical CSS."""
+        manifest = app.extensions["govuk_flask_admin"].manifest
+        with app.app_context():
+            post_id = db.session.query(Post).first().id
+
+        html = client.get(f'/admin/post/details/?id={post_id}').data.decode('utf-8')
+
+        assert f"<style>{manifest.read_entry('src/assets/critical/details.scss')}</style>" in html
+
+    def test_other_pages_use_blocking_stylesheet(self, client):
+        """Test templates without critical CSS keep the normal stylesheet link."""
+        html = client.get('/admin/').data.decode('utf-8')
+
+        assert '<link rel="stylesheet" href="/_govuk_flask_admin/main-' in html
+        assert "data-gfa-async-stylesheet" not in html
+
+    def test_critical_css_can_be_disabled(self):
+        """Test critical_css=False keeps the blocking stylesheet everywhere."""
+        html = make_app(critical_css=False).test_client().get('/admin/user/').data.decode('utf-8')
+
+        assert '<link rel="stylesheet" href="/_govuk_flask_admin/main-' in html
+        assert "data-gfa-async-stylesheet" not in html
+
+
+@pytest.mark.integration
+class TestInMemoryAssets:
+    """Test the in_memory_assets option."""
+
+    def test_serves_bundle_from_memory(self):
+        """Test the static route serves the same bytes from the in-memory store."""
+        app = make_app(in_memory_assets=True)
+        static_assets = app.extensions["govuk_flask_admin"].static_assets
+        css_file = app.extensions["govuk_flask_admin"].manifest.entry_file("src/assets/main.scss").split("/")[-1]
+
+        response = app.test_client().get(f"/_govuk_flask_admin/{css_file}")
+
+        assert static_assets.in_memory
+        assert response.status_code == 200
+        assert response.data == static_assets.get(css_file).files[None].data
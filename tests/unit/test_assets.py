@@ -0,0 +1,424 @@
+"""Unit tests for the Vite manifest registry."""
+import gzip
+import json
+import os
+
+import pytest
+
+from govuk_flask_admin import assets
+from govuk_flask_admin.assets import (
+    IMMUTABLE_MAX_AGE,
+    SELECT_WITH_SEARCH_ENTRY,
+    StaticAssets,
+    ViteManifest,
+    require_js_entry,
+    required_js_entries,
+    send_static_asset,
+)
+
+
+def write_manifest(path, css="assets/main-aaaa1111.css", js="assets/main-bbbb2222.js"):
+    path.write_text(
+        json.dumps(
+            {
+                "_shared-dddd4444.js": {"file": "assets/shared-dddd4444.js"},
+                "_choices-eeee5555.js": {"file": "assets/choices-eeee5555.js", "imports": ["_shared-dddd4444.js"]},
+                "src/assets/main.scss": {"file": css, "src": "src/assets/main.scss", "isEntry": True},
+                "src/assets/critical/list.scss": {
+                    "file": "assets/list-gggg7777.css",
+                    "src": "src/assets/critical/list.scss",
+                    "isEntry": True,
+                },
+                "src/assets/main.js": {
+                    "file": js,
+                    "src": "src/assets/main.js",
+                    "isEntry": True,
+                    "imports": ["_shared-dddd4444.js"],
+                },
+                "src/assets/select-with-search.js": {
+                    "file": "assets/select-with-search-ffff6666.js",
+                    "src": "src/assets/select-with-search.js",
+                    "isEntry": True,
+                    "imports": ["_choices-eeee5555.js", "_shared-dddd4444.js"],
+                },
+            }
+        )
+    )
+
+
+@pytest.mark.unit
+class TestViteManifest:
+    """Test ViteManifest parsing and tag caching."""
+
+    @pytest.fixture
+    def manifest_file(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        write_manifest(path)
+        return path
+
+    def test_builds_css_and_js_tags(self, app, manifest_file):
+        """Test tags point at the compiled files via the static endpoint."""
+        manifest = ViteManifest(manifest_file)
+
+        with app.test_request_context("/admin/"):
+            assert 'href="/_govuk_flask_admin/main-aaaa1111.css"' in manifest.css_tag()
+            assert 'src="/_govuk_flask_admin/main-bbbb2222.js"' in manifest.js_tag()
+
+    def test_manifest_parsed_once(self, app, manifest_file, monkeypatch):
+        """Test repeated renders don't re-read the manifest file."""
+        manifest = ViteManifest(manifest_file)
+        loads = []
+        original_load = manifest.load
+        monkeypatch.setattr(manifest, "load", lambda: loads.append(1) or original_load())
+
+        with app.test_request_context("/admin/"):
+            for _ in range(5):
+                manifest.css_tag()
+                manifest.js_tag()
+
+        assert len(loads) == 1
+
+    def test_tags_cached_per_script_root(self, app, manifest_file):
+        """Test tags are cached separately for each script root, but not for each scheme/host."""
+        manifest = ViteManifest(manifest_file)
+
+        with app.test_request_context("/admin/", base_url="http://one.example"):
+            manifest.css_tag()
+        with app.test_request_context("/admin/", base_url="https://two.example"):
+            manifest.css_tag()
+        with app.test_request_context("/admin/", base_url="http://one.example/prefix"):
+            assert 'href="/prefix/_govuk_flask_admin/main-aaaa1111.css"' in manifest.css_tag()
+
+        assert len(manifest._tags) == 2
+
+    def test_tag_cache_is_bounded(self, app, manifest_file, monkeypatch):
+        """Test script roots from request headers can't grow the cache without limit."""
+        monkeypatch.setattr(assets, "MAX_CACHED_TAGS", 3)
+        manifest = ViteManifest(manifest_file)
+
+        for i in range(10):
+            with app.test_request_context("/admin/", base_url=f"http://example.com/prefix{i}"):
+                assert f'href="/prefix{i}/_govuk_flask_admin/' in manifest.css_tag()
+
+        assert len(manifest._tags) == 3
+
+    def test_auto_reload_on_mtime_change(self, app, manifest_file):
+        """Test debug-mode registry picks up a rebuilt manifest."""
+        manifest = ViteManifest(manifest_file, auto_reload=True)
+
+        with app.test_request_context("/admin/"):
+            assert "main-aaaa1111.css" in manifest.css_tag()
+
+            write_manifest(manifest_file, css="assets/main-cccc3333.css")
+            stat = os.stat(manifest_file)
+            os.utime(manifest_file, (stat.st_atime, stat.st_mtime + 10))
+
+            assert "main-cccc3333.css" in manifest.css_tag()
+
+    def test_no_reload_without_auto_reload(self, app, manifest_file):
+        """Test production registry keeps serving the originally parsed manifest."""
+        manifest = ViteManifest(manifest_file)
+
+        with app.test_request_context("/admin/"):
+            manifest.css_tag()
+
+            write_manifest(manifest_file, css="assets/main-cccc3333.css")
+            stat = os.stat(manifest_file)
+            os.utime(manifest_file, (stat.st_atime, stat.st_mtime + 10))
+
+            assert "main-aaaa1111.css" in manifest.css_tag()
+
+    def test_external_base_url(self, app, tmp_path):
+        """Test asset URLs use the external host when configured."""
+        write_manifest(tmp_path / "manifest.json")
+        manifest = ViteManifest(tmp_path / "manifest.json", base_url="https://cdn.example.com/gfa/")
+
+        with app.test_request_context("/admin/"):
+            assert 'href="https://cdn.example.com/gfa/main-aaaa1111.css"' in manifest.css_tag()
+            assert 'src="https://cdn.example.com/gfa/main-bbbb2222.js"' in manifest.js_tag()
+            assert manifest.asset_path() == "https://cdn.example.com/gfa/assets"
+
+    def test_css_tag_inlines_critical_css(self, app, manifest_file):
+        """Test critical CSS is inlined and the main bundle loads without blocking render."""
+        (manifest_file.parent / "assets").mkdir()
+        (manifest_file.parent / "assets" / "list-gggg7777.css").write_text(".govuk-table{width:100%}")
+        manifest = ViteManifest(manifest_file)
+
+        with app.test_request_context("/admin/"):
+            tag = manifest.css_tag("src/assets/critical/list.scss", 'nonce="abc"')
+
+        assert '<style nonce="abc">.govuk-table{width:100%}</style>' in tag
+        assert '<link rel="stylesheet" href="/_govuk_flask_admin/main-aaaa1111.css" media="print"' in tag
+        assert '<script nonce="abc">' in tag
+        assert "link.addEventListener('load', apply)" in tag
+        assert "link.media = 'all'" in tag
+        assert "link.rel" not in tag
+        assert '<noscript><link rel="stylesheet" href="/_govuk_flask_admin/main-aaaa1111.css"></noscript>' in tag
+
+    def test_css_tag_without_built_critical_entry(self, app, manifest_file):
+        """Test templates without a built critical entry get the blocking stylesheet."""
+        manifest = ViteManifest(manifest_file)
+
+        with app.test_request_context("/admin/"):
+            tag = manifest.css_tag("src/assets/critical/edit.scss")
+
+        assert '<link rel="stylesheet" href="/_govuk_flask_admin/main-aaaa1111.css"></link>' in tag
+        assert "<style" not in tag
+
+    def test_js_tag_core_only_by_default(self, app, manifest_file):
+        """Test only the core bundle and its chunks are included by default."""
+        manifest = ViteManifest(manifest_file)
+
+        with app.test_request_context("/admin/"):
+            tag = manifest.js_tag()
+
+        assert tag.count("<script") == 1
+        assert '<link rel="modulepreload" href="/_govuk_flask_admin/shared-dddd4444.js">' in tag
+        assert "choices" not in tag
+        assert "select-with-search" not in tag
+
+    def test_js_tag_with_per_page_entry(self, app, manifest_file):
+        """Test per-page entries add their script and preload their chunks once."""
+        manifest = ViteManifest(manifest_file)
+
+        with app.test_request_context("/admin/"):
+            tag = manifest.js_tag([SELECT_WITH_SEARCH_ENTRY])
+
+        assert tag.count("shared-dddd4444.js") == 1
+        assert '<link rel="modulepreload" href="/_govuk_flask_admin/choices-eeee5555.js">' in tag
+        assert '<script type="module" src="/_govuk_flask_admin/main-bbbb2222.js"></script>' in tag
+        assert '<script type="module" src="/_govuk_flask_admin/select-with-search-ffff6666.js"></script>' in tag
+
+    def test_required_js_entries_tracked_per_request(self, app):
+        """Test entries recorded while rendering don't leak into other requests."""
+        with app.app_context(), app.test_request_context("/admin/"):
+            require_js_entry(SELECT_WITH_SEARCH_ENTRY)
+            assert required_js_entries() == {SELECT_WITH_SEARCH_ENTRY}
+
+        with app.app_context(), app.test_request_context("/admin/"):
+            assert required_js_entries() == set()
+
+    def test_registered_on_app_extensions(self, app):
+        """Test GovukFlaskAdmin exposes its manifest registry on the app."""
+        assert isinstance(app.extensions["govuk_flask_admin"].manifest, ViteManifest)
+
+
+@pytest.mark.unit
+class TestSendStaticAsset:
+    """Test serving precompressed asset variants."""
+
+    @pytest.fixture
+    def assets_dir(self, tmp_path):
+        content = b"body { color: #0b0c0c; }" * 50
+        (tmp_path / "main-aaaa1111.css").write_bytes(content)
+        (tmp_path / "main-aaaa1111.css.gz").write_bytes(gzip.compress(content))
+        (tmp_path / "main-aaaa1111.css.br").write_bytes(b"brotli-bytes")
+        (tmp_path / "bold.woff2").write_bytes(b"woff2")
+        return tmp_path
+
+    def _send(self, app, assets_dir, filename, accept_encoding=None):
+        headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+        with app.test_request_context(f"/_govuk_flask_admin/{filename}", headers=headers):
+            response = send_static_asset(assets_dir, filename)
+            response.direct_passthrough = False
+            return response
+
+    def test_prefers_brotli(self, app, assets_dir):
+        """Test brotli variant is served when accepted."""
+        response = self._send(app, assets_dir, "main-aaaa1111.css", "gzip, deflate, br")
+
+        assert response.headers["Content-Encoding"] == "br"
+        assert response.mimetype == "text/css"
+        assert response.get_data() == b"brotli-bytes"
+        assert "Accept-Encoding" in response.vary
+
+    def test_falls_back_to_gzip(self, app, assets_dir):
+        """Test gzip variant is served when brotli isn't accepted."""
+        response = self._send(app, assets_dir, "main-aaaa1111.css", "gzip")
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.mimetype == "text/css"
+        assert gzip.decompress(response.get_data()).startswith(b"body")
+
+    def test_respects_zero_quality(self, app, assets_dir):
+        """Test an encoding explicitly refused with q=0 is not used."""
+        response = self._send(app, assets_dir, "main-aaaa1111.css", "br;q=0, gzip")
+
+        assert response.headers["Content-Encoding"] == "gzip"
+
+    def test_plain_file_without_accept_encoding(self, app, assets_dir):
+        """Test the uncompressed file is served if the client accepts no encodings."""
+        response = self._send(app, assets_dir, "main-aaaa1111.css")
+
+        assert "Content-Encoding" not in response.headers
+        assert response.get_data().startswith(b"body")
+        assert "Accept-Encoding" in response.vary
+
+    def test_plain_file_without_precompressed_variant(self, app, assets_dir):
+        """Test files without precompressed siblings are served as-is."""
+        response = self._send(app, assets_dir, "bold.woff2", "br, gzip")
+
+        assert "Content-Encoding" not in response.headers
+        assert response.get_data() == b"woff2"
+
+
+@pytest.mark.unit
+class TestStaticAssets:
+    """Test cache policy classification and precomputed ETags."""
+
+    @pytest.fixture
+    def static_assets(self, tmp_path):
+        dist = tmp_path / "dist"
+        assets = dist / "assets"
+        (assets / "fonts").mkdir(parents=True)
+        (assets / "main-aaaa1111.css").write_text("body {}")
+        (assets / "main-aaaa1111.css.gz").write_bytes(gzip.compress(b"body {}"))
+        (assets / "main-bbbb2222.js").write_text("console.log('hi')")
+        (assets / "fonts" / "bold.woff2").write_bytes(b"woff2")
+        write_manifest(dist / "manifest.json")
+
+        static_assets = StaticAssets(ViteManifest(dist / "manifest.json"), assets)
+        static_assets.load()
+        return static_assets
+
+    def _send(self, app, static_assets, filename, **headers):
+        with app.test_request_context(f"/_govuk_flask_admin/{filename}", headers=headers):
+            response = static_assets.send(filename)
+            response.direct_passthrough = False
+            return response
+
+    def test_classifies_hashed_files_from_manifest(self, static_assets):
+        """Test manifest-listed files are immutable and copied files are not."""
+        assert static_assets.get("main-aaaa1111.css").immutable
+        assert static_assets.get("main-bbbb2222.js").immutable
+        assert not static_assets.get("fonts/bold.woff2").immutable
+
+    def test_hashed_file_cached_as_immutable(self, app, static_assets):
+        """Test hashed files get a long-lived immutable cache policy."""
+        response = self._send(app, static_assets, "main-bbbb2222.js")
+
+        assert response.status_code == 200
+        assert response.cache_control.immutable
+        assert response.cache_control.max_age == IMMUTABLE_MAX_AGE
+
+    def test_unhashed_file_must_revalidate(self, app, static_assets):
+        """Test unhashed files must be revalidated and carry a strong ETag."""
+        response = self._send(app, static_assets, "fonts/bold.woff2")
+
+        assert response.status_code == 200
+        assert response.cache_control.no_cache
+        assert not response.cache_control.immutable
+        etag, weak = response.get_etag()
+        assert etag == static_assets.get("fonts/bold.woff2").files[None].etag
+        assert not weak
+
+    def test_conditional_get_answered_from_table(self, app, static_assets, monkeypatch):
+        """Test a matching If-None-Match gets a 304 without reading the file."""
+        etag = static_assets.get("fonts/bold.woff2").files[None].etag
+
+        def fail(*args, **kwargs):
+            raise AssertionError("filesystem should not be touched")
+
+        monkeypatch.setattr("govuk_flask_admin.assets.send_file", fail)
+        response = self._send(app, static_assets, "fonts/bold.woff2", **{"If-None-Match": f'"{etag}"'})
+
+        assert response.status_code == 304
+        assert response.get_etag() == (etag, False)
+        assert response.cache_control.no_cache
+
+    def test_etag_differs_per_encoding(self, app, static_assets):
+        """Test precompressed variants have their own ETags."""
+        plain = self._send(app, static_assets, "main-aaaa1111.css")
+        gzipped = self._send(app, static_assets, "main-aaaa1111.css", **{"Accept-Encoding": "gzip"})
+
+        assert gzipped.headers["Content-Encoding"] == "gzip"
+        assert plain.get_etag()[0] != gzipped.get_etag()[0]
+
+    def test_unknown_file_is_404(self, app, static_assets):
+        """Test files missing from the table and disk 404."""
+        from werkzeug.exceptions import NotFound
+
+        with pytest.raises(NotFound):
+            self._send(app, static_assets, "missing.css")
+
+
+@pytest.mark.unit
+class TestPreloadLinks:
+    """Test the preload Link header value built from the manifest."""
+
+    def test_preload_links(self, app, tmp_path):
+        """Test CSS, module JS and fonts are all preloaded."""
+        write_manifest(tmp_path / "manifest.json")
+        manifest = ViteManifest(tmp_path / "manifest.json")
+
+        with app.test_request_context("/admin/"):
+            links = manifest.preload_links(["fonts/bold.woff2"]).split(", ")
+
+        assert links == [
+            "</_govuk_flask_admin/main-aaaa1111.css>; rel=preload; as=style",
+            "</_govuk_flask_admin/main-bbbb2222.js>; rel=modulepreload",
+            '</_govuk_flask_admin/fonts/bold.woff2>; rel=preload; as=font; type="font/woff2"; crossorigin',
+        ]
+
+
+@pytest.mark.unit
+class TestInMemoryStaticAssets:
+    """Test serving the asset table from memory."""
+
+    @pytest.fixture
+    def static_assets(self, tmp_path):
+        dist = tmp_path / "dist"
+        assets = dist / "assets"
+        (assets / "fonts").mkdir(parents=True)
+        (assets / "main-aaaa1111.css").write_text("body {}")
+        (assets / "main-aaaa1111.css.br").write_bytes(b"brotli-bytes")
+        (assets / "fonts" / "bold.woff2").write_bytes(b"woff2-bytes")
+        write_manifest(dist / "manifest.json")
+
+        static_assets = StaticAssets(ViteManifest(dist / "manifest.json"), assets, in_memory=True)
+        static_assets.load()
+        return static_assets
+
+    def _send(self, app, static_assets, filename, **headers):
+        with app.test_request_context(f"/_govuk_flask_admin/{filename}", headers=headers):
+            return static_assets.send(filename)
+
+    def test_holds_file_bytes(self, static_assets):
+        """Test each encoding's bytes are loaded into the table."""
+        asset = static_assets.get("main-aaaa1111.css")
+
+        assert asset.files[None].data == b"body {}"
+        assert asset.files["br"].data == b"brotli-bytes"
+
+    def test_serves_from_memory(self, app, static_assets, monkeypatch):
+        """Test responses are built without opening files."""
+        def fail(*args, **kwargs):
+            raise AssertionError("filesystem should not be touched")
+
+        monkeypatch.setattr("govuk_flask_admin.assets.send_file", fail)
+        monkeypatch.setattr("govuk_flask_admin.assets.send_from_directory", fail)
+
+        response = self._send(app, static_assets, "main-aaaa1111.css", **{"Accept-Encoding": "br"})
+
+        assert response.status_code == 200
+        assert response.get_data() == b"brotli-bytes"
+        assert response.headers["Content-Encoding"] == "br"
+        assert response.mimetype == "text/css"
+        assert response.get_etag() == (static_assets.get("main-aaaa1111.css").files["br"].etag, False)
+        assert response.cache_control.immutable
+
+    def test_supports_range_requests(self, app, static_assets):
+        """Test partial content is served from memory."""
+        response = self._send(app, static_assets, "fonts/bold.woff2", Range="bytes=0-4")
+
+        assert response.status_code == 206
+        assert response.get_data() == b"woff2"
+
+    def test_unknown_file_is_404_without_disk_lookup(self, app, static_assets, monkeypatch):
+        """Test files missing from the table 404 straight away."""
+        from werkzeug.exceptions import NotFound
+
+        monkeypatch.setattr("govuk_flask_admin.assets.send_static_asset", None)
+
+        with pytest.raises(NotFound):
+            self._send(app, static_assets, "missing.css")
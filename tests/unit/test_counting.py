@@ -0,0 +1,298 @@
+"""Unit tests for list count strategies."""
+import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Column, ForeignKey, Table, create_engine, func, select, text
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, relationship
+
+from app import Base, FavouriteColour, User
+
+from govuk_flask_admin.counting import (
+    ROW_ESTIMATORS,
+    CappedCount,
+    CountCache,
+    EstimatedCount,
+    ExactCount,
+    ResultCount,
+    WindowCount,
+    format_result_count,
+    query_tables,
+)
+
+
+class TagsBase(DeclarativeBase):
+    pass
+
+
+article_tag = Table(
+    "article_tag",
+    TagsBase.metadata,
+    Column("article_id", ForeignKey("article.id"), primary_key=True),
+    Column("tag_id", ForeignKey("tag.id"), primary_key=True),
+)
+
+
+class Article(TagsBase):
+    __tablename__ = "article"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    tags: Mapped[list["Tag"]] = relationship(secondary=article_tag)
+
+
+class Tag(TagsBase):
+    __tablename__ = "tag"
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+
+def _user(i):
+    return User(
+        email=f"user{i}@example.com",
+        name=f"User {i}",
+        age=30,
+        job="Dev",
+        favourite_colour=FavouriteColour.RED,
+        created_at=datetime.date(2024, 1, 1),
+    )
+
+
+@pytest.mark.unit
+class TestFormatResultCount:
+    """Test format_result_count."""
+
+    @pytest.mark.parametrize(
+        "count, expected",
+        [
+            (0, "0 results"),
+            (1, "1 result"),
+            (12345, "12,345 results"),
+            (ResultCount(10_000, capped=True), "10,000+ results"),
+            (ResultCount(1_234_567, estimated=True), "about 1.2 million results"),
+            (ResultCount(2_000_000_000, estimated=True), "about 2 billion results"),
+            (ResultCount(123_456, estimated=True), "about 120,000 results"),
+        ],
+    )
+    def test_describes_counts(self, count, expected):
+        """Test exact, capped and estimated counts are described differently."""
+        assert format_result_count(count) == expected
+
+    def test_result_count_is_an_int(self):
+        """Test ResultCount still works with Flask-Admin's page maths."""
+        count = ResultCount(31, estimated=True)
+
+        assert count == 31
+        assert count / 15 > 2
+
+
+@pytest.mark.unit
+class TestCountStrategies:
+    """Test the built-in count strategies against the demo app's database."""
+
+    def test_exact_count(self, user_model_view, sample_users):
+        """Test ExactCount runs the count query."""
+        count = ExactCount().count(user_model_view, user_model_view.get_count_query(), filtered=False)
+
+        assert count == user_model_view.get_count_query().scalar()
+        assert not count.estimated and not count.capped
+
+    def test_capped_count_below_cap_is_exact(self, user_model_view, sample_users):
+        """Test CappedCount gives the real total when it's within the cap."""
+        total = user_model_view.get_count_query().scalar()
+
+        count = CappedCount(cap=total).count(user_model_view, user_model_view.get_count_query(), filtered=False)
+
+        assert count == total
+        assert not count.capped
+
+    def test_capped_count_stops_at_cap(self, user_model_view, sample_users):
+        """Test CappedCount reports the cap as a lower bound when there are more rows."""
+        count = CappedCount(cap=3).count(user_model_view, user_model_view.get_count_query(), filtered=False)
+
+        assert count == 3
+        assert count.capped
+
+    def test_estimated_count_uses_sqlite_stat1(self, app, db, user_model_view, sample_users):
+        """Test EstimatedCount reads the row count ANALYZE recorded for the table."""
+        db.session.execute(text("ANALYZE"))
+        total = user_model_view.get_count_query().scalar()
+
+        count = EstimatedCount(min_estimate=1).count(user_model_view, user_model_view.get_count_query(), filtered=False)
+
+        assert count == total
+        assert count.estimated
+
+    def test_estimated_count_is_exact_when_filtered(self, db, user_model_view, sample_users):
+        """Test statistics aren't used for filtered lists, which they don't describe."""
+        db.session.execute(text("ANALYZE"))
+
+        count = EstimatedCount(min_estimate=1).count(user_model_view, user_model_view.get_count_query(), filtered=True)
+
+        assert not count.estimated
+
+    def test_estimated_count_is_exact_for_small_tables(self, db, user_model_view, sample_users):
+        """Test tables with fewer rows than min_estimate are counted exactly."""
+        db.session.execute(text("ANALYZE"))
+
+        count = EstimatedCount().count(user_model_view, user_model_view.get_count_query(), filtered=False)
+
+        assert not count.estimated
+
+    def test_estimated_count_falls_back_without_estimator(self, user_model_view, sample_users, monkeypatch):
+        """Test dialects without a registered estimator use the fallback strategy."""
+        monkeypatch.delitem(ROW_ESTIMATORS, "sqlite")
+
+        count = EstimatedCount(min_estimate=1).count(user_model_view, user_model_view.get_count_query(), filtered=False)
+
+        assert not count.estimated
+
+    def test_estimated_count_with_session_bound_to_a_connection(self):
+        """Test estimates are read through the session when it's bound to a Connection rather than an Engine."""
+        engine = create_engine("sqlite://")
+        with engine.connect() as connection, Session(bind=connection) as session:
+            Base.metadata.create_all(connection)
+            session.add_all(_user(i) for i in range(5))
+            session.flush()
+            session.execute(text("ANALYZE"))
+            view = SimpleNamespace(session=session, model=User)
+
+            assert EstimatedCount().estimate(view) == 5
+
+    def test_failed_estimate_leaves_the_transaction_usable(self):
+        """Test a lookup that fails (no statistics yet) gives None and doesn't abort the session's transaction."""
+        engine = create_engine("sqlite://")
+        with engine.connect() as connection, Session(bind=connection) as session:
+            Base.metadata.create_all(connection)
+            session.add(_user(0))
+            view = SimpleNamespace(session=session, model=User)
+
+            assert EstimatedCount().estimate(view) is None
+            assert session.scalar(select(func.count()).select_from(User)) == 1
+
+    def test_window_count_adds_total_to_rows(self, user_model_view, sample_users):
+        """Test WindowCount returns each page row alongside the total of all matching rows."""
+        total = user_model_view.get_count_query().scalar()
+        strategy = WindowCount()
+
+        data, count = strategy.split_rows(strategy.add_to_query(user_model_view.get_query().limit(2)).all())
+
+        assert len(data) == 2
+        assert all(isinstance(row, user_model_view.model) for row in data)
+        assert count == total
+
+    def test_window_count_empty_page_has_no_total(self):
+        """Test an empty page gives no total, for the caller to fall back on."""
+        assert WindowCount().split_rows([]) == ([], None)
+
+    def test_window_count_uses_fallback_without_list_query(self, user_model_view, sample_users):
+        """Test counting on its own goes to the fallback strategy."""
+        count = WindowCount(fallback=CappedCount(cap=3)).count(
+            user_model_view, user_model_view.get_count_query(), filtered=False
+        )
+
+        assert count.capped
+
+
+@pytest.mark.unit
+class TestCountCache:
+    """Test CountCache eviction and invalidation."""
+
+    def test_entries_expire_after_ttl(self):
+        """Test entries aren't returned once their time-to-live has passed."""
+        now = [0.0]
+        cache = CountCache(ttl=10, clock=lambda: now[0])
+        cache.set("key", 5, frozenset({"user"}))
+
+        now[0] = 9.9
+        assert cache.get("key") == 5
+
+        now[0] = 10
+        assert cache.get("key") is None
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test the cache drops the entry read least recently when it's full."""
+        cache = CountCache(max_entries=2)
+        cache.set("a", 1, frozenset())
+        cache.set("b", 2, frozenset())
+        cache.get("a")
+
+        cache.set("c", 3, frozenset())
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_invalidate_drops_entries_for_table(self):
+        """Test invalidating a table drops only the entries that read from it."""
+        cache = CountCache()
+        cache.set("users", 1, frozenset({"user"}))
+        cache.set("posts by author", 2, frozenset({"post", "user"}))
+        cache.set("accounts", 3, frozenset({"account"}))
+
+        cache.invalidate({"user"})
+
+        assert cache.get("users") is None
+        assert cache.get("posts by author") is None
+        assert cache.get("accounts") == 3
+
+    def test_commit_invalidates_written_tables(self, app, db, sample_users):
+        """Test committing a change to a model invalidates counts that read its table."""
+        from tests.conftest import User
+
+        cache = CountCache()
+        cache.set("users", 1, frozenset({"user"}))
+        cache.set("posts", 2, frozenset({"post"}))
+
+        with app.app_context():
+            db.session.get(User, sample_users[0].id).name = "Renamed"
+            db.session.flush()
+            assert cache.get("users") == 1
+
+            db.session.commit()
+
+        assert cache.get("users") is None
+        assert cache.get("posts") == 2
+
+    def test_many_to_many_changes_invalidate_the_association_table(self):
+        """Test changing a many-to-many collection invalidates counts that read its association table."""
+        tags_engine = create_engine("sqlite://")
+        TagsBase.metadata.create_all(tags_engine)
+        cache = CountCache()
+
+        with Session(tags_engine) as session:
+            article, tag = Article(), Tag()
+            session.add_all([article, tag])
+            session.commit()
+
+            cache.set("tagged articles", 1, frozenset({"article_tag"}))
+            article.tags.append(tag)
+            session.commit()
+            assert cache.get("tagged articles") is None
+
+            cache.set("tagged articles", 1, frozenset({"article_tag"}))
+            session.delete(article)
+            session.commit()
+            assert cache.get("tagged articles") is None
+
+    def test_bulk_delete_invalidates_on_commit(self, app, db, sample_users):
+        """Test ORM bulk deletes invalidate too, as they don't go through a flush."""
+        from tests.conftest import Account
+
+        cache = CountCache()
+        cache.set("accounts", 1, frozenset({"account"}))
+
+        with app.app_context():
+            db.session.query(Account).delete()
+            db.session.commit()
+
+        assert cache.get("accounts") is None
+
+    def test_query_tables_includes_joined_tables(self, app, admin_instance):
+        """Test counts filtered through a relationship are tagged with the related table."""
+        post_view = next(view for view in admin_instance._views if view.name == "Post")
+
+        with app.test_request_context("/admin/post/?flt0_0=example"):
+            filters = post_view._get_list_filter_args()
+            _query, count_query, _joins, _count_joins = post_view._apply_filters(
+                post_view.get_query(), post_view.get_count_query(), {}, {}, filters
+            )
+
+        assert query_tables(count_query.statement) == {"post", "user"}
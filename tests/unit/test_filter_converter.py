@@ -184,6 +184,40 @@ class TestGovukFilterConverter:
         # Should NOT have empty filter for non-nullable enum
         assert sqla_filters.EnumFilterEmpty not in filter_types
 
+    def test_enum_options_pair_names_with_values(self, converter):
+        """Test enum filters get (name, value) options, computed when the filter is built."""
+        import enum
+
+        class TestEnum(enum.Enum):
+            OPTION_A = 'a'
+            OPTION_B = 'b'
+
+        from sqlalchemy import Enum as SQLAEnum
+        column = Column('test_enum', SQLAEnum(TestEnum), nullable=True)
+
+        filters = converter.conv_enum(column, 'Test Enum')
+
+        equal_filter = next(f for f in filters if isinstance(f, sqla_filters.EnumEqualFilter))
+        empty_filter = next(f for f in filters if isinstance(f, sqla_filters.EnumFilterEmpty))
+        assert equal_filter.options == [('OPTION_A', 'a'), ('OPTION_B', 'b')]
+        # The empty filter keeps its yes/no options
+        assert [value for value, _label in empty_filter.options] == ['1', '0']
+
+    def test_enum_options_given_by_value_are_labelled(self, converter):
+        """Test options given for an enum are labelled with the member's value, keeping the submitted value."""
+        import enum
+
+        class TestEnum(enum.Enum):
+            OPTION_A = 'a'
+            OPTION_B = 'b'
+
+        from sqlalchemy import Enum as SQLAEnum
+        column = Column('test_enum', SQLAEnum(TestEnum), nullable=False)
+
+        filters = converter.conv_enum(column, 'Test Enum', options=[('OPTION_B', 'B'), ('a', 'A'), ('other', 'Other')])
+
+        assert filters[0].options == [('OPTION_B', 'b'), ('a', 'a'), ('other', 'Other')]
+
     def test_float_filters_exclude_in_list(self, converter):
         """Test that float columns don't get 'in list' filters."""
         from sqlalchemy import Float
@@ -206,7 +240,7 @@ class TestGovukFilterConverter:
     def test_date_filters_exclude_empty_for_non_nullable(self, converter):
         """Test that non-nullable date columns don't get FilterEmpty."""
         from sqlalchemy import Date
-        from govuk_flask_admin import DateAfterFilter, DateBeforeFilter
+        from govuk_flask_admin import DateAfterFilter, DateBeforeFilter, DateRangeFilter
         column = Column('test_date', Date, nullable=False)
 
         filters = converter.conv_date(column, 'Test Date')
@@ -223,7 +257,8 @@ class TestGovukFilterConverter:
         assert sqla_filters.DateGreaterFilter not in filter_types
         assert sqla_filters.DateSmallerFilter not in filter_types
 
-        # Should NOT have between filters (removed from GovukFilterConverter)
+        # Should NOT have the between filters, or the range filter, which views add themselves
+        assert DateRangeFilter not in filter_types
         assert sqla_filters.DateBetweenFilter not in filter_types
         assert sqla_filters.DateNotBetweenFilter not in filter_types
 
@@ -239,7 +274,7 @@ class TestGovukFilterConverter:
     def test_datetime_filters_exclude_empty_for_non_nullable(self, converter):
         """Test that non-nullable datetime columns don't get FilterEmpty."""
         from sqlalchemy import DateTime
-        from govuk_flask_admin import DateTimeEqualFilter, DateTimeAfterFilter, DateTimeBeforeFilter
+        from govuk_flask_admin import DateTimeEqualFilter, DateTimeAfterFilter, DateTimeBeforeFilter, DateTimeRangeFilter
         column = Column('test_datetime', DateTime, nullable=False)
 
         filters = converter.conv_datetime(column, 'Test DateTime')
@@ -256,7 +291,8 @@ class TestGovukFilterConverter:
         assert sqla_filters.DateTimeGreaterFilter not in filter_types
         assert sqla_filters.DateTimeSmallerFilter not in filter_types
 
-        # Should NOT have between filters (removed from GovukFilterConverter)
+        # Should NOT have the between filters, or the range filter, which views add themselves
+        assert DateTimeRangeFilter not in filter_types
         assert sqla_filters.DateTimeBetweenFilter not in filter_types
         assert sqla_filters.DateTimeNotBetweenFilter not in filter_types
 
@@ -0,0 +1,319 @@
+"""Unit tests for FilterState parsing and sharing."""
+import pytest
+from flask import g, get_flashed_messages
+from werkzeug.datastructures import MultiDict
+
+from govuk_flask_admin.filter_state import ActiveFilter, FilterState, FilterViewArgs
+from govuk_flask_admin.value_lists import ValueListStore
+
+
+def _filter_index(view, column_name, filter_class_name):
+    return next(
+        idx
+        for idx, flt in enumerate(view._filters)
+        if flt.column.key == column_name and type(flt).__name__ == filter_class_name
+    )
+
+
+@pytest.mark.unit
+class TestFilterStateParse:
+    """Test FilterState.parse."""
+
+    def test_parses_filters_in_order(self, user_model_view):
+        """Test filters are read in their numbered order, with their name and operation."""
+        job = _filter_index(user_model_view, "job", "FilterEqual")
+        age = _filter_index(user_model_view, "age", "IntEqualFilter")
+
+        state = FilterState.parse(
+            MultiDict([(f"flt10_{job}", "Dev"), (f"flt2_{age}", "30"), ("search", "x")]),
+            user_model_view._filter_args,
+        )
+
+        assert [(flt.index, flt.value) for flt in state] == [(age, "30"), (job, "Dev")]
+        assert state[0].name == "Age"
+        assert state[0].operation == "equals"
+        assert dict(state.url_args) == {f"flt0_{age}": "30", f"flt1_{job}": "Dev"}
+
+    def test_combines_date_fields(self, user_model_view):
+        """Test GOV.UK day/month/year inputs are combined and padded to YYYY-MM-DD."""
+        created = _filter_index(user_model_view, "created_at", "DateEqualFilter")
+
+        state = FilterState.parse(
+            MultiDict(
+                {f"flt0_{created}-day": " 5 ", f"flt0_{created}-month": "3", f"flt0_{created}-year": "2024"}
+            ),
+            user_model_view._filter_args,
+        )
+
+        assert [flt.value for flt in state] == ["2024-03-05"]
+
+    def test_combines_range_ends(self, user_model_view):
+        """Test the from and to inputs of range filters are combined, date inputs first."""
+        created = _filter_index(user_model_view, "created_at", "DateRangeFilter")
+        logged_in = _filter_index(user_model_view, "last_logged_in_at", "DateTimeRangeFilter")
+        dates = {
+            f"flt0_{created}-{end}-{part}": value
+            for end, date in (("from", ("5", "3", "2024")), ("to", ("6", "3", "2024")))
+            for part, value in zip(("day", "month", "year"), date)
+        }
+
+        times = {f"flt1_{logged_in}-from": "2024-03-05 10:00:00", f"flt1_{logged_in}-to": " 2024-03-05 11:00:00 "}
+
+        state = FilterState.parse(MultiDict({**dates, **times}), user_model_view._filter_args)
+
+        assert dict(state.url_args) == {
+            f"flt0_{created}": "2024-03-05 to 2024-03-06",
+            f"flt1_{logged_in}": "2024-03-05 10:00:00 to 2024-03-05 11:00:00",
+        }
+
+    def test_ranges_with_one_end_are_open_ended(self, user_model_view):
+        """Test a range with only its start or its end given is active, open at the other end."""
+        logged_in = _filter_index(user_model_view, "last_logged_in_at", "DateTimeRangeFilter")
+        created = _filter_index(user_model_view, "created_at", "DateRangeFilter")
+
+        state = FilterState.parse(
+            MultiDict(
+                {
+                    f"flt0_{logged_in}-from": "2024-03-05 10:00:00",
+                    f"flt0_{logged_in}-to": "",
+                    f"flt1_{created}-to-day": "6",
+                    f"flt1_{created}-to-month": "3",
+                    f"flt1_{created}-to-year": "2024",
+                }
+            ),
+            user_model_view._filter_args,
+        )
+
+        assert dict(state.url_args) == {f"flt0_{logged_in}": "2024-03-05 10:00:00 to", f"flt1_{created}": "to 2024-03-06"}
+        assert not state.invalid
+
+    def test_ignores_ranges_with_neither_end(self, user_model_view):
+        """Test a range with both ends left empty isn't an active filter."""
+        logged_in = _filter_index(user_model_view, "last_logged_in_at", "DateTimeRangeFilter")
+
+        state = FilterState.parse(
+            MultiDict({f"flt0_{logged_in}-from": " ", f"flt0_{logged_in}-to": ""}), user_model_view._filter_args
+        )
+
+        assert not state
+        assert not state.invalid
+
+    def test_ignores_incomplete_dates_and_blank_values(self, user_model_view):
+        """Test partial dates and empty filter fields aren't active filters."""
+        created = _filter_index(user_model_view, "created_at", "DateEqualFilter")
+        job = _filter_index(user_model_view, "job", "FilterEqual")
+
+        state = FilterState.parse(
+            MultiDict({f"flt0_{created}-day": "5", f"flt0_{created}-month": "3", f"flt1_{job}": "  "}),
+            user_model_view._filter_args,
+        )
+
+        assert not state
+
+    def test_collects_invalid_values(self, user_model_view):
+        """Test values a filter rejects are left out and reported."""
+        age = _filter_index(user_model_view, "age", "IntEqualFilter")
+
+        state = FilterState.parse(MultiDict({f"flt0_{age}": "old"}), user_model_view._filter_args)
+
+        assert not state
+        assert [value for value, _flt in state.invalid] == ["old"]
+
+    def test_joins_repeated_values_for_multiple_value_filters(self, user_model_view):
+        """Test repeated values (e.g. from a multiple select) are joined for filters that take several."""
+        emails = _filter_index(user_model_view, "email", "FilterInValues")
+        job = _filter_index(user_model_view, "job", "FilterEqual")
+
+        state = FilterState.parse(
+            MultiDict(
+                [
+                    (f"flt0_{emails}", "a@example.com"),
+                    (f"flt0_{emails}", " "),
+                    (f"flt0_{emails}", "b@example.com"),
+                    (f"flt1_{job}", "Dev"),
+                    (f"flt1_{job}", "Ops"),
+                ]
+            ),
+            user_model_view._filter_args,
+        )
+
+        assert [flt.value for flt in state] == ["a@example.com\nb@example.com", "Dev"]
+        assert state[0].operation == "is one of"
+
+    def test_reads_stored_value_lists(self, user_model_view):
+        """Test a value list's token is read back from the store, and kept as the value in URL arguments."""
+        emails = _filter_index(user_model_view, "email", "FilterInValues")
+        store = ValueListStore()
+        token = store.put("a@example.com\nb@example.com")
+
+        state = FilterState.parse(MultiDict({f"flt0_{emails}": token}), user_model_view._filter_args, store)
+
+        assert [flt.value for flt in state] == ["a@example.com\nb@example.com"]
+        assert dict(state.url_args) == {f"flt0_{emails}": token}
+
+    def test_missing_value_lists_are_invalid(self, user_model_view):
+        """Test a token the store can't find (e.g. once it's expired) isn't applied, and is reported."""
+        emails = _filter_index(user_model_view, "email", "FilterInValues")
+        token = "@" + "0" * 24
+
+        state = FilterState.parse(MultiDict({f"flt0_{emails}": token}), user_model_view._filter_args, ValueListStore())
+
+        assert not state
+        assert [value for value, _flt in state.invalid] == [token]
+
+    def test_is_immutable(self):
+        """Test a FilterState can't be changed once made."""
+        state = FilterState([ActiveFilter(0, "Job", "equals", "Dev")], ["0"])
+
+        with pytest.raises(AttributeError):
+            state.filters = ()
+        with pytest.raises(TypeError):
+            state.url_args["flt1_0"] = "x"
+
+    def test_unpacks_as_tuples(self):
+        """Test active filters still unpack as (index, name, operation, value)."""
+        state = FilterState([ActiveFilter(3, "Job", "equals", "Dev")], ["3"])
+
+        [(idx, name, operation, value)] = state
+
+        assert (idx, name, operation, value) == (3, "Job", "equals", "Dev")
+
+    def test_url_args_without(self):
+        """Test removing one filter keeps the other filters' arguments as they were."""
+        state = FilterState(
+            [ActiveFilter(0, "Job", "equals", "Dev"), ActiveFilter(1, "Age", "equals", "30")], ["0", "1"]
+        )
+
+        assert state.url_args_without(0) == {"flt1_1": "30"}
+
+    def test_values_by_index(self):
+        """Test values are grouped by filter index, keeping every value given to the same filter."""
+        state = FilterState(
+            [
+                ActiveFilter(4, "Job", "equals", "Dev"),
+                ActiveFilter(0, "Age", "equals", "30"),
+                ActiveFilter(4, "Job", "equals", "Ops"),
+            ],
+            ["4", "0", "4"],
+        )
+
+        assert dict(state.values_by_index) == {4: ("Dev", "Ops"), 0: ("30",)}
+        assert FilterState().values_by_index == {}
+
+
+@pytest.mark.unit
+class TestGetFilterState:
+    """Test GovukModelView.get_filter_state."""
+
+    def test_parsed_once_per_request(self, app, user_model_view):
+        """Test the state is parsed once and then shared from flask.g."""
+        age = _filter_index(user_model_view, "age", "IntEqualFilter")
+
+        with app.test_request_context(f"/admin/user/?flt0_{age}=30"):
+            first = user_model_view.get_filter_state()
+
+            assert user_model_view._get_list_filter_args() is first
+            assert g._govuk_flask_admin_filter_states[user_model_view.endpoint][1] is first
+
+    def test_new_request_is_parsed_again(self, app, user_model_view):
+        """Test a later request doesn't see an earlier request's filters."""
+        age = _filter_index(user_model_view, "age", "IntEqualFilter")
+
+        with app.app_context():
+            with app.test_request_context(f"/admin/user/?flt0_{age}=30"):
+                assert len(user_model_view.get_filter_state()) == 1
+            with app.test_request_context("/admin/user/"):
+                assert len(user_model_view.get_filter_state()) == 0
+
+    def test_request_args_are_not_changed(self, app, user_model_view):
+        """Test parsing leaves request.args as it was."""
+        created = _filter_index(user_model_view, "created_at", "DateEqualFilter")
+        query = f"flt0_{created}-day=15&flt0_{created}-month=3&flt0_{created}-year=2024"
+
+        with app.test_request_context(f"/admin/user/?{query}") as ctx:
+            original_args = ctx.request.args
+            user_model_view.get_filter_state()
+
+            assert ctx.request.args is original_args
+            assert f"flt0_{created}" not in ctx.request.args
+
+    def test_invalid_values_are_flashed_once(self, app, user_model_view):
+        """Test an invalid value gets one error message however many times filters are read."""
+        age = _filter_index(user_model_view, "age", "IntEqualFilter")
+
+        with app.test_request_context(f"/admin/user/?flt0_{age}=old"):
+            user_model_view._get_list_extra_args()
+            user_model_view._get_list_extra_args()
+
+            assert len(get_flashed_messages()) == 1
+
+    def test_view_args_clones_share_filter_state(self, app, user_model_view):
+        """Test page and sort links reuse the request's FilterState rather than copying it."""
+        age = _filter_index(user_model_view, "age", "IntEqualFilter")
+
+        with app.test_request_context(f"/admin/user/?flt0_{age}=30"):
+            view_args = user_model_view._get_list_extra_args()
+
+            assert isinstance(view_args, FilterViewArgs)
+            assert view_args.clone(page=2).filters is view_args.filters
+
+    def test_tuples_are_accepted(self, app, user_model_view):
+        """Test Flask-Admin style (index, name, value) tuples still build URL arguments."""
+        age = _filter_index(user_model_view, "age", "IntEqualFilter")
+
+        with app.test_request_context("/admin/user/"):
+            assert user_model_view._get_filters([(age, "Age", "30")]) == {f"flt0_{age}": "30"}
+
+
+@pytest.mark.unit
+class TestApplyFilters:
+    """Test GovukModelView._apply_filters applies all filters in one pass."""
+
+    @pytest.fixture
+    def post_view(self, admin_instance):
+        return next(view for view in admin_instance._views if view.name == "Post")
+
+    def _apply(self, app, view, query_string):
+        with app.test_request_context(f"/admin/post/?{query_string}"):
+            query, count_query, _joins, _count_joins = view._apply_filters(
+                view.get_query(), view.get_count_query(), {}, {}, view._get_list_filter_args()
+            )
+        return str(query.statement), str(count_query.statement)
+
+    def test_relationship_filters_share_one_join(self, app, post_view):
+        """Test several filters on the author relationship join the user table once in each query."""
+        name_like = _filter_index(post_view, "name", "FilterLike")
+        email_like = _filter_index(post_view, "email", "FilterLike")
+        age_greater = _filter_index(post_view, "age", "IntGreaterFilter")
+
+        sql, count_sql = self._apply(
+            app, post_view, f"flt0_{name_like}=Test&flt1_{email_like}=example&flt2_{age_greater}=20"
+        )
+
+        for statement in (sql, count_sql):
+            assert statement.count("JOIN") == 1
+            assert statement.count("WHERE") == 1
+            assert statement.count(" AND ") == 2
+
+    def test_list_and_count_queries_use_the_same_alias(self, app, post_view):
+        """Test the relationship is joined under the same alias in both queries."""
+        name_like = _filter_index(post_view, "name", "FilterLike")
+
+        sql, count_sql = self._apply(app, post_view, f"flt0_{name_like}=Test")
+
+        assert sql.split("LEFT OUTER JOIN ")[1].split(" ON ")[0] == count_sql.split("LEFT OUTER JOIN ")[1].split(" ON ")[0]
+
+    def test_filters_that_change_more_than_criteria_are_applied_directly(self, app, post_view, monkeypatch):
+        """Test a filter that does more than call filter() is given the real queries."""
+        name_like = _filter_index(post_view, "name", "FilterLike")
+        flt = post_view._filters[name_like]
+
+        def apply(query, value, alias=None):
+            return query.filter(flt.get_column(alias).like(f"%{value}%")).distinct()
+
+        monkeypatch.setattr(flt, "apply", apply)
+
+        sql, count_sql = self._apply(app, post_view, f"flt0_{name_like}=Test")
+
+        assert "DISTINCT" in sql
+        assert "LIKE" in sql and "LIKE" in count_sql
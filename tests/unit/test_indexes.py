@@ -0,0 +1,123 @@
+"""Unit tests for the index advisor."""
+import pytest
+from sqlalchemy import Index
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import Post, User
+from govuk_flask_admin.indexes import FILTER, JOIN, SEARCH, SORT, advise_indexes, indexed_columns
+
+
+def _advice_for(advice, table, column_name):
+    return next((item for item in advice if item.table.name == table and item.columns[0].name == column_name), None)
+
+
+@pytest.mark.unit
+class TestAdviseIndexes:
+    """Test advise_indexes."""
+
+    @pytest.fixture
+    def post_view(self, admin_instance):
+        return next(view for view in admin_instance._views if view.name == "Post")
+
+    def test_flags_unindexed_filter_and_sort_columns(self, user_model_view):
+        """Test filtered and sorted columns with no index are flagged with CREATE INDEX statements."""
+        advice = advise_indexes(user_model_view, sqlite.dialect())
+
+        age = _advice_for(advice, "user", "age")
+        assert age is not None
+        assert set(age.uses) == {FILTER, SORT}
+        assert age.ddl == "CREATE INDEX ix_user_age ON user (age)"
+
+    def test_indexed_columns_are_not_flagged(self, user_model_view):
+        """Test unique and primary key columns, which databases index, aren't flagged."""
+        advice = advise_indexes(user_model_view, sqlite.dialect())
+
+        assert _advice_for(advice, "user", "email") is None
+        assert _advice_for(advice, "user", "id") is None
+        assert User.__table__.c.email in indexed_columns(User.__table__)
+
+    def test_flags_foreign_keys_joined_by_filters(self, post_view):
+        """Test the foreign key joined to filter on a related model is flagged."""
+        advice = advise_indexes(post_view, sqlite.dialect())
+
+        author_id = _advice_for(advice, "post", "author_id")
+        assert author_id is not None
+        assert JOIN in author_id.uses
+        assert author_id.ddl == "CREATE INDEX ix_post_author_id ON post (author_id)"
+
+    def test_search_only_columns(self, post_view, monkeypatch):
+        """Test contains-search columns get a trigram index on PostgreSQL and just a note elsewhere."""
+        monkeypatch.setattr(post_view, "_sortable_columns", {})
+
+        search_only = [item for item in advise_indexes(post_view, sqlite.dialect()) if item.uses == (SEARCH,)]
+        assert search_only
+        assert all(item.ddl is None and item.note for item in search_only)
+
+        title = _advice_for(advise_indexes(post_view, postgresql.dialect()), "post", "title")
+        assert title.ddl == "CREATE INDEX ix_post_title_trgm ON post USING gin (title gin_trgm_ops)"
+
+    def test_keyset_views_get_composite_indexes(self, user_model_view, monkeypatch):
+        """Test sort columns of keyset-paginated views are indexed together with the primary key."""
+        monkeypatch.setattr(user_model_view, "keyset_pagination", True)
+
+        age = _advice_for(advise_indexes(user_model_view, sqlite.dialect()), "user", "age")
+
+        assert [column.name for column in age.columns] == ["age", "id"]
+        assert age.ddl == "CREATE INDEX ix_user_age_id ON user (age, id)"
+
+    def test_keyset_indexes_on_nullable_columns_put_nulls_first_on_postgresql(self, user_model_view, monkeypatch):
+        """Test nullable keyset sort columns are indexed NULLS FIRST on PostgreSQL, matching the list's order."""
+        monkeypatch.setattr(user_model_view, "keyset_pagination", True)
+
+        postgres = _advice_for(advise_indexes(user_model_view, postgresql.dialect()), "user", "last_logged_in_at")
+        sqlite_ = _advice_for(advise_indexes(user_model_view, sqlite.dialect()), "user", "last_logged_in_at")
+
+        assert postgres.ddl == 'CREATE INDEX ix_user_last_logged_in_at_id ON "user" (last_logged_in_at NULLS FIRST, id)'
+        assert sqlite_.ddl == "CREATE INDEX ix_user_last_logged_in_at_id ON user (last_logged_in_at, id)"
+
+    @pytest.fixture
+    def add_user_index(self):
+        """Add indexes to the user table for one test."""
+        added = []
+
+        def add(*columns):
+            added.append(Index(f"ix_test_{len(added)}", *(User.__table__.c[name] for name in columns)))
+
+        yield add
+        for index in added:
+            User.__table__.indexes.discard(index)
+
+    def test_keyset_sort_columns_need_the_composite_index(self, user_model_view, monkeypatch, add_user_index):
+        """Test an index led by a keyset sort column doesn't count unless the primary key comes next."""
+        monkeypatch.setattr(user_model_view, "keyset_pagination", True)
+        add_user_index("age")
+        add_user_index("job", "name")
+
+        advice = advise_indexes(user_model_view, sqlite.dialect())
+
+        age = _advice_for(advice, "user", "age")
+        assert age.ddl == "CREATE INDEX ix_user_age_id ON user (age, id)"
+        assert "(age, id) order" in age.note
+        assert _advice_for(advice, "user", "job").ddl == "CREATE INDEX ix_user_job_id ON user (job, id)"
+        assert _advice_for(advice, "user", "email") is not None
+        assert _advice_for(advice, "user", "id") is None
+
+    def test_keyset_sort_columns_with_the_composite_index(self, user_model_view, monkeypatch, add_user_index):
+        """Test an index on (sort column, primary key), possibly with more columns after, serves keyset pages."""
+        monkeypatch.setattr(user_model_view, "keyset_pagination", True)
+        add_user_index("age", "id")
+        add_user_index("job", "id", "name")
+
+        advice = advise_indexes(user_model_view, sqlite.dialect())
+
+        assert _advice_for(advice, "user", "age") is None
+        assert _advice_for(advice, "user", "job") is None
+
+    def test_tables_are_not_changed(self, user_model_view, post_view):
+        """Test advice doesn't add indexes to the models' tables."""
+        before = (set(User.__table__.indexes), set(Post.__table__.indexes))
+
+        advise_indexes(user_model_view, postgresql.dialect())
+        advise_indexes(post_view, postgresql.dialect())
+
+        assert (set(User.__table__.indexes), set(Post.__table__.indexes)) == before
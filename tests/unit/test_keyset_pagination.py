@@ -0,0 +1,132 @@
+"""Unit tests for keyset pagination helpers."""
+import datetime
+
+import pytest
+from sqlalchemy import select
+
+from govuk_flask_admin.pagination import CURSOR_ARG, KeysetColumns, KeysetCursor, KeysetPage
+
+
+@pytest.mark.unit
+class TestKeysetCursor:
+    """Test KeysetCursor token encoding."""
+
+    def test_round_trips_through_token(self):
+        """Test a cursor decodes back to the same direction and primary key."""
+        cursor = KeysetCursor("next", "42")
+
+        assert KeysetCursor.decode(cursor.encode()) == cursor
+
+    def test_integer_primary_keys_keep_their_type(self):
+        """Test integer primary keys aren't turned into strings, so they compare correctly in SQL."""
+        assert KeysetCursor.decode(KeysetCursor("previous", 7).encode()).pk == 7
+
+    def test_token_is_url_safe(self):
+        """Test tokens need no escaping in a query string."""
+        token = KeysetCursor("previous", "a/b+c?d=e").encode()
+
+        assert all(c.isalnum() or c in "-_" for c in token)
+
+    @pytest.mark.parametrize("token", [None, "", "not base64!", "bm90IGpzb24", "WyJzaWRld2F5cyIsIjEiXQ", "WyJuZXh0IixudWxsXQ"])
+    def test_malformed_tokens_decode_to_none(self, token):
+        """Test missing, garbled or unexpected tokens are treated as the first page."""
+        assert KeysetCursor.decode(token) is None
+
+
+@pytest.mark.unit
+class TestKeysetColumns:
+    """Test ordering and seek predicates for keyset pagination."""
+
+    def _sql(self, clause):
+        return str(clause.compile(compile_kwargs={"literal_binds": True}))
+
+    def test_orders_by_primary_key_as_tie_breaker(self):
+        """Test the sort column is followed by the primary key."""
+        from tests.conftest import User
+
+        keyset = KeysetColumns(sort=User.email, pk=User.id)
+
+        assert [self._sql(c) for c in keyset.order_by()] == ['"user".email ASC', '"user".id ASC']
+        assert [self._sql(c) for c in keyset.order_by(reverse=True)] == ['"user".email DESC', '"user".id DESC']
+
+    def test_nullable_sort_column_orders_nulls_first(self):
+        """Test NULLs are ordered explicitly so the order is the same on every database."""
+        from tests.conftest import User
+
+        keyset = KeysetColumns(sort=User.last_logged_in_at, pk=User.id)
+
+        assert self._sql(keyset.order_by()[0]) == '"user".last_logged_in_at ASC NULLS FIRST'
+        assert self._sql(keyset.order_by(reverse=True)[0]) == '"user".last_logged_in_at DESC NULLS LAST'
+
+    def test_nulls_order_left_to_the_database_when_not_supported(self):
+        """Test MySQL-style keysets, which sort NULLs first anyway, order by the plain column."""
+        from tests.conftest import User
+
+        keyset = KeysetColumns(sort=User.last_logged_in_at, pk=User.id, explicit_nulls=False)
+
+        assert self._sql(keyset.order_by()[0]) == '"user".last_logged_in_at ASC'
+
+    def test_seek_after_uses_sort_value_then_primary_key(self):
+        """Test seeking forwards compares the sort column and breaks ties on the primary key."""
+        from tests.conftest import User
+
+        keyset = KeysetColumns(sort=User.age, pk=User.id)
+
+        sql = self._sql(keyset.seek(30, 7, after=True))
+        assert sql == '"user".age > 30 OR "user".age = 30 AND "user".id > 7'
+
+    def test_seek_on_descending_list_reads_downwards(self):
+        """Test the next page of a descending list has smaller values."""
+        from tests.conftest import User
+
+        keyset = KeysetColumns(sort=User.age, pk=User.id, descending=True)
+
+        sql = self._sql(keyset.seek(30, 7, after=True))
+        assert sql == '"user".age < 30 OR "user".age = 30 AND "user".id < 7'
+
+    @pytest.mark.parametrize("after", [True, False])
+    def test_seek_matches_order_with_nulls(self, app, db, after):
+        """Test seeking from every row of a nullable column returns exactly the rows either side of it."""
+        from tests.conftest import Post
+
+        with app.app_context():
+            posts = [Post(title=f"Post {i}", content="", author_id=1) for i in range(6)]
+            for i, post in enumerate(posts):
+                post.published_at = None if i % 2 else datetime.datetime(2024, 1, 6 - i)
+            db.session.add_all(posts)
+            db.session.commit()
+
+            try:
+                keyset = KeysetColumns(sort=Post.published_at, pk=Post.id)
+                ordered = db.session.scalars(select(Post.id).order_by(*keyset.order_by())).all()
+
+                for position, post_id in enumerate(ordered):
+                    boundary = db.session.get(Post, post_id)
+                    query = select(Post.id).where(keyset.seek(boundary.published_at, boundary.id, after=after))
+                    found = db.session.scalars(query.order_by(*keyset.order_by(reverse=not after))).all()
+
+                    expected = ordered[position + 1:] if after else ordered[:position][::-1]
+                    assert found == expected
+            finally:
+                db.session.query(Post).delete()
+                db.session.commit()
+
+
+@pytest.mark.unit
+class TestKeysetPage:
+    """Test pager URLs for keyset pages."""
+
+    def test_neighbouring_pages_carry_their_cursor(self):
+        """Test previous and next links add the right cursor to Flask-Admin's page URL."""
+        keyset_page = KeysetPage(page=2, previous_cursor="prev", next_cursor="next")
+        pager_url = keyset_page.pager_url(lambda page: f"/admin/user/?page={page}")
+
+        assert pager_url(1) == f"/admin/user/?page=1&{CURSOR_ARG}=prev"
+        assert pager_url(3) == f"/admin/user/?page=3&{CURSOR_ARG}=next"
+
+    def test_first_page_has_no_cursor(self):
+        """Test the link back to the first page reads the list from the start."""
+        keyset_page = KeysetPage(page=1, previous_cursor="prev", next_cursor="next")
+        pager_url = keyset_page.pager_url(lambda page: "/admin/user/")
+
+        assert pager_url(0) == "/admin/user/"
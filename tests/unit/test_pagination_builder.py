@@ -61,3 +61,57 @@ class TestPaginationBuilder:
         result = govuk_pagination_params_builder(0, 1, url_gen)
         # TODO: Assert no previous/next links
         # TODO: Assert single page shown
+
+
+@pytest.mark.unit
+class TestPaginationBuilderWithoutTotal:
+    """Test govuk_pagination_params_builder when the total number of pages isn't known."""
+
+    def test_first_page_links_to_next_only(self):
+        """Test the first page with more rows gets a next link and no page items."""
+        result = govuk_pagination_params_builder(0, None, lambda page: f"/?page={page}", has_next=True)
+
+        assert "previous" not in result
+        assert result["next"] == {"href": "/?page=1"}
+        assert "items" not in result
+
+    def test_last_page_links_to_previous_only(self):
+        """Test a later page with no more rows gets a previous link only."""
+        result = govuk_pagination_params_builder(3, None, lambda page: f"/?page={page}", has_next=False)
+
+        assert result["previous"] == {"href": "/?page=2"}
+        assert "next" not in result
+        assert result["classes"] == "govuk-!-text-align-center"
+
+
+@pytest.mark.unit
+class TestOpenEndedPaginationBuilder:
+    """Test govuk_pagination_params_builder when the page count is only a lower bound."""
+
+    def _numbers(self, result):
+        return [item.get("number", "…") for item in result["items"]]
+
+    def test_no_last_page_link(self):
+        """Test the window ends in an ellipsis instead of linking to the last counted page."""
+        result = govuk_pagination_params_builder(0, 100, lambda page: f"/?page={page}", open_ended=True)
+
+        assert self._numbers(result) == [1, 2, 3, "…"]
+        assert result["next"] == {"href": "/?page=1"}
+
+    def test_pages_beyond_the_cap(self):
+        """Test pages past the counted ones still link onwards while there are more rows."""
+        result = govuk_pagination_params_builder(
+            120, 100, lambda page: f"/?page={page}", has_next=True, open_ended=True
+        )
+
+        assert self._numbers(result) == [1, "…", 119, 120, 121, 122, "…"]
+        assert result["next"] == {"href": "/?page=121"}
+
+    def test_end_of_rows_beyond_the_cap(self):
+        """Test the last page past the cap has no next link or trailing ellipsis."""
+        result = govuk_pagination_params_builder(
+            120, 100, lambda page: f"/?page={page}", has_next=False, open_ended=True
+        )
+
+        assert self._numbers(result) == [1, "…", 119, 120, 121]
+        assert "next" not in result
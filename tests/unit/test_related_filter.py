@@ -0,0 +1,40 @@
+"""Unit tests for FilterRelated."""
+import pytest
+from sqlalchemy import select
+
+from app import Post, User
+from govuk_flask_admin import FilterRelated
+
+
+@pytest.mark.unit
+class TestFilterRelated:
+    """Test FilterRelated's column, values and queries."""
+
+    def test_filters_on_the_foreign_key(self):
+        """Test the filter compares the local foreign key, with no join to the related table."""
+        flt = FilterRelated(Post.author, "Author", ["name"])
+
+        sql = str(flt.apply(select(Post), 3).compile())
+
+        assert "WHERE post.author_id = :author_id_1" in sql
+        assert "JOIN" not in sql
+
+    def test_values_are_primary_keys(self):
+        """Test values are converted to the related primary key's type."""
+        flt = FilterRelated(Post.author, "Author", ["name"])
+
+        assert flt.clean(" 3 ") == 3
+        assert not flt.validate("three")
+        assert flt.operation() == "is"
+
+    def test_search_fields_by_name(self):
+        """Test search fields can be named or given as attributes of the related model."""
+        flt = FilterRelated(Post.author, "Author", ["name", User.email])
+
+        assert flt.search_fields == [User.name, User.email]
+        assert flt.model is User
+
+    def test_rejects_other_relationships(self):
+        """Test one-to-many relationships can't be used."""
+        with pytest.raises(ValueError):
+            FilterRelated(User.posts, "Posts", ["title"])
@@ -0,0 +1,181 @@
+"""Unit tests for search backends."""
+import sys
+
+import pytest
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import Account, Post, User
+from govuk_flask_admin import GovukModelView
+from govuk_flask_admin.indexes import SEARCH, advise_indexes
+from govuk_flask_admin.search import (
+    LikeSearch,
+    PostgresFullTextSearch,
+    SQLiteFTS5Search,
+    _search_indexes,
+    search_criterion,
+)
+
+
+def _sql(criterion):
+    return str(criterion.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+@pytest.fixture
+def make_view(app, db):
+    """Makes a view with the given searchable columns and backend, unbinding the backend afterwards."""
+    backends = []
+
+    def make(backend, searchable=("title", "content"), model=Post, modes=None):
+        view_class = type(
+            "SearchView",
+            (GovukModelView,),
+            {"column_searchable_list": list(searchable), "search_backend": backend, "column_search_modes": modes},
+        )
+        backends.append(backend)
+        with app.app_context():
+            return view_class(model, db.session, endpoint=f"search_{len(backends)}")
+
+    yield make
+
+    for backend in backends:
+        _search_indexes.discard(backend)
+
+
+@pytest.mark.unit
+class TestSearchIndexBind:
+    """Test SearchIndex.bind."""
+
+    def test_binds_to_the_views_columns(self, make_view):
+        """Test the backend picks up the model's primary key and searchable columns."""
+        backend = SQLiteFTS5Search()
+        make_view(backend)
+
+        assert backend.table_name == "post_search"
+        assert [column.name for column in backend.columns] == ["title", "content"]
+        assert backend.primary_key is Post.__table__.c.id
+
+    def test_related_columns_are_rejected(self, make_view):
+        """Test searching a related model's columns is refused, as their changes can't be tracked."""
+        with pytest.raises(ValueError, match="can only search columns of Post"):
+            make_view(SQLiteFTS5Search(), searchable=("title", "author.name"))
+
+    def test_sharing_between_models_is_rejected(self, make_view):
+        """Test one backend can't index two different models."""
+        backend = SQLiteFTS5Search()
+        make_view(backend)
+
+        with pytest.raises(ValueError, match="already indexes Post"):
+            make_view(backend, searchable=("name",), model=User)
+
+    def test_sqlite_needs_an_integer_primary_key(self, make_view):
+        """Test FTS5, whose rowids are integers, can't index a model with a string primary key."""
+        with pytest.raises(ValueError, match="integer primary key"):
+            make_view(SQLiteFTS5Search(), searchable=("id",), model=Account)
+
+
+@pytest.mark.unit
+class TestMatchingIds:
+    """Test the queries full-text backends search with."""
+
+    def test_sqlite_terms_are_quoted_prefixes(self, make_view):
+        """Test each term is quoted for FTS5 and matched as a word prefix."""
+        backend = SQLiteFTS5Search()
+        make_view(backend)
+
+        statement = backend.matching_ids(['say "hi"', "NOT"]).compile(dialect=sqlite.dialect())
+
+        assert "post_search MATCH ?" in str(statement)
+        assert list(statement.params.values()) == ['"say ""hi"""* "NOT"*']
+
+    def test_postgresql_terms_are_quoted_prefixes(self, make_view):
+        """Test each term is quoted as a tsquery lexeme and matched as a prefix."""
+        backend = PostgresFullTextSearch(config="english")
+        make_view(backend)
+
+        statement = backend.matching_ids(["o'brien", "a&b"]).compile(dialect=postgresql.dialect())
+
+        assert "post_search.document @@ to_tsquery(CAST(%(param_1)s AS REGCONFIG), %(to_tsquery_1)s)" in str(statement)
+        assert statement.params["to_tsquery_1"] == "'o''brien':* & 'a&b':*"
+        assert statement.params["param_1"] == "english"
+
+    def test_index_advice_skips_indexed_search(self, make_view):
+        """Test the index advisor doesn't suggest indexes for columns searched through a full-text index."""
+        view = make_view(PostgresFullTextSearch())
+
+        assert not [advice for advice in advise_indexes(view, postgresql.dialect()) if SEARCH in advice.uses]
+
+
+@pytest.mark.unit
+class TestSearchCriterion:
+    """Test search_criterion."""
+
+    def test_contains_matches_flask_admin(self):
+        """Test contains mode is Flask-Admin's ILIKE, including its ^ and = prefixes."""
+        assert "LIKE lower('%ann%')" in _sql(search_criterion(User.name, "contains", "ann"))
+        assert "LIKE lower('ann%')" in _sql(search_criterion(User.name, "contains", "^ann"))
+
+    def test_exact_compares_the_column(self):
+        """Test exact mode compares the column itself, so an index on it can be used."""
+        assert _sql(search_criterion(User.email, "exact", "a@example.com")) == "user.email = 'a@example.com'"
+
+    def test_exact_converts_to_the_column_type(self):
+        """Test exact mode on a number column compares numbers, and can't match words."""
+        assert _sql(search_criterion(User.age, "exact", "30")) == "user.age = 30"
+        assert search_criterion(User.age, "exact", "thirty") is None
+
+    def test_prefix_is_a_range(self):
+        """Test prefix mode is a range on the column, which a B-tree index can serve, checked with LIKE."""
+        assert _sql(search_criterion(User.email, "prefix", "ann")) == (
+            "user.email >= 'ann' AND user.email < 'ano' AND user.email LIKE 'ann%' ESCAPE '\\'"
+        )
+
+    def test_prefix_like_is_escaped(self):
+        """Test LIKE wildcards in the search are matched literally."""
+        assert "LIKE 'a\\%b\\_c\\\\%' ESCAPE '\\'" in _sql(search_criterion(User.email, "prefix", "a%b_c\\"))
+
+    def test_prefix_of_highest_character(self):
+        """Test prefixes ending with the highest code point still have an upper bound where there is one."""
+        top = chr(sys.maxunicode)
+
+        assert f"user.email >= 'a{top}' AND user.email < 'b' AND" in _sql(search_criterion(User.email, "prefix", "a" + top))
+        assert _sql(search_criterion(User.email, "prefix", top)) == f"user.email >= '{top}' AND user.email LIKE '{top}%' ESCAPE '\\'"
+
+    def test_casefold_compares_lower_case(self):
+        """Test casefold mode compares lower-cased values."""
+        assert _sql(search_criterion(User.email, "casefold", "Ann@Example.com")) == "lower(user.email) = 'ann@example.com'"
+
+
+@pytest.mark.unit
+class TestColumnSearchModes:
+    """Test GovukModelView.column_search_modes."""
+
+    def test_modes_follow_search_fields(self, make_view):
+        """Test each searchable column gets its mode, and unlisted columns match anywhere."""
+        view = make_view(LikeSearch(), searchable=("email", "name", "job"), model=User, modes={"email": "prefix"})
+
+        assert view._search_modes == ["prefix", "contains", "contains"]
+
+    def test_placeholder_shows_modes(self, make_view):
+        """Test the search hint says how columns other than "contains" ones are matched."""
+        view = make_view(LikeSearch(), searchable=("email", "name"), model=User, modes={"email": "prefix"})
+
+        assert view.search_placeholder() == "email (starts with), name"
+
+    def test_unknown_columns_are_rejected(self, make_view):
+        """Test modes for columns that aren't searchable are refused."""
+        with pytest.raises(ValueError, match="aren't in column_searchable_list"):
+            make_view(LikeSearch(), searchable=("email",), model=User, modes={"job": "exact"})
+
+    def test_unknown_modes_are_rejected(self, make_view):
+        """Test misspelt modes are refused."""
+        with pytest.raises(ValueError, match="Unknown search modes"):
+            make_view(LikeSearch(), searchable=("email",), model=User, modes={"email": "starts"})
+
+    def test_index_advice_for_modes(self, make_view):
+        """Test exact and prefix columns get ordinary indexes, and casefold columns an index on lower()."""
+        view = make_view(LikeSearch(), searchable=("job", "name"), model=User, modes={"job": "prefix", "name": "casefold"})
+        advice = {item.columns[0].name: item for item in advise_indexes(view, sqlite.dialect()) if SEARCH in item.uses}
+
+        assert advice["job"].ddl == "CREATE INDEX ix_user_job ON user (job)"
+        assert advice["job"].note is None
+        assert "lower(name)" in advice["name"].note
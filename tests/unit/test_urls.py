@@ -0,0 +1,125 @@
+"""Unit tests for the per-request URL builder."""
+import pytest
+from flask import Flask, url_for
+from werkzeug.routing import BuildError
+
+from govuk_flask_admin.urls import UrlBuilder, build_url
+
+
+@pytest.fixture
+def url_app():
+    """A small app with rules with and without path arguments."""
+    app = Flask(__name__)
+
+    @app.route("/users/")
+    def users():
+        return ""
+
+    @app.route("/users/<int:user_id>/")
+    def user(user_id):
+        return ""
+
+    @app.route("/posts/", defaults={"page": 1})
+    @app.route("/posts/<int:page>/")
+    def posts(page):
+        return ""
+
+    return app
+
+
+@pytest.mark.unit
+class TestUrlBuilder:
+    """Test build_url gives the same URLs as url_for."""
+
+    @pytest.mark.parametrize(
+        "values",
+        [
+            {},
+            {"page": 2, "sort": 0, "desc": 1},
+            {"page": None, "search": None},
+            {"search": "a&b=c d/é?"},
+            {"flt0_job_equals": ["one", "two"]},
+            {"url": "/users/?page=2&search=x"},
+        ],
+    )
+    def test_matches_url_for(self, url_app, values):
+        """Test query strings are encoded as url_for encodes them."""
+        with url_app.test_request_context("/users/"):
+            assert build_url("users", **values) == url_for("users", **values)
+
+    def test_equal_values_of_different_types(self, url_app):
+        """Test values that compare equal but encode differently aren't mixed up by the encoding cache."""
+        with url_app.test_request_context("/users/"):
+            assert build_url("users", flag=True) == "/users/?flag=True"
+            assert build_url("users", flag=1) == "/users/?flag=1"
+
+    def test_unhashable_values(self, url_app):
+        """Test values that can't be cached are still encoded."""
+        with url_app.test_request_context("/users/"):
+            assert build_url("users", data={"a": 1}) == url_for("users", data={"a": 1})
+
+    def test_relative_endpoint_without_blueprint(self, url_app):
+        """Test a leading dot resolves to an app-level endpoint outside a blueprint."""
+        with url_app.test_request_context("/users/"):
+            assert build_url(".users", page=1) == url_for("users", page=1)
+
+    def test_relative_endpoint_in_blueprint(self, app, user_model_view):
+        """Test a leading dot resolves against the current blueprint."""
+        with app.test_request_context("/admin/user/"):
+            app.preprocess_request()
+            assert build_url(".edit_view", id=3, url="/admin/user/") == url_for(".edit_view", id=3, url="/admin/user/")
+
+    def test_path_arguments_use_url_for(self, url_app):
+        """Test endpoints with path arguments or rule defaults are built by url_for."""
+        with url_app.test_request_context("/users/"):
+            assert build_url("user", user_id=3, tab="posts") == "/users/3/?tab=posts"
+            assert build_url("posts", page=2) == "/posts/2/"
+            assert UrlBuilder.current()._paths == {"user": None, "posts": None}
+
+    def test_url_for_options_use_url_for(self, url_app):
+        """Test options such as _external are left to url_for."""
+        with url_app.test_request_context("/users/"):
+            assert build_url("users", _external=True, page=2) == "http://localhost/users/?page=2"
+
+    def test_url_defaults_are_applied(self, url_app):
+        """Test the app's url_defaults functions still add their values."""
+
+        @url_app.url_defaults
+        def add_language(endpoint, values):
+            values.setdefault("lang", "cy")
+
+        with url_app.test_request_context("/users/"):
+            assert build_url("users", page=2) == url_for("users", page=2) == "/users/?page=2&lang=cy"
+
+    def test_sorted_parameters(self, url_app):
+        """Test parameters are sorted if the URL map sorts them."""
+        url_app.url_map.sort_parameters = True
+
+        with url_app.test_request_context("/users/"):
+            assert build_url("users", b=1, a=2) == url_for("users", b=1, a=2) == "/users/?a=2&b=1"
+
+    def test_script_root(self, url_app):
+        """Test paths include the script root of the request they're built for."""
+        with url_app.test_request_context("/users/", base_url="http://localhost/app/"):
+            assert build_url("users", page=2) == "/app/users/?page=2"
+
+    def test_builder_is_per_request(self, url_app):
+        """Test a new request gets a new builder rather than paths from an earlier one."""
+        with url_app.app_context():
+            with url_app.test_request_context("/users/", base_url="http://localhost/one/"):
+                assert build_url("users") == "/one/users/"
+            with url_app.test_request_context("/users/", base_url="http://localhost/two/"):
+                assert build_url("users") == "/two/users/"
+
+    def test_unknown_endpoint_raises(self, url_app):
+        """Test unknown endpoints raise as they do with url_for."""
+        with url_app.test_request_context("/users/"):
+            with pytest.raises(BuildError):
+                build_url("missing")
+
+    def test_outside_request_context(self, url_app):
+        """Test URLs can still be built with just an app context."""
+        url_app.config["SERVER_NAME"] = "example.com"
+
+        with url_app.app_context():
+            assert build_url("users", page=2) == "http://example.com/users/?page=2"
@@ -0,0 +1,199 @@
+"""Unit tests for long value lists and the "is one of" filter."""
+import json
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import (
+    Column,
+    Integer,
+    LargeBinary,
+    MetaData,
+    Numeric,
+    Table,
+    create_engine,
+    insert,
+    literal_column,
+    select,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app import FavouriteColour, User
+from govuk_flask_admin import FilterInValues
+from govuk_flask_admin.value_lists import ValueListStore, in_values
+
+
+def _compile(condition, dialect):
+    return condition.compile(dialect=dialect)
+
+
+@pytest.mark.unit
+class TestInValues:
+    """Test in_values compiles to a bound IN or a single parameter."""
+
+    def test_short_lists_bind_each_value(self):
+        """Test lists up to max_bound use an ordinary IN."""
+        compiled = _compile(in_values(User.id, [1, 2, 3], max_bound=3), sqlite.dialect())
+
+        assert "IN (__[POSTCOMPILE_" in str(compiled)
+        assert "json_each" not in str(compiled)
+
+    def test_long_lists_use_json_each_on_sqlite(self):
+        """Test longer lists are bound as one JSON array on SQLite."""
+        compiled = _compile(in_values(User.id, [1, 2, 3], max_bound=2), sqlite.dialect())
+
+        assert "IN (SELECT value \nFROM json_each(?))" in str(compiled)
+        assert [json.loads(value) for value in compiled.params.values()] == [[1, 2, 3]]
+
+    def test_json_values_are_bound_like_the_column(self):
+        """Test enum values go into the JSON array by name, as the column stores them."""
+        compiled = _compile(
+            in_values(User.favourite_colour, [FavouriteColour.RED, FavouriteColour.BLUE], max_bound=1), sqlite.dialect()
+        )
+
+        assert [json.loads(value) for value in compiled.params.values()] == [["RED", "BLUE"]]
+
+    def test_bytes_are_compared_as_hex(self):
+        """Test binary values, which JSON can't hold, are bound as one array of hex digits."""
+        blobs = Table("blobs", MetaData(), Column("data", LargeBinary))
+
+        compiled = _compile(in_values(blobs.c.data, [b"a", b"\x80"], max_bound=1), sqlite.dialect())
+
+        assert "hex(blobs.data) IN (SELECT value" in str(compiled)
+        assert [json.loads(value) for value in compiled.params.values()] == [["61", "80"]]
+
+    def test_decimals_are_bound_as_text(self):
+        """Test decimals the column doesn't convert itself go into the JSON array as text."""
+        prices = Table("prices", MetaData(), Column("price", Numeric(asdecimal=True)))
+        engine = create_engine("sqlite://")
+        prices.metadata.create_all(engine)
+
+        with engine.connect() as connection:
+            connection.execute(insert(prices), [{"price": Decimal(n) / 4} for n in range(8)])
+            condition = in_values(literal_column("price"), [Decimal("0.25"), Decimal("1.50")], max_bound=1)
+
+            assert connection.scalars(select(prices.c.price).where(condition).order_by(prices.c.price)).all() == [
+                Decimal("0.25"),
+                Decimal("1.5"),
+            ]
+
+    def test_long_lists_use_any_on_postgresql(self):
+        """Test longer lists are bound as one array on PostgreSQL."""
+        compiled = _compile(in_values(User.id, [1, 2, 3], max_bound=2), postgresql.dialect())
+
+        assert '"user".id = ANY (%(param_1)s::INTEGER[])' in str(compiled)
+        assert list(compiled.params.values()) == [[1, 2, 3]]
+
+    def test_selects_the_same_rows_either_way(self):
+        """Test bound and JSON lists, and their negations, select the same rows."""
+        numbers = Table("numbers", MetaData(), Column("n", Integer))
+        engine = create_engine("sqlite://")
+        numbers.metadata.create_all(engine)
+
+        with engine.connect() as connection:
+            connection.execute(insert(numbers), [{"n": n} for n in range(10)])
+
+            def select_n(condition):
+                return connection.scalars(select(numbers.c.n).where(condition).order_by(numbers.c.n)).all()
+
+            for max_bound in (10, 1):
+                assert select_n(in_values(numbers.c.n, [2, 4, 11], max_bound)) == [2, 4]
+                assert select_n(~in_values(numbers.c.n, [2, 4, 11], max_bound)) == [0, 1, 3, 5, 6, 7, 8, 9]
+
+    def test_selects_the_same_blobs_either_way(self):
+        """Test binary values select the same rows bound one by one or as hex digits."""
+        blobs = Table("blobs", MetaData(), Column("data", LargeBinary))
+        engine = create_engine("sqlite://")
+        blobs.metadata.create_all(engine)
+
+        with engine.connect() as connection:
+            connection.execute(insert(blobs), [{"data": bytes([n, 128 + n])} for n in range(10)])
+            wanted = [bytes([2, 130]), bytes([4, 132]), b"missing"]
+
+            for max_bound in (10, 1):
+                condition = in_values(blobs.c.data, wanted, max_bound)
+                assert sorted(connection.scalars(select(blobs.c.data).where(condition))) == wanted[:2]
+
+
+@pytest.mark.unit
+class TestFilterInValues:
+    """Test FilterInValues cleans pasted lists."""
+
+    def test_splits_on_lines_and_commas(self):
+        """Test values are split on newlines and commas, stripped and de-duplicated."""
+        flt = FilterInValues(User.email, "Email")
+
+        assert flt.clean("a@example.com\r\n b@example.com, a@example.com,,\n") == ["a@example.com", "b@example.com"]
+
+    def test_empty_lists_are_invalid(self):
+        """Test a list of only separators and blank lines is rejected rather than matching nothing."""
+        flt = FilterInValues(User.email, "Email")
+
+        assert not flt.validate(",\n , \r\n,")
+        assert flt.validate("a@example.com,")
+
+    def test_converts_to_the_column_type(self):
+        """Test values are converted to the column's Python type."""
+        flt = FilterInValues(User.age, "Age")
+
+        assert flt.clean("30\n41") == [30, 41]
+        assert not flt.validate("30\nforty")
+
+    def test_enum_options_and_names(self):
+        """Test enum columns offer their members and take them by name."""
+        flt = FilterInValues(User.favourite_colour, "Favourite colour")
+
+        assert flt.get_options(None) == [(member.name, member.value) for member in FavouriteColour]
+        assert flt.clean("RED\nBLUE") == [FavouriteColour.RED, FavouriteColour.BLUE]
+        assert not flt.validate("red")
+
+    def test_dates_are_iso_format(self):
+        """Test date values are read as YYYY-MM-DD."""
+        flt = FilterInValues(User.created_at, "Created at")
+
+        assert [value.isoformat() for value in flt.clean("2024-03-05")] == ["2024-03-05"]
+        assert not flt.validate("05/03/2024")
+
+
+@pytest.mark.unit
+class TestValueListStore:
+    """Test ValueListStore keeps long lists behind short tokens."""
+
+    def test_tokens_are_short_and_found_again(self):
+        """Test a list gets a short token, the same one each time, that gives the list back."""
+        store = ValueListStore()
+        values = "\n".join(f"user{i}@example.com" for i in range(1000))
+
+        token = store.put(values)
+
+        assert store.is_token(token)
+        assert len(token) == 25
+        assert store.put(values) == token
+        assert store.get(token) == values
+        assert len(store) == 1
+
+    def test_unknown_and_expired_tokens_are_not_found(self):
+        """Test tokens the store doesn't have, or whose list has expired, give None."""
+        now = [0.0]
+        store = ValueListStore(ttl=10, clock=lambda: now[0])
+        token = store.put("a\nb")
+
+        now[0] = 10
+        assert store.get(token) is None
+        assert store.get("@" + "0" * 24) is None
+
+    def test_least_recently_used_are_dropped(self):
+        """Test lists past max_entries are dropped, least recently used first."""
+        store = ValueListStore(max_entries=2)
+        first, second = store.put("a"), store.put("b")
+
+        store.get(first)
+        store.put("c")
+
+        assert store.get(first) == "a"
+        assert store.get(second) is None
+
+    def test_only_whole_tokens_are_tokens(self):
+        """Test values that merely look like tokens in part aren't taken for one."""
+        assert not ValueListStore.is_token("@abc")
+        assert not ValueListStore.is_token("x@" + "0" * 24)
+        assert not ValueListStore.is_token("@" + "0" * 24 + "\nmore")
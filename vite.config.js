@@ -1,15 +1,51 @@
+import fs from "node:fs"
 import path from "node:path"
+import zlib from "node:zlib"
 import { viteStaticCopy } from "vite-plugin-static-copy"
 import { NodePackageImporter } from "sass-embedded"
 
 import { defineConfig } from "vite"
 
+const outDir = path.join(__dirname, "src", "govuk_flask_admin", "static", "dist")
+
+// Writes `.br` and `.gz` siblings for compressible assets so that GovukFlaskAdmin.static can serve them
+// without compressing on every request. Fonts (woff/woff2) are already compressed and are skipped.
+function precompressAssets({ include = /\.(js|css|svg|json|map)$/ } = {}) {
+  return {
+    name: "govuk-flask-admin-precompress",
+    apply: "build",
+    closeBundle() {
+      const assetsDir = path.join(outDir, "assets")
+      for (const file of fs.readdirSync(assetsDir, { recursive: true })) {
+        const filePath = path.join(assetsDir, file)
+        if (!include.test(filePath) || !fs.statSync(filePath).isFile()) {
+          continue
+        }
+
+        const content = fs.readFileSync(filePath)
+        fs.writeFileSync(`${filePath}.br`, zlib.brotliCompressSync(content, {
+          params: { [zlib.constants.BROTLI_PARAM_QUALITY]: zlib.constants.BROTLI_MAX_QUALITY },
+        }))
+        fs.writeFileSync(`${filePath}.gz`, zlib.gzipSync(content, { level: zlib.constants.Z_BEST_COMPRESSION }))
+      }
+    },
+  }
+}
+
 export default defineConfig({
   build: {
-    outDir: path.join(__dirname, "src", "govuk_flask_admin", "static", "dist"),
+    outDir,
     manifest: "manifest.json",
     rollupOptions: {
-      input: ["src/assets/main.scss", "src/assets/main.js"],
+      input: [
+        "src/assets/main.scss",
+        "src/assets/main.js",
+        "src/assets/select-with-search.js",
+        // Per-template critical CSS, inlined by govuk_flask_admin_include_css.
+        "src/assets/critical/list.scss",
+        "src/assets/critical/details.scss",
+        "src/assets/critical/edit.scss",
+      ],
       external: [
         /assets\/fonts\/.*\.(woff|woff2)$/,
         /assets\/images\/.*\.svg$/,
@@ -56,6 +92,7 @@ export default defineConfig({
         }
       ],
     }),
+    precompressAssets(),
   ],
   clearScreen: false,
   appType: "custom"